@@ -2,7 +2,8 @@ import os
 import threading
 import subprocess
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -10,8 +11,10 @@ from apscheduler.triggers.cron import CronTrigger
 import uvicorn
 
 from backend.database.database_init import init_db
-from backend.database.connection import init_pool, close_pool, get_db
-from backend.routers import hinteval, metrics, save_and_load
+from backend.database.connection import init_pool, close_pool, get_db, PoolTimeout
+from backend.routers import hinteval, metrics, save_and_load, system, jobs, bulk
+from backend.services import model_registry, llm_client, job_service
+from backend.services.llm_resilience import CircuitOpenError
 from backend.database.reset_db import reset_db_logic
 
 FRONTEND_DIR = os.path.join(os.getcwd(), "frontend", "hinteval-ui")
@@ -39,6 +42,8 @@ def reset_db():
 async def lifespan(app: FastAPI):
     init_pool()
     init_db()
+    model_registry.warmup()
+    job_service.start_workers()
     
     scheduler = BackgroundScheduler()
     trigger = CronTrigger(week='*/2', day_of_week='sun', hour=22, minute=0)
@@ -48,6 +53,8 @@ async def lifespan(app: FastAPI):
     yield
     
     scheduler.shutdown()
+    job_service.stop_workers()
+    await llm_client.aclose_client()
     close_pool()
 
 app = FastAPI(title="Hint Generation and Evaluation", version="1.0", lifespan=lifespan)
@@ -61,9 +68,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_in) + 1)},
+    )
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
 app.include_router(hinteval.router)
 app.include_router(metrics.router)
 app.include_router(save_and_load.router)
+app.include_router(system.router)
+app.include_router(jobs.router)
+app.include_router(bulk.router)
 
 def run_frontend():
     npm_cmd = "npm.cmd" if os.name == 'nt' else "npm"
@@ -1,6 +1,6 @@
 # backend/models/api.py
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, ConfigDict
 
 class HintevalBase(BaseModel):
@@ -16,6 +16,22 @@ class GenerateReq(HintevalBase):
     max_tokens: Optional[int] = None
     model_name: Optional[str] = None
     answer: bool = False
+    bypass_cache: bool = False
+
+class BulkQuestion(HintevalBase):
+    question: str
+    answer: Optional[str] = None
+
+class BulkGenerateReq(HintevalBase):
+    """Request body for /bulk/generate: the /hinteval/generate settings for many questions."""
+    questions: List[BulkQuestion]
+    num_hints: int = 5
+    temperature: float = 0.3
+    max_tokens: int = 512
+    model_name: Optional[str] = None
+    answer: bool = False
+    bypass_cache: bool = False
+    concurrency: Optional[int] = None
 
 class UpdateAnswerReq(BaseModel):
     answer: str
@@ -31,6 +47,7 @@ class RegenerateAnswerReq(BaseModel):
     top_p: float = 0.9
     hints: List[str] = []
     question: str
+    bypass_cache: bool = False
 
 class RegenerateCandidatesReq(BaseModel):
     num_candidates: int
@@ -39,6 +56,7 @@ class RegenerateCandidatesReq(BaseModel):
     max_tokens: int = 256
     hints: List[str] = []
     top_p: float = 0.9
+    bypass_cache: bool = False
 
 class HintReq(HintevalBase):
     """Request body for /hinteval/generate."""
@@ -58,6 +76,31 @@ class EvaluateReq(HintevalBase):
     num_candidates: Optional[int] = None
 
 
+class EvaluateBatchItem(HintevalBase):
+    """
+    One question of /hinteval/evaluate_batch.
+
+    `candidates` are taken as freshly generated ones: the last entry is the
+    ground truth, and for a stored question they replace its stored
+    candidates. Without them the stored candidates are used, or new ones are
+    generated.
+    """
+    question: str
+    hints: List[str]
+    answer: Optional[str] = None
+    candidates: Optional[List[str]] = None
+    question_id: Optional[int] = None
+
+
+class EvaluateBatchReq(HintevalBase):
+    """Request body for /hinteval/evaluate_batch."""
+    items: List[EvaluateBatchItem]
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    model_name: Optional[str] = None
+    num_candidates: Optional[int] = None
+
+
 class CandidateReq(HintevalBase):
     """Request body for /hinteval/candidates."""
     question: str
@@ -127,4 +170,11 @@ class HintMetricResponse(HintevalBase):
     answer_leakage: Optional[float] = None
     readability: Optional[float] = None
     familiarity: Optional[float] = None
-  
\ No newline at end of file
+
+
+class MetricsDashboardResponse(HintevalBase):
+    """All datasets of the metrics page, see /metrics/dashboard."""
+    metrics: List[HintMetricResponse]
+    convergence: List[Dict[str, Any]]
+    entities: Dict[int, List[Dict[str, Any]]]
+    similarities: List[List[float]]
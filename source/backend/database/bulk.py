@@ -0,0 +1,58 @@
+import io
+import os
+from typing import Iterable, Sequence
+
+from psycopg2.extras import execute_values
+
+# Row count from which bulk_insert streams rows with COPY instead of multi-row INSERTs
+BULK_COPY_THRESHOLD = int(os.getenv("DB_BULK_COPY_THRESHOLD", "1000"))
+
+
+def _copy_value(value) -> str:
+    """Formats a value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> None:
+    """Streams rows into `table` with COPY ... FROM STDIN."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_value(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
+
+def bulk_insert(
+    cur,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence],
+    copy_threshold: int = BULK_COPY_THRESHOLD,
+) -> int:
+    """
+    Inserts all rows in as few round trips as possible: multi-row INSERTs for
+    small batches, COPY from `copy_threshold` rows on. Does not commit.
+    """
+    if not rows:
+        return 0
+    if len(rows) >= copy_threshold:
+        copy_rows(cur, table, columns, rows)
+    else:
+        execute_values(
+            cur,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+            rows,
+            page_size=max(len(rows), 1)
+        )
+    return len(rows)
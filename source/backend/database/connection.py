@@ -1,4 +1,12 @@
 import os
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import anyio
+import anyio.to_thread
 import psycopg2.pool
 from fastapi import HTTPException
 from dotenv import load_dotenv
@@ -10,16 +18,112 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_NAME = os.getenv("DB_NAME", "hinteval_db")
 DB_USER = os.getenv("DB_USER", "hinteval_user")
 DB_PASS = os.getenv("DB_PASS", "secure_university_password")
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+# Seconds a caller waits for a free connection before giving up with PoolTimeout
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Generation and evaluation runs allowed at once. They only borrow connections
+# for their short read and write phases, never across LLM or model work.
+LONG_TASK_SLOTS = int(os.getenv("HINTEVAL_LONG_TASK_SLOTS", "8"))
+# Streamed exports allowed at once. Each keeps its connection until the client
+# has downloaded the whole file, so they may never take the entire pool.
+EXPORT_STREAM_SLOTS = max(1, min(int(os.getenv("HINTEVAL_EXPORT_STREAM_SLOTS", "4")), DB_POOL_MAX - 1))
 
 pg_pool = None
+_short_limiter: Optional[anyio.CapacityLimiter] = None
+_long_limiter: Optional[anyio.CapacityLimiter] = None
+_export_slots = threading.BoundedSemaphore(EXPORT_STREAM_SLOTS)
+
+class PoolTimeout(Exception):
+    """No pooled connection became free within the pool timeout."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"No database connection available within {timeout:g}s.")
+        self.timeout = timeout
+
+class ExportSlotsFull(Exception):
+    """All EXPORT_STREAM_SLOTS streamed exports are running."""
+
+    def __init__(self, slots: int):
+        super().__init__(f"{slots} exports are already running, try again shortly.")
+        self.slots = slots
+
+class BlockingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that waits up to `timeout` seconds for a connection
+    instead of raising PoolError as soon as all `maxconn` connections are in use.
+    Also keeps the counters served by /api/system/db_pool.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float = DB_POOL_TIMEOUT, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(blocking=False):
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                waited = time.perf_counter() - started
+                with self._stats_lock:
+                    self._waiting -= 1
+                    self._waits += 1
+                    self._wait_seconds += waited
+                    self._max_wait_seconds = max(self._max_wait_seconds, waited)
+                    if not acquired:
+                        self._timeouts += 1
+            if not acquired:
+                raise PoolTimeout(self.timeout)
+
+        try:
+            conn = super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._stats_lock:
+            self._checkouts += 1
+        return conn
+
+    def putconn(self, conn, key=None, close=False):
+        super().putconn(conn, key, close)
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_use = len(self._used)
+            idle = len(self._pool)
+        with self._stats_lock:
+            return {
+                "max_connections": self.maxconn,
+                "timeout_seconds": self.timeout,
+                "in_use": in_use,
+                "idle": idle,
+                "utilization": round(in_use / self.maxconn, 3) if self.maxconn else 0.0,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_seconds / self._waits * 1000, 1) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 1),
+            }
 
 def init_pool():
     global pg_pool
     print("Initializing PostgreSQL Connection Pool...", flush=True)
     try:
-        pg_pool = psycopg2.pool.ThreadedConnectionPool(
+        pg_pool = BlockingConnectionPool(
             minconn=1,
-            maxconn=20,
+            maxconn=DB_POOL_MAX,
             host=DB_HOST,
             database=DB_NAME,
             user=DB_USER,
@@ -35,16 +139,85 @@ def close_pool():
         pg_pool.closeall()
         print("DB Pool closed.", flush=True)
 
-def get_db():
+@contextmanager
+def pooled_connection():
     """
-    Dependency that provides a database connection from the pool.
+    Borrows a connection from the pool for the duration of the `with` block.
+    Waits up to DB_POOL_TIMEOUT seconds for a free connection, then raises PoolTimeout.
     """
     global pg_pool
     if not pg_pool:
         raise HTTPException(500, "Database pool not initialized")
-    
+
     conn = pg_pool.getconn()
     try:
         yield conn
     finally:
-        pg_pool.putconn(conn)
\ No newline at end of file
+        pg_pool.putconn(conn)
+
+@contextmanager
+def streaming_connection():
+    """
+    pooled_connection for responses that are streamed to the client and hold
+    the connection for the whole download. Raises ExportSlotsFull right away
+    when EXPORT_STREAM_SLOTS of them are in use, so short requests keep the rest
+    of the pool.
+    """
+    if not _export_slots.acquire(blocking=False):
+        raise ExportSlotsFull(EXPORT_STREAM_SLOTS)
+    try:
+        with pooled_connection() as conn:
+            yield conn
+    finally:
+        _export_slots.release()
+
+def get_pool_stats() -> Dict[str, Any]:
+    if not pg_pool:
+        return {"initialized": False}
+    return {"initialized": True, **pg_pool.stats()}
+
+def get_db():
+    """
+    Dependency that provides a database connection from the pool.
+    """
+    with pooled_connection() as conn:
+        yield conn
+
+# =====================================================================================
+# Async Access
+# =====================================================================================
+
+def _limiters():
+    global _short_limiter, _long_limiter
+    if _short_limiter is None:
+        _short_limiter = anyio.CapacityLimiter(DB_POOL_MAX)
+        _long_limiter = anyio.CapacityLimiter(max(LONG_TASK_SLOTS, 1))
+    return _short_limiter, _long_limiter
+
+def _call_with_connection(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    with pooled_connection() as conn:
+        return fn(conn, *args, **kwargs)
+
+async def run_with_db(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs the blocking `fn(conn, *args, **kwargs)` on a worker thread with a pooled
+    connection. Async handlers only hold a thread and a connection for the
+    duration of the database work itself; at most DB_POOL_MAX calls run at once.
+    """
+    short_limiter, _ = _limiters()
+    return await anyio.to_thread.run_sync(
+        functools.partial(_call_with_connection, fn, *args, **kwargs),
+        limiter=short_limiter,
+    )
+
+async def run_long_task(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs a blocking, long running `fn(*args, **kwargs)` (generation, evaluation)
+    on a worker thread. `fn` borrows connections itself with pooled_connection()
+    for its short database phases. At most LONG_TASK_SLOTS of them run at once.
+    """
+    _, long_limiter = _limiters()
+    return await anyio.to_thread.run_sync(
+        functools.partial(fn, *args, **kwargs),
+        limiter=long_limiter,
+    )
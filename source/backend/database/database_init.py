@@ -1,16 +1,18 @@
 import psycopg2
 import os
+from typing import List
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path=".env")
 
 
-def get_db_connection():
+def get_db_connection(**kwargs):
     return psycopg2.connect(
         host=os.getenv("DB_HOST", "localhost"),
         database=os.getenv("DB_NAME", "hinteval_db"),
         user=os.getenv("DB_USER", "hinteval_user"),
-        password=os.getenv("DB_PASS", "secure_university_password")
+        password=os.getenv("DB_PASS", "secure_university_password"),
+        **kwargs
     )
 
 
@@ -18,6 +20,8 @@ def init_db() -> None:
     """
     Initialize PostgreSQL DB schema safely.
     This function is idempotent and can be run multiple times.
+    Tables are created in their current shape, databases created by older
+    versions are brought up to date by the versioned migrations below.
     """
     conn = get_db_connection()
     cur = conn.cursor()
@@ -29,7 +33,7 @@ def init_db() -> None:
                 id SERIAL PRIMARY KEY,
                 text TEXT NOT NULL,
                 session_id TEXT,
-                created_at TEXT NOT NULL
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now()
             );
         """)
 
@@ -40,8 +44,8 @@ def init_db() -> None:
                 question_id INTEGER NOT NULL,
                 answer_text TEXT NOT NULL,
                 model_name TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                updated_at TIMESTAMPTZ,
                 FOREIGN KEY(question_id) REFERENCES questions(id) ON DELETE CASCADE
             );
         """)
@@ -53,8 +57,8 @@ def init_db() -> None:
                 question_id INTEGER NOT NULL,
                 answer_id INTEGER,
                 hint_text TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                updated_at TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                updated_at TIMESTAMPTZ,
                 FOREIGN KEY(question_id) REFERENCES questions(id) ON DELETE CASCADE,
                 FOREIGN KEY(answer_id) REFERENCES answers(id) ON DELETE SET NULL
             );
@@ -93,8 +97,8 @@ def init_db() -> None:
                 question_id INTEGER NOT NULL,
                 candidate_text TEXT NOT NULL,
                 is_eliminated BOOLEAN NOT NULL DEFAULT FALSE,
-                created_at TEXT NOT NULL,
-                updated_at TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                updated_at TIMESTAMPTZ,
                 FOREIGN KEY(question_id) REFERENCES questions(id) ON DELETE CASCADE
             );
         """)
@@ -111,7 +115,128 @@ def init_db() -> None:
             WHERE is_groundtruth = TRUE;
         """)
 
+        # 7) EVALUATION CACHE (evaluator outputs keyed by a hash of their inputs)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS evaluation_cache (
+                cache_key TEXT PRIMARY KEY,
+                evaluator TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                last_used_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_evaluation_cache_last_used
+            ON evaluation_cache (last_used_at);
+        """)
+
+        # 7b) HINT EMBEDDINGS (metrics page similarities, keyed by a hash of the hint text)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS hint_embeddings (
+                text_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                dtype TEXT NOT NULL,
+                vector BYTEA NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (text_hash, model)
+            );
+        """)
+
+        # 8) LLM RESPONSE CACHE (opt-in, see LLM_CACHE_ENABLED)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                model_name TEXT,
+                response_text TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                last_used_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used
+            ON llm_response_cache (last_used_at);
+        """)
+
+        # 9) BACKGROUND JOBS (generation / evaluation runs, claimed with FOR UPDATE SKIP LOCKED)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id SERIAL PRIMARY KEY,
+                kind TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                idempotency_key TEXT,
+                params_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress_json TEXT,
+                result_json TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                started_at TIMESTAMPTZ,
+                heartbeat_at TIMESTAMPTZ,
+                finished_at TIMESTAMPTZ
+            );
+        """)
+
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_idempotency
+            ON jobs (session_id, idempotency_key)
+            WHERE idempotency_key IS NOT NULL;
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_queued
+            ON jobs (created_at, id)
+            WHERE status = 'queued';
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_session
+            ON jobs (session_id, created_at DESC);
+        """)
+
+        # 10) BULK GENERATION RUNS (one checkpoint row per question, see bulk_generation_service)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS bulk_runs (
+                id SERIAL PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                source TEXT,
+                params_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS bulk_run_items (
+                run_id INTEGER NOT NULL REFERENCES bulk_runs(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                question_text TEXT NOT NULL,
+                answer_text TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                question_id INTEGER REFERENCES questions(id) ON DELETE SET NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                claimed_at TIMESTAMPTZ,
+                finished_at TIMESTAMPTZ,
+                PRIMARY KEY (run_id, position)
+            );
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bulk_run_items_pending
+            ON bulk_run_items (run_id, position)
+            WHERE status = 'pending';
+        """)
+
         conn.commit()
+
+        run_migrations(conn)
         print("✅ PostgreSQL schema initialized / migrated successfully.")
 
     except Exception as e:
@@ -121,3 +246,141 @@ def init_db() -> None:
     finally:
         cur.close()
         conn.close()
+
+
+# =====================================================================================
+# Versioned Migrations
+# =====================================================================================
+
+# Key of the advisory lock that keeps concurrently starting workers from
+# applying the same migration twice.
+MIGRATION_LOCK_ID = 7_420_001
+
+TIMESTAMP_COLUMNS = {
+    "questions": ("created_at",),
+    "answers": ("created_at", "updated_at"),
+    "hints": ("created_at", "updated_at"),
+    "candidate_answers": ("created_at", "updated_at"),
+}
+
+
+def _migrate_timestamps(cur) -> None:
+    """
+    Converts the TEXT timestamps written by older versions to TIMESTAMPTZ.
+    Old values are local "YYYY-MM-DD HH:MM:SS" strings and are read in the
+    session's TimeZone. Values that do not parse become NULL (the epoch for
+    created_at, so they never sort as the latest row) instead of aborting
+    the migration, and are reported.
+    """
+    cur.execute("""
+        CREATE OR REPLACE FUNCTION pg_temp.try_timestamptz(value TEXT) RETURNS TIMESTAMPTZ AS $$
+        BEGIN
+            RETURN NULLIF(btrim(value), '')::timestamptz;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            cur.execute(
+                "SELECT data_type FROM information_schema.columns"
+                " WHERE table_schema = current_schema() AND table_name = %s AND column_name = %s",
+                (table, column)
+            )
+            row = cur.fetchone()
+            if not row or row[0] != "text":
+                continue
+
+            cur.execute(
+                f"SELECT COUNT(*) FROM {table}"
+                f" WHERE NULLIF(btrim({column}), '') IS NOT NULL AND pg_temp.try_timestamptz({column}) IS NULL"
+            )
+            invalid = cur.fetchone()[0]
+            if invalid:
+                print(f"⚠️ {table}.{column}: {invalid} unparseable value(s) replaced during conversion.", flush=True)
+
+            if column == "created_at":
+                cur.execute(f"""
+                    ALTER TABLE {table}
+                    ALTER COLUMN {column} TYPE TIMESTAMPTZ USING COALESCE(pg_temp.try_timestamptz({column}), 'epoch'),
+                    ALTER COLUMN {column} SET DEFAULT now()
+                """)
+            else:
+                cur.execute(f"""
+                    ALTER TABLE {table}
+                    ALTER COLUMN {column} TYPE TIMESTAMPTZ USING pg_temp.try_timestamptz({column})
+                """)
+
+
+def _migrate_lookup_indexes(cur) -> None:
+    """Indexes for the per-session and per-question lookups every request makes."""
+    # Latest question of a session: matches ORDER BY created_at DESC, id DESC LIMIT 1
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_questions_session_latest
+        ON questions (session_id, created_at DESC, id DESC);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_answers_question_latest
+        ON answers (question_id, created_at DESC);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_hints_question
+        ON hints (question_id, id);
+    """)
+    # ON DELETE SET NULL from answers scans hints by answer_id
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_hints_answer
+        ON hints (answer_id);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_metrics_hint_name
+        ON metrics (hint_id, name);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entities_hint
+        ON entities (hint_id, start_index);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_candidate_answers_question
+        ON candidate_answers (question_id, id);
+    """)
+
+
+# Append only: (version, name, function). Applied versions are never re-run.
+MIGRATIONS = [
+    (1, "typed timestamps", _migrate_timestamps),
+    (2, "lookup indexes", _migrate_lookup_indexes),
+]
+
+
+def run_migrations(conn) -> List[int]:
+    """
+    Applies the migrations missing from `schema_migrations`, each one in its
+    own transaction together with its version row. Returns the applied versions.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """)
+    conn.commit()
+
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+        cur.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+        if cur.fetchone():
+            conn.rollback()
+            continue
+
+        print(f"Applying migration {version}: {name}...", flush=True)
+        migrate(cur)
+        cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+        conn.commit()
+        applied.append(version)
+    return applied
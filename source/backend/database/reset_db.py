@@ -1,7 +1,7 @@
 def reset_db_logic(conn):
     try:
         cursor = conn.cursor()
-        cursor.execute("TRUNCATE TABLE hints, metrics, questions RESTART IDENTITY CASCADE;")
+        cursor.execute("TRUNCATE TABLE hints, metrics, questions, bulk_runs RESTART IDENTITY CASCADE;")
         conn.commit()
         cursor.close()
    
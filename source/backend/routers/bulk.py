@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request, HTTPException, Query
+
+from backend.database.connection import run_with_db
+from backend.dependencies import get_or_create_session_id
+from backend.Objects.api_models import BulkGenerateReq
+from backend.services import bulk_generation_service, job_service
+
+router = APIRouter(prefix="/api/bulk", tags=["Bulk"])
+
+# ==========================
+# Bulk hint generation for whole question sets. A run keeps one checkpoint per
+# question and is executed by a background job (see /api/jobs); starting it
+# again continues with the questions that are not done yet.
+# For very large files use the CLI: python bulk_generate.py questions.jsonl
+# ==========================
+
+def _create_and_enqueue(conn, session_id: str, req: BulkGenerateReq) -> dict:
+    params = dict(
+        num_hints=req.num_hints,
+        temperature=req.temperature,
+        max_tokens=req.max_tokens,
+        model_name=req.model_name,
+        answer_aware=req.answer,
+        use_cache=not req.bypass_cache,
+    )
+    items = [{"question": q.question.strip(), "answer": q.answer} for q in req.questions if q.question.strip()]
+    run = bulk_generation_service.create_run(conn, session_id, items, params, source="api")
+    job = job_service.enqueue_job(
+        conn, "bulk_generate", session_id, {"run_id": run["run_id"], "concurrency": req.concurrency}
+    )
+    return {"run": run, "job": job}
+
+@router.post("/generate", status_code=202)
+async def bulk_generate(req: BulkGenerateReq, request: Request):
+    if not any(q.question.strip() for q in req.questions):
+        raise HTTPException(400, detail="At least one question is required.")
+    if req.concurrency is not None and not 1 <= req.concurrency <= 64:
+        raise HTTPException(400, detail="concurrency must be between 1 and 64.")
+    session_id = get_or_create_session_id(request)
+    return await run_with_db(_create_and_enqueue, session_id, req)
+
+@router.get("/runs")
+async def list_runs(request: Request, limit: int = Query(20, ge=1, le=100)):
+    session_id = get_or_create_session_id(request)
+    return {"runs": await run_with_db(bulk_generation_service.list_runs, session_id, limit)}
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: int, request: Request):
+    session_id = get_or_create_session_id(request)
+    run = await run_with_db(bulk_generation_service.get_run, run_id, session_id)
+    if run is None:
+        raise HTTPException(404, detail="Run not found.")
+    return run
+
+@router.post("/runs/{run_id}/resume", status_code=202)
+async def resume_run(run_id: int, request: Request, concurrency: Optional[int] = Query(None, ge=1, le=64)):
+    """Queues the run again, e.g. after a crash or to retry failed questions."""
+    session_id = get_or_create_session_id(request)
+    run = await run_with_db(bulk_generation_service.get_run, run_id, session_id)
+    if run is None:
+        raise HTTPException(404, detail="Run not found.")
+    job = await run_with_db(
+        job_service.enqueue_job, "bulk_generate", session_id, {"run_id": run_id, "concurrency": concurrency}
+    )
+    return {"run": run, "job": job}
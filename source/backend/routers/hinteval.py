@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
-from typing import List
+import os
+import json
+from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List, Tuple
 from pydantic import BaseModel
 
 # Shared logic imports
-from backend.database.connection import get_db
+from backend.database.connection import run_with_db, run_long_task
 from backend.dependencies import get_or_create_session_id
 
 # Pydantic Models
 from backend.Objects.api_models import (
-    GenerateReq, EvaluateReq, HintReq, SaveHintBody, 
+    GenerateReq, EvaluateReq, EvaluateBatchReq, HintReq, SaveHintBody, 
     SaveCandidateBody, DeleteCandidateBody, UpdateAnswerReq, 
     PresetBody, RegenerateAnswerReq, RegenerateCandidatesReq
 )
@@ -25,6 +28,9 @@ from backend.services import (
 
 router = APIRouter(prefix="/api/hinteval", tags=["HintEval"])
 
+# Upper bound for /evaluate_batch; all Instances of a batch are held in memory at once.
+EVAL_BATCH_MAX_ITEMS = int(os.getenv("HINTEVAL_EVAL_BATCH_MAX_ITEMS", "200"))
+
 # --- Request Models for new endpoints ---
 class SetGroundTruthReq(BaseModel):
     candidate_index: int
@@ -33,11 +39,9 @@ class SetGroundTruthReq(BaseModel):
 # API ENDPOINTS
 # ==========================
 
-@router.post("/generate")
-def generate(req: GenerateReq, request: Request, conn=Depends(get_db)):
-    session_id = get_or_create_session_id(request)
-    return generation_service.process_generation(
-        conn=conn,
+def generation_params(req: GenerateReq, session_id: str) -> dict:
+    """Arguments of generation_service.process_generation for a /generate request."""
+    return dict(
         session_id=session_id,
         question=req.question,
         num_hints=req.num_hints,
@@ -45,14 +49,13 @@ def generate(req: GenerateReq, request: Request, conn=Depends(get_db)):
         max_tokens=req.max_tokens,
         model_name=req.model_name,
         answer_aware=(req.answer is not None and req.answer),
+        use_cache=not req.bypass_cache,
         #provided_answer=req.answer if (req.answer is not None and req.answer) else None
     )
 
-@router.post("/evaluate")
-def evaluate(req: EvaluateReq, request: Request, conn=Depends(get_db)):
-    session_id = get_or_create_session_id(request)
-    return evaluation_service.run_evaluation_and_persist(
-        conn=conn,
+def evaluation_params(req: EvaluateReq, session_id: str) -> dict:
+    """Arguments of evaluation_service.run_evaluation_and_persist for an /evaluate request."""
+    return dict(
         session_id=session_id,
         question=req.question,
         hints=req.hints,
@@ -63,111 +66,196 @@ def evaluate(req: EvaluateReq, request: Request, conn=Depends(get_db)):
         max_tokens=req.max_tokens
     )
 
+def evaluation_batch_params(req: EvaluateBatchReq, session_id: str) -> dict:
+    """Arguments of evaluation_service.run_batch_evaluation_and_persist for an /evaluate_batch request."""
+    if not req.items:
+        raise HTTPException(400, detail="At least one item is required.")
+    if len(req.items) > EVAL_BATCH_MAX_ITEMS:
+        raise HTTPException(400, detail=f"At most {EVAL_BATCH_MAX_ITEMS} items per batch.")
+    if any(not item.question or not item.hints for item in req.items):
+        raise HTTPException(400, detail="Every item needs a question and hints.")
+    return dict(
+        session_id=session_id,
+        items=[item.model_dump() for item in req.items],
+        model_name=req.model_name,
+        num_candidates=req.num_candidates,
+        temperature=req.temperature,
+        max_tokens=req.max_tokens
+    )
+
+@router.post("/generate")
+async def generate(req: GenerateReq, request: Request):
+    session_id = get_or_create_session_id(request)
+    return await run_long_task(generation_service.process_generation, **generation_params(req, session_id))
+
+@router.post("/evaluate")
+async def evaluate(req: EvaluateReq, request: Request):
+    session_id = get_or_create_session_id(request)
+    return await run_long_task(evaluation_service.run_evaluation_and_persist, **evaluation_params(req, session_id))
+
+@router.post("/evaluate_batch")
+async def evaluate_batch(req: EvaluateBatchReq, request: Request):
+    """
+    Evaluates many questions with one evaluator pass over all of them, results are stored per question.
+    Candidates given with an item end in its ground truth and replace the stored candidates of the question.
+    """
+    session_id = get_or_create_session_id(request)
+    return await run_long_task(
+        evaluation_service.run_batch_evaluation_and_persist, **evaluation_batch_params(req, session_id)
+    )
+
+# --- Server-Sent Events ---
+# Each event is `event: <name>` plus one JSON `data:` line. Streams end with
+# `done` (same payload as the non-streaming endpoint) or `error`.
+
+def _sse_response(events: AsyncIterator[Tuple[str, Dict]]) -> StreamingResponse:
+    async def body():
+        try:
+            async for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            print(f"Stream aborted: {e}", flush=True)
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/generate_stream")
+async def generate_stream(req: GenerateReq, request: Request):
+    """Streams `answer`, then every `hint` as soon as its line is complete, then `done`."""
+    session_id = get_or_create_session_id(request)
+    return _sse_response(generation_service.astream_generation(**generation_params(req, session_id)))
+
+@router.post("/evaluate_stream")
+async def evaluate_stream(req: EvaluateReq, request: Request):
+    """Streams `progress` and each evaluator's per-hint `metrics` as soon as it finished, then `done`."""
+    session_id = get_or_create_session_id(request)
+    return _sse_response(evaluation_service.astream_evaluation(**evaluation_params(req, session_id)))
+
 @router.get("/get-hints")
-def get_hints(request: Request, conn=Depends(get_db)):
+async def get_hints(request: Request):
     session_id = get_or_create_session_id(request)
-    hints = hint_service.get_hints_for_session(conn, session_id)
+    hints = await run_with_db(hint_service.get_hints_for_session, session_id)
     return {"hints": hints}
 
 @router.get("/get_candidates")
-def get_candidates(request: Request, conn=Depends(get_db)):
+async def get_candidates(request: Request):
     session_id = get_or_create_session_id(request)
-    candidates = candidate_service.get_candidates(conn, session_id)
+    candidates = await run_with_db(candidate_service.get_candidates, session_id)
     return {"candidates": candidates}
 
 @router.get("/session_state")
-def get_session_state(request: Request, conn=Depends(get_db)):
+async def get_session_state(request: Request):
     session_id = get_or_create_session_id(request)
-    return question_service.get_full_session_state(conn, session_id)
+    return await run_with_db(question_service.get_full_session_state, session_id)
 
 @router.post("/save_hint")
-def save_hint(body: SaveHintBody, request: Request, conn=Depends(get_db)):
+async def save_hint(body: SaveHintBody, request: Request):
     session_id = get_or_create_session_id(request)
-    hint_id = hint_service.save_hint(conn, session_id, body.hint_text)
+    hint_id = await run_with_db(hint_service.save_hint, session_id, body.hint_text)
     return {"status": "success", "hint_id": hint_id, "hint_text": body.hint_text}
 
 @router.post("/delete_hint")
-def delete_hint(body: HintReq, request: Request, conn=Depends(get_db)):
-    hint_service.delete_hint(conn, body.hint_id)
+async def delete_hint(body: HintReq, request: Request):
+    await run_with_db(hint_service.delete_hint, body.hint_id)
     return {"status": "success"}
 
 @router.post("/update_hint")
-def update_hint(body: HintReq, request: Request, conn=Depends(get_db)):
-    hint_service.update_hint(conn, body.hint_id, body.hint_text)
+async def update_hint(body: HintReq, request: Request):
+    await run_with_db(hint_service.update_hint, body.hint_id, body.hint_text)
     return {"status": "success"}
 
 @router.post("/delete_all_hints")
-def delete_all_hints(request: Request, conn=Depends(get_db)):
+async def delete_all_hints(request: Request):
     session_id = get_or_create_session_id(request)
-    hint_service.delete_all_hints(conn, session_id)
+    await run_with_db(hint_service.delete_all_hints, session_id)
     return {"status": "success"}
 
 @router.post("/save_candidate")
-def save_candidate(body: SaveCandidateBody, request: Request, conn=Depends(get_db)):
+async def save_candidate(body: SaveCandidateBody, request: Request):
     session_id = get_or_create_session_id(request)
     try:
-        candidate_service.save_candidate(conn, session_id, body.candidate_text, body.candidate_index)
+        await run_with_db(candidate_service.save_candidate, session_id, body.candidate_text, body.candidate_index)
         return {"status": "success"}
     except IndexError as e:
         raise HTTPException(400, detail=str(e))
 
 @router.post("/delete_candidate")
-def delete_candidate(body: DeleteCandidateBody, request: Request, conn=Depends(get_db)):
+async def delete_candidate(body: DeleteCandidateBody, request: Request):
     session_id = get_or_create_session_id(request)
     try:
-        candidate_service.delete_candidate(conn, session_id, body.candidate_index)
+        await run_with_db(candidate_service.delete_candidate, session_id, body.candidate_index)
         return {"status": "success"}
     except IndexError as e:
         raise HTTPException(400, detail=str(e))
 
 @router.post("/delete_all_candidates")
-def delete_all_candidates(request: Request, conn=Depends(get_db)):
+async def delete_all_candidates(request: Request):
     session_id = get_or_create_session_id(request)
-    candidate_service.delete_all_candidates(conn, session_id)
+    await run_with_db(candidate_service.delete_all_candidates, session_id)
     return {"status": "success"}
 
 @router.post("/set_ground_truth")
-def set_ground_truth(body: SetGroundTruthReq, request: Request, conn=Depends(get_db)):
+async def set_ground_truth(body: SetGroundTruthReq, request: Request):
     session_id = get_or_create_session_id(request)
     try:
-        candidate_service.set_ground_truth_candidate(conn, session_id, body.candidate_index)
+        await run_with_db(candidate_service.set_ground_truth_candidate, session_id, body.candidate_index)
         return {"status": "success"}
     except IndexError as e:
         raise HTTPException(400, detail=str(e))
 
 @router.post("/reset_all")
-def reset_all(request: Request, conn=Depends(get_db)):
+async def reset_all(request: Request):
     session_id = get_or_create_session_id(request)
-    question_service.reset_session(conn, session_id)
+    await run_with_db(question_service.reset_session, session_id)
     return {"status": "success"}
 
 @router.post("/update_answer")
-def update_answer(body: UpdateAnswerReq, request: Request, conn=Depends(get_db)):
+async def update_answer(body: UpdateAnswerReq, request: Request):
     session_id = get_or_create_session_id(request)
-    qid = question_service.get_latest_question_id(conn, session_id)
-    if not qid:
+    if not await run_with_db(question_service.update_session_answer, session_id, body.answer):
         raise HTTPException(400, "No active question found to update.")
-    question_service.update_existing_answer(conn, qid, body.answer)
-    question_service.clear_metrics_for_question(conn, qid)
     return {"status": "success"}
 
 @router.post("/regenerate_answer")
-def regenerate_answer(req: RegenerateAnswerReq, request: Request, conn=Depends(get_db)):
+async def regenerate_answer(req: RegenerateAnswerReq, request: Request):
     session_id = get_or_create_session_id(request)
-    question_id = question_service.get_latest_question_id(conn, session_id)
-    answer_text = generation_service.generate_only_answer(conn=conn, session_id=session_id,question=req.question,
-        model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens,question_id=question_id, top_p=req.top_p, hints=req.hints)
+    question_id = await run_with_db(question_service.get_latest_question_id, session_id)
+    answer_text = await generation_service.agenerate_only_answer(session_id=session_id,question=req.question,
+        model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens,question_id=question_id, top_p=req.top_p, hints=req.hints,
+        use_cache=not req.bypass_cache)
     return {"answer": answer_text}
 
 @router.post("/regenerate_candidates")
-def regenerate_candidates(req: RegenerateCandidatesReq, request: Request, conn=Depends(get_db)):
+async def regenerate_candidates(req: RegenerateCandidatesReq, request: Request):
     session_id = get_or_create_session_id(request)
-    candidates = candidate_service.generate_candidates_for_session(conn=conn, session_id=session_id,
-        num_candidates=req.num_candidates, model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens, hints=req.hints, top_p=req.top_p)
+    candidates = await candidate_service.agenerate_candidates_for_session(session_id=session_id,
+        num_candidates=req.num_candidates, model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens, hints=req.hints, top_p=req.top_p,
+        use_cache=not req.bypass_cache)
     return {"candidates": candidates}
 
+@router.post("/regenerate_answer_stream")
+async def regenerate_answer_stream(req: RegenerateAnswerReq, request: Request):
+    """Streams the answer as `token` events, then `done` once it is stored."""
+    session_id = get_or_create_session_id(request)
+    question_id = await run_with_db(question_service.get_latest_question_id, session_id)
+    return _sse_response(generation_service.astream_answer(question=req.question,
+        model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens, question_id=question_id, top_p=req.top_p, hints=req.hints,
+        use_cache=not req.bypass_cache))
+
+@router.post("/regenerate_candidates_stream")
+async def regenerate_candidates_stream(req: RegenerateCandidatesReq, request: Request):
+    """Streams every `candidate` as soon as its line is complete, then `done` once they are stored."""
+    session_id = get_or_create_session_id(request)
+    return _sse_response(candidate_service.astream_candidates_for_session(session_id=session_id,
+        num_candidates=req.num_candidates, model_name=req.model_name, temperature=req.temperature, max_tokens=req.max_tokens, hints=req.hints, top_p=req.top_p,
+        use_cache=not req.bypass_cache))
+
 @router.post("/load_preset")
-def load_preset(body: PresetBody, request: Request, conn=Depends(get_db)):
+async def load_preset(body: PresetBody, request: Request):
     session_id = get_or_create_session_id(request)
-    question_service.reset_session(conn, session_id)
-    return save_and_load_service.load_full_preset_state(conn, session_id, body.data)
\ No newline at end of file
+    await run_with_db(question_service.reset_session, session_id)
+    return await run_with_db(save_and_load_service.load_full_preset_state, session_id, body.data)
\ No newline at end of file
@@ -0,0 +1,63 @@
+from typing import Optional
+
+from fastapi import APIRouter, Request, Header, HTTPException, Query
+
+from backend.database.connection import run_with_db
+from backend.dependencies import get_or_create_session_id
+from backend.Objects.api_models import GenerateReq, EvaluateReq, EvaluateBatchReq
+from backend.routers.hinteval import generation_params, evaluation_params, evaluation_batch_params
+from backend.services import job_service
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+# ==========================
+# Background variants of /hinteval/generate, /hinteval/evaluate and
+# /hinteval/evaluate_batch. They return 202 with a job id right away, poll
+# GET /api/jobs/{job_id} for progress and the result (same payload as the synchronous endpoint).
+# ==========================
+
+async def _enqueue(kind: str, params: dict, session_id: str, idempotency_key: Optional[str]):
+    try:
+        return await run_with_db(job_service.enqueue_job, kind, session_id, params, idempotency_key)
+    except job_service.IdempotencyConflict as e:
+        raise HTTPException(409, detail=str(e))
+
+@router.post("/generate", status_code=202)
+async def enqueue_generate(
+    req: GenerateReq,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    session_id = get_or_create_session_id(request)
+    return await _enqueue("generate", generation_params(req, session_id), session_id, idempotency_key)
+
+@router.post("/evaluate", status_code=202)
+async def enqueue_evaluate(
+    req: EvaluateReq,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    session_id = get_or_create_session_id(request)
+    return await _enqueue("evaluate", evaluation_params(req, session_id), session_id, idempotency_key)
+
+@router.post("/evaluate_batch", status_code=202)
+async def enqueue_evaluate_batch(
+    req: EvaluateBatchReq,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    session_id = get_or_create_session_id(request)
+    return await _enqueue("evaluate_batch", evaluation_batch_params(req, session_id), session_id, idempotency_key)
+
+@router.get("")
+async def list_jobs(request: Request, limit: int = Query(20, ge=1, le=100)):
+    session_id = get_or_create_session_id(request)
+    return {"jobs": await run_with_db(job_service.list_jobs, session_id, limit)}
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, request: Request):
+    session_id = get_or_create_session_id(request)
+    job = await run_with_db(job_service.get_job, session_id, job_id)
+    if job is None:
+        raise HTTPException(404, detail="Job not found.")
+    return job
@@ -1,11 +1,13 @@
-import json
+import gzip
 import logging
+import itertools
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Request, Query, UploadFile, File, HTTPException
-from fastapi.responses import Response, StreamingResponse
+import anyio.to_thread
+from fastapi import APIRouter, Request, Query, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
 
-from backend.database.connection import get_db
+from backend.database.connection import ExportSlotsFull, PoolTimeout, run_with_db
 from backend.dependencies import get_or_create_session_id
 from backend.services import save_and_load_service
 
@@ -13,86 +15,74 @@ router = APIRouter(prefix="/api/save_and_load", tags=["Save and Load"])
 logger = logging.getLogger(__name__)
 
 @router.get("/export")
-def export_session(
-    format: str = Query(..., regex="^(json|csv|full_json)$"),
+async def export_session(
+    format: str = Query(..., regex="^(json|csv|full_json|full_csv|ndjson)$"),
+    gzip: bool = Query(False),
+    scope: str = Query("latest", regex="^(latest|session)$"),
     request: Request = None,
-    conn=Depends(get_db)
 ):
     """
-    Exports session data. Supports JSON (basic/full) and CSV.
+    Exports session data as JSON (basic/full), CSV (basic/full) or NDJSON:
+    the latest question, or with scope=session every question of the session.
+    The file is streamed while it is read from the database, optionally gzipped.
     """
     session_id = get_or_create_session_id(request)
-    
+
     try:
-        if format == "csv":
-            stream = save_and_load_service.export_session_csv_stream(conn, session_id)
-            return StreamingResponse(
-                iter([stream.getvalue()]),
-                media_type="text/csv",
-                headers={"Content-Disposition": "attachment; filename=hinteval_session.csv"}
-            )
-            
-        is_full = (format == "full_json")
-        filename = "hinteval_backup_full.json" if is_full else "hinteval_session.json"
-        
-        data = save_and_load_service.export_session_json(conn, session_id, full_export=is_full)
-        
-        return Response(
-            content=json.dumps(data, indent=2),
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        chunks = save_and_load_service.stream_session_export(
+            session_id, format, compress=gzip, all_questions=(scope == "session")
         )
-    
+        # Reads up to the first chunk here so that failures still become a 500
+        first = await anyio.to_thread.run_sync(next, chunks, None)
+    except (ExportSlotsFull, PoolTimeout) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Export failed: {e}")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+    media_type = "application/gzip" if gzip else save_and_load_service.EXPORT_MEDIA_TYPES[format.replace("full_", "")]
+    filename = save_and_load_service.export_filename(format, compress=gzip)
+    return StreamingResponse(
+        itertools.chain([first] if first else [], chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 
 @router.post("/import")
 async def import_session(
     file: UploadFile = File(...),
     request: Request = None,
-    conn=Depends(get_db)
 ):
     """
-    Imports session data (JSON or CSV).
+    Imports session data (JSON or CSV, optionally gzipped). The upload is parsed
+    incrementally and written with COPY, so large datasets import in one pass.
     WARNING: Clears all existing data for the current session before importing.
     """
     session_id = get_or_create_session_id(request)
-    
-    try:
-        content = await file.read()
-        filename = (file.filename or "").lower()
-        
-        import_data = None
+
+    filename = (file.filename or "").lower()
+    compressed = filename.endswith(".gz")
+    if compressed:
+        filename = filename[:-3]
+    if filename.endswith(".json"):
         format_type = "json"
+    elif filename.endswith(".csv"):
+        format_type = "csv"
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file type. Use .json or .csv (optionally .gz)")
 
-        if filename.endswith(".json"):
-            try:
-                import_data = json.loads(content.decode('utf-8'))
-                format_type = "json"
-            except json.JSONDecodeError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid JSON format: {str(e)}")
-        
-        elif filename.endswith(".csv"):
-            import_data = content
-            format_type = "csv"
-            
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type. Use .json or .csv")
+    try:
+        upload = gzip.GzipFile(fileobj=file.file, mode="rb") if compressed else file.file
 
-        logger.info(f"Clearing session {session_id} for import.")
-        clear_result = save_and_load_service.clear_session_data(conn, session_id)
-        
-        # Execute Import
-        logger.info(f"Importing {format_type} data for session {session_id}")
-        result = save_and_load_service.import_session_data(
-            conn=conn, 
-            session_id=session_id, 
-            data=import_data, 
+        logger.info(f"Importing {format_type} data for session {session_id} (replacing its data)")
+        clear_result, result = await run_with_db(
+            save_and_load_service.import_session_upload,
+            session_id=session_id,
+            fileobj=upload,
             format_type=format_type
         )
-        
+
         return {
             "status": "success",
             "session_id": session_id,
@@ -100,7 +90,7 @@ async def import_session(
             "import": result
         }
 
-    except ValueError as ve:
+    except (ValueError, EOFError, gzip.BadGzipFile) as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Import error: {e}", exc_info=True)
@@ -108,16 +98,15 @@ async def import_session(
 
 
 @router.delete("/clear")
-def clear_session(
+async def clear_session(
     request: Request = None,
-    conn=Depends(get_db)
 ):
     """
     Wipes all data for the current session ID.
     """
     session_id = get_or_create_session_id(request)
     try:
-        result = save_and_load_service.clear_session_data(conn, session_id)
+        result = await run_with_db(save_and_load_service.clear_session_data, session_id)
         return {"status": "success", "session_id": session_id, **result}
     except Exception as e:
         logger.error(f"Clear session failed: {e}")
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+
+from backend.database.connection import get_db, get_pool_stats
+from backend.services import (
+    model_registry, evaluation_cache, llm_client, llm_resilience, llm_cache, job_service, embedding_service
+)
+
+router = APIRouter(prefix="/api/system", tags=["System"])
+
+@router.get("/models")
+def get_models():
+    """Load status, load time and resident memory of the evaluation models."""
+    return model_registry.get_model_stats()
+
+@router.get("/embeddings")
+def get_embeddings():
+    """Queue depth, batch sizes and encode time of the shared sentence-transformer runtime."""
+    return embedding_service.get_stats()
+
+@router.get("/db_pool")
+def get_db_pool():
+    """Connections in use, waiting callers and wait times of the database pool."""
+    return get_pool_stats()
+
+@router.get("/evaluation_cache")
+def get_evaluation_cache(conn=Depends(get_db)):
+    """Size of the content-addressed evaluation cache per evaluator."""
+    return evaluation_cache.get_cache_stats(conn)
+
+@router.get("/llm")
+def get_llm_client():
+    """Connection settings and in-flight requests of the shared LLM client."""
+    return llm_client.get_client().stats()
+
+@router.get("/llm_breakers")
+def get_llm_breakers():
+    """Circuit breaker state per LLM model."""
+    return llm_resilience.get_breaker_states()
+
+@router.get("/llm_cache")
+def get_llm_cache():
+    """Hit/miss counters of the LLM response cache."""
+    return llm_cache.get_cache_stats()
+
+@router.get("/jobs")
+def get_jobs(conn=Depends(get_db)):
+    """Background jobs per status and the age of the oldest queued job."""
+    return job_service.get_queue_stats(conn)
@@ -0,0 +1,336 @@
+from __future__ import annotations
+import os
+import csv
+import json
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.database.bulk import bulk_insert
+from backend.database.connection import pooled_connection
+
+# Questions generated at the same time by one run. The LLM client's in-flight
+# limit (LLM_MAX_IN_FLIGHT) still caps the requests of the whole process.
+BULK_CONCURRENCY = int(os.getenv("HINTEVAL_BULK_CONCURRENCY", "8"))
+# A failed question is retried by later resumes until it failed this often.
+BULK_MAX_ATTEMPTS = int(os.getenv("HINTEVAL_BULK_MAX_ATTEMPTS", "3"))
+# Claimed questions without a result after this long belong to a crashed runner.
+# A bulk_generate job requeued by the job queue reclaims them right away.
+BULK_STALE_SECONDS = int(os.getenv("HINTEVAL_BULK_STALE_SECONDS", "600"))
+
+_RUN_COLUMNS = "id, session_id, source, params_json, status, created_at, updated_at"
+
+# =====================================================================================
+# Question files
+# =====================================================================================
+
+def _dataset_rows(data: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    """Question and first answer of every instance of a HintEval Dataset (subsets -> instances)."""
+    rows = []
+    for subset in data["subsets"].values():
+        for instance in ((subset or {}).get("instances") or {}).values():
+            question = instance.get("question")
+            answer = (instance.get("answers") or [None])[0]
+            rows.append({
+                "question": question.get("question") if isinstance(question, dict) else question,
+                "answer": answer.get("answer") if isinstance(answer, dict) else answer,
+            })
+    return rows
+
+def load_questions(path: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Reads questions from a .txt (one per line), .jsonl, .json or .csv file.
+    JSON rows and CSV columns are `question` and optionally `answer`; a .json
+    file is either a list of such rows or a HintEval Dataset file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if ext == ".txt":
+            rows = [{"question": line} for line in f]
+        elif ext == ".jsonl":
+            rows = [json.loads(line) for line in f if line.strip()]
+        elif ext == ".json":
+            data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("subsets"), dict):
+                rows = _dataset_rows(data)
+            elif isinstance(data, list):
+                rows = data
+            else:
+                raise ValueError(f"{path} holds neither a list of questions nor a HintEval Dataset")
+        elif ext == ".csv":
+            rows = list(csv.DictReader(f))
+        else:
+            raise ValueError(f"Unsupported question file: {path} (use .txt, .jsonl, .json or .csv)")
+
+    items = []
+    for row in rows:
+        if isinstance(row, str):
+            row = {"question": row}
+        elif not isinstance(row, dict):
+            raise ValueError(f"Unsupported question row in {path}: {row!r}")
+        question = (row.get("question") or "").strip()
+        if question:
+            items.append({"question": question, "answer": (row.get("answer") or "").strip() or None})
+    return items
+
+# =====================================================================================
+# Runs
+# =====================================================================================
+
+def _row_to_run(row, counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    counts = counts or {}
+    return {
+        "run_id": row[0],
+        "source": row[2],
+        "params": json.loads(row[3]),
+        "status": row[4],
+        "created_at": row[5].isoformat() if row[5] else None,
+        "updated_at": row[6].isoformat() if row[6] else None,
+        "total": sum(counts.values()),
+        **{status: counts.get(status, 0) for status in ("pending", "running", "done", "failed")},
+    }
+
+def create_run(
+    conn,
+    session_id: str,
+    items: List[Dict[str, Optional[str]]],
+    params: Dict[str, Any],
+    source: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Stores a run and one pending checkpoint row per question. `params` are the
+    generation arguments shared by all questions (num_hints, temperature,
+    max_tokens, model_name, answer_aware, use_cache). Without a model_name the
+    backend default is stored, so a resumed run keeps the model it started with.
+    """
+    from backend.services.generation_service import API_Info
+
+    if not items:
+        raise ValueError("A bulk run needs at least one question.")
+    params = {**params, "model_name": params.get("model_name") or API_Info.model_name}
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            f"INSERT INTO bulk_runs (session_id, source, params_json) VALUES (%s, %s, %s) RETURNING {_RUN_COLUMNS}",
+            (session_id, source, json.dumps(params, sort_keys=True))
+        )
+        row = cur.fetchone()
+        bulk_insert(
+            cur,
+            "bulk_run_items",
+            ("run_id", "position", "question_text", "answer_text"),
+            [(row[0], i, item["question"], item.get("answer")) for i, item in enumerate(items)]
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return _row_to_run(row, {"pending": len(items)})
+
+def get_run(conn, run_id: int, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The run with its question counts per status; `session_id` restricts it to one session."""
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {_RUN_COLUMNS} FROM bulk_runs WHERE id = %s AND (%s::text IS NULL OR session_id = %s)",
+        (run_id, session_id, session_id)
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    cur.execute("SELECT status, COUNT(*) FROM bulk_run_items WHERE run_id = %s GROUP BY status", (run_id,))
+    counts = dict(cur.fetchall())
+    cur.execute(
+        """
+        SELECT position, question_text, error, attempts FROM bulk_run_items
+        WHERE run_id = %s AND status = 'failed' ORDER BY position LIMIT 20
+        """,
+        (run_id,)
+    )
+    run = _row_to_run(row, counts)
+    run["failures"] = [
+        {"position": r[0], "question": r[1], "error": r[2], "attempts": r[3]} for r in cur.fetchall()
+    ]
+    return run
+
+def list_runs(conn, session_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT {_RUN_COLUMNS} FROM bulk_runs
+        WHERE session_id = %s ORDER BY created_at DESC, id DESC LIMIT %s
+        """,
+        (session_id, limit)
+    )
+    runs = cur.fetchall()
+    if not runs:
+        return []
+    cur.execute(
+        "SELECT run_id, status, COUNT(*) FROM bulk_run_items WHERE run_id = ANY(%s) GROUP BY run_id, status",
+        ([r[0] for r in runs],)
+    )
+    counts: Dict[int, Dict[str, int]] = {}
+    for run_id, status, count in cur.fetchall():
+        counts.setdefault(run_id, {})[status] = count
+    return [_row_to_run(r, counts.get(r[0])) for r in runs]
+
+def _set_run_status(conn, run_id: int, status: str) -> None:
+    cur = conn.cursor()
+    cur.execute("UPDATE bulk_runs SET status = %s, updated_at = now() WHERE id = %s", (status, run_id))
+    conn.commit()
+
+def _reset_items(conn, run_id: int, reclaim: bool) -> None:
+    """
+    Makes the unfinished questions of a run claimable again: failed ones below
+    BULK_MAX_ATTEMPTS, and claimed ones whose runner went away (all of them
+    with `reclaim`, else those older than BULK_STALE_SECONDS).
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE bulk_run_items SET status = 'pending', claimed_at = NULL
+        WHERE run_id = %s AND (
+            (status = 'failed' AND attempts < %s)
+            OR (status = 'running' AND (%s OR claimed_at < now() - make_interval(secs => %s)))
+        )
+        """,
+        (run_id, BULK_MAX_ATTEMPTS, reclaim, BULK_STALE_SECONDS)
+    )
+    conn.commit()
+
+def _claim_item(conn, run_id: int):
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE bulk_run_items
+        SET status = 'running', claimed_at = now(), attempts = attempts + 1
+        WHERE (run_id, position) = (
+            SELECT run_id, position FROM bulk_run_items
+            WHERE run_id = %s AND status = 'pending'
+            ORDER BY position
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING position, question_text, answer_text
+        """,
+        (run_id,)
+    )
+    row = cur.fetchone()
+    conn.commit()
+    return row
+
+def _finish_item(conn, run_id: int, position: int, question_id: Optional[int], error: Optional[str]) -> None:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE bulk_run_items
+        SET status = %s, question_id = %s, error = %s, finished_at = now()
+        WHERE run_id = %s AND position = %s
+        """,
+        ("failed" if error else "done", question_id, error, run_id, position)
+    )
+
+# =====================================================================================
+# Execution
+# =====================================================================================
+
+def run_bulk_generation(
+    run_id: int,
+    concurrency: Optional[int] = None,
+    reclaim: bool = False,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Generates answer and hints for every unfinished question of the run with
+    `concurrency` worker threads. Each question is stored together with its
+    checkpoint in one transaction as soon as it is generated, so a run that
+    stopped half way continues where it was when it is started again.
+    Several runners may work on the same run, questions are claimed with
+    FOR UPDATE SKIP LOCKED. Returns the run with its final counts.
+    """
+    from backend.services.generation_service import generate_answer_hints, persist_generation, API_Info
+
+    report = progress or (lambda phase, detail: None)
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT session_id, params_json FROM bulk_runs WHERE id = %s", (run_id,))
+        row = cur.fetchone()
+        if row is None:
+            raise ValueError(f"Bulk run {run_id} not found.")
+        session_id, params = row[0], json.loads(row[1])
+        _reset_items(conn, run_id, reclaim)
+        _set_run_status(conn, run_id, "running")
+
+    cfg = API_Info(model_name=params.get("model_name") or API_Info.model_name)
+    counts = {"done": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def generate_one(position: int, question: str, answer: Optional[str]) -> str:
+        try:
+            answer_text, hint_texts = generate_answer_hints(
+                question=question,
+                num_hints=params.get("num_hints"),
+                temperature=params.get("temperature"),
+                max_tokens=params.get("max_tokens"),
+                cfg=cfg,
+                answer=bool(params.get("answer_aware")),
+                provided_answer_text=answer,
+                use_cache=params.get("use_cache", True),
+                enable_tqdm=False
+            )
+        except Exception as e:
+            traceback.print_exc()
+            with pooled_connection() as conn:
+                _finish_item(conn, run_id, position, None, f"{type(e).__name__}: {e}")
+                conn.commit()
+            return "failed"
+
+        with pooled_connection() as conn:
+            try:
+                answer_obj, _ = persist_generation(
+                    conn, session_id, question, answer_text, cfg.model_name, hint_texts, commit=False
+                )
+                _finish_item(conn, run_id, position, answer_obj.question_id, None)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Bulk run {run_id}: question {position} could not be stored: {e}", flush=True)
+                _finish_item(conn, run_id, position, None, f"{type(e).__name__}: {e}")
+                conn.commit()
+                return "failed"
+        return "done"
+
+    def worker() -> None:
+        while True:
+            with pooled_connection() as conn:
+                item = _claim_item(conn, run_id)
+            if item is None:
+                return
+            outcome = generate_one(*item)
+            with counts_lock:
+                counts[outcome] += 1
+                elapsed = max(time.perf_counter() - started, 1e-6)
+                report("generating", {
+                    **counts, "questions_per_minute": round((counts["done"] + counts["failed"]) * 60 / elapsed, 1)
+                })
+
+    workers = max(1, concurrency or params.get("concurrency") or BULK_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"hinteval-bulk-{run_id}") as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+
+    with pooled_connection() as conn:
+        run = get_run(conn, run_id)
+        # Another runner may still be working on claimed questions
+        if not run["pending"] and not run["running"]:
+            _set_run_status(conn, run_id, "completed" if not run["failed"] else "completed_with_errors")
+            run = get_run(conn, run_id)
+
+    print(
+        f"Bulk run {run_id}: {counts['done']} generated, {counts['failed']} failed "
+        f"in {time.perf_counter() - started:.1f}s ({run['done']}/{run['total']} done overall).",
+        flush=True
+    )
+    return run
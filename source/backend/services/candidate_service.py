@@ -1,11 +1,8 @@
 import psycopg2
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from .question_service import get_latest_question_id, clear_metrics_for_question
-from .generation_service import generate_only_candidates
-
-def _now() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+from .generation_service import generate_only_candidates, agenerate_only_candidates, astream_candidates
+from backend.database.connection import run_with_db
 
 def get_candidates(conn, session_id: str) -> List[Dict[str, Any]]:
     qid = get_latest_question_id(conn, session_id)
@@ -39,8 +36,8 @@ def save_candidate(conn, session_id: str, text: str, index: Optional[int] = None
         is_gt = not has_gt
 
         cur.execute(
-            "INSERT INTO candidate_answers (question_id, candidate_text, created_at, is_groundtruth) VALUES (%s, %s, %s, %s)",
-            (qid, text, _now(), bool(is_gt))
+            "INSERT INTO candidate_answers (question_id, candidate_text, is_groundtruth) VALUES (%s, %s, %s)",
+            (qid, text, bool(is_gt))
         )
     else:
         cur.execute("SELECT id FROM candidate_answers WHERE question_id = %s ORDER BY id ASC", (qid,))
@@ -50,7 +47,7 @@ def save_candidate(conn, session_id: str, text: str, index: Optional[int] = None
             raise IndexError("Candidate index out of range")
         
         cand_id = rows[index][0]
-        cur.execute("UPDATE candidate_answers SET candidate_text = %s, updated_at = %s WHERE id = %s", (text, _now(), cand_id))
+        cur.execute("UPDATE candidate_answers SET candidate_text = %s, updated_at = now() WHERE id = %s", (text, cand_id))
     
     conn.commit()
     clear_metrics_for_question(conn, qid)
@@ -115,26 +112,18 @@ def delete_all_candidates(conn, session_id: str) -> None:
         conn.commit()
         clear_metrics_for_question(conn, qid)
 
-def generate_candidates_for_session(
-    conn, 
-    session_id: str, 
-    num_candidates: int,
-    model_name: str,
-    temperature: float,
-    max_tokens: int,
-    hints: Optional[List[str]] = None,
-    top_p: float = 0.9
-) -> List[str]:
+def _latest_question(conn, session_id: str):
     qid = get_latest_question_id(conn, session_id)
     if not qid:
         raise ValueError("No active question to generate candidates for.")
-        
+
     cur = conn.cursor()
     cur.execute("SELECT text FROM questions WHERE id = %s", (qid,))
-    question = cur.fetchone()[0]
-    
-    candidates = generate_only_candidates(question, num_candidates, temperature, model_name, max_tokens, hints=hints)
-    
+    return qid, cur.fetchone()[0]
+
+def replace_candidates(conn, qid: int, candidates: List[str]) -> None:
+    """Stores freshly generated candidates, the last one becomes the ground truth."""
+    cur = conn.cursor()
     cur.execute("DELETE FROM candidate_answers WHERE question_id = %s", (qid,))
     
     last_candidate = candidates[-1] if candidates else "N/A"
@@ -142,11 +131,65 @@ def generate_candidates_for_session(
     for c in candidates:
         is_gt = (c == last_candidate)
         cur.execute(
-            "INSERT INTO candidate_answers (question_id, candidate_text, created_at, is_groundtruth) VALUES (%s, %s, %s, %s)",
-            (qid, c, _now(), bool(is_gt))
+            "INSERT INTO candidate_answers (question_id, candidate_text, is_groundtruth) VALUES (%s, %s, %s)",
+            (qid, c, bool(is_gt))
         )
 
     conn.commit()
     clear_metrics_for_question(conn, qid)
-    
-    return candidates
\ No newline at end of file
+
+def generate_candidates_for_session(
+    conn, 
+    session_id: str, 
+    num_candidates: int,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> List[str]:
+    qid, question = _latest_question(conn, session_id)
+    candidates = generate_only_candidates(question, num_candidates, temperature, model_name, max_tokens, hints=hints, top_p=top_p, use_cache=use_cache)
+    replace_candidates(conn, qid, candidates)
+    return candidates
+
+async def agenerate_candidates_for_session(
+    session_id: str, 
+    num_candidates: int,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> List[str]:
+    """Async variant of generate_candidates_for_session; no connection is held while the LLM answers."""
+    qid, question = await run_with_db(_latest_question, session_id)
+    candidates = await agenerate_only_candidates(question, num_candidates, temperature, model_name, max_tokens, hints=hints, top_p=top_p, use_cache=use_cache)
+    await run_with_db(replace_candidates, qid, candidates)
+    return candidates
+
+async def astream_candidates_for_session(
+    session_id: str, 
+    num_candidates: int,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of agenerate_candidates_for_session: yields each candidate
+    as it is parsed, then ("done", {"candidates": [...]}) once they are stored.
+    """
+    qid, question = await run_with_db(_latest_question, session_id)
+    candidates: List[str] = []
+    async for event, data in astream_candidates(question, num_candidates, temperature, model_name, max_tokens, hints=hints, top_p=top_p, use_cache=use_cache):
+        if event == "candidates":
+            candidates = data["candidates"]
+        else:
+            yield event, data
+    await run_with_db(replace_candidates, qid, candidates)
+    yield "done", {"candidates": candidates}
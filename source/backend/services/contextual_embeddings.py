@@ -0,0 +1,84 @@
+"""
+HintEval's contextual answer-leakage evaluator on the shared embedding runtime.
+Imported by the model registry's factory only, it pulls in HintEval and spaCy.
+"""
+import string
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import spacy
+from tok import word_tokenize
+from hinteval.cores.evaluation_core import AnswerLeakage
+from hinteval.evaluation.answer_leakage import ContextualEmbeddings
+from hinteval.utils.functions.download_manager import SpacyDownloader
+
+from backend.services.embedding_service import get_encoder, normalize
+
+_METHODS = ("include_stop_words", "exclude_stop_words")
+
+
+class SharedContextualEmbeddings(ContextualEmbeddings):
+    """
+    ContextualEmbeddings whose SBERT model is the process wide encoder of
+    embedding_service instead of a private SentenceTransformer, so the model is
+    loaded once and its forward passes are batched with other callers.
+    `evaluate` encodes the words of all hints and answers in one request up
+    front; the per hint similarities are then computed from those vectors.
+    Scores match ContextualEmbeddings (max cosine similarity of hint words and answer).
+    """
+
+    def __init__(self, sbert_model: str = "all-mpnet-base-v2", method: str = "include_stop_words",
+                 spacy_pipeline: str = "en_core_web_sm", checkpoint: bool = False,
+                 checkpoint_step: int = 1, enable_tqdm: bool = False):
+        # ContextualEmbeddings.__init__ without loading its own SentenceTransformer
+        if method not in _METHODS:
+            raise ValueError(f'Invalid method name: "{method}". Choose one of: {", ".join(_METHODS)}')
+        AnswerLeakage.__init__(self, checkpoint, checkpoint_step, enable_tqdm)
+        self._file_name = f"answer_leakage_contextual_{method}.pickle"
+        self._batch_size = 1
+        self._model_name = sbert_model
+        self._method = method
+        self._spacy_pipeline = spacy_pipeline
+        SpacyDownloader.download(spacy_pipeline)
+        self._spacy_model = spacy.load(self._spacy_pipeline)
+        self._stop_words = self._spacy_model.Defaults.stop_words
+        self._model = get_encoder(sbert_model)
+        # The registry shares one evaluator between threads
+        self._local = threading.local()
+
+    def _answer_text(self, answer: str) -> str:
+        words = word_tokenize(answer)
+        if self._method == "exclude_stop_words":
+            words = [w for w in words if w not in self._stop_words and w not in string.punctuation and w != "'s"]
+        else:
+            words = [w for w in words if w not in string.punctuation and w != "'s"]
+        return " ".join(words)
+
+    def _vectors(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        cached: Optional[Dict[str, np.ndarray]] = getattr(self._local, "vectors", None)
+        vectors = dict(cached or {})
+        missing = list(dict.fromkeys(t for t in texts if t not in vectors))
+        if missing:
+            vectors.update(zip(missing, normalize(self._model.encode(missing))))
+        return vectors
+
+    def _similarity(self, hint_words, answer):
+        if not hint_words:
+            return 0.0
+        vectors = self._vectors(list(hint_words) + [answer])
+        hint_matrix = np.stack([vectors[w] for w in hint_words])
+        return float(np.max(hint_matrix @ vectors[answer]))
+
+    def evaluate(self, instances, **kwargs):
+        texts = []
+        for instance in instances:
+            if instance.answers:
+                texts.append(self._answer_text(instance.answers[0].answer))
+            for hint in instance.hints:
+                texts.extend(word_tokenize(hint.hint))
+        self._local.vectors = self._vectors(texts)
+        try:
+            return super().evaluate(instances, **kwargs)
+        finally:
+            self._local.vectors = None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import os
+import hashlib
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+from backend.services.embedding_service import normalize
+
+# Stored precision of the vectors: float16 halves the size, the cosine
+# similarities shown on the metrics page differ by less than 1e-3.
+EMBEDDING_DTYPE = np.dtype(os.getenv("HINTEVAL_EMBEDDING_DTYPE", "float16"))
+EMBEDDING_CACHE_ENABLED = os.getenv("HINTEVAL_EMBEDDING_CACHE", "1") == "1"
+
+# encode(texts) -> array of shape (len(texts), dim)
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def get_embeddings(conn, texts: List[str], model: Union[str, Callable[[], str]], encode: Encoder) -> np.ndarray:
+    """
+    Unit length embeddings of `texts` as a float32 matrix (one row per text).
+    Vectors are looked up by (text hash, model); only texts without a stored
+    vector are passed to `encode`, in one call, and stored for the next time.
+    A callable `model` is asked again before storing, as loading the model in
+    `encode` can change the backend the vectors come from.
+    """
+    model_of = model if callable(model) else (lambda: model)
+    model = model_of()
+    hashes = [text_hash(t) for t in texts]
+    vectors: Dict[str, np.ndarray] = {}
+
+    cur = conn.cursor()
+    if EMBEDDING_CACHE_ENABLED:
+        cur.execute(
+            "SELECT text_hash, dtype, vector FROM hint_embeddings WHERE model = %s AND text_hash = ANY(%s)",
+            (model, list(set(hashes)))
+        )
+        for h, dtype, blob in cur.fetchall():
+            vectors[h] = np.frombuffer(bytes(blob), dtype=dtype).astype(np.float32)
+
+    missing: Dict[str, str] = {}
+    for h, t in zip(hashes, texts):
+        if h not in vectors:
+            missing.setdefault(h, t)
+
+    if missing:
+        encoded = normalize(encode(list(missing.values())))
+        model = model_of()
+        for h, vec in zip(missing, encoded):
+            vectors[h] = vec
+        if EMBEDDING_CACHE_ENABLED:
+            cur.execute(
+                """
+                INSERT INTO hint_embeddings (text_hash, model, dim, dtype, vector)
+                SELECT * FROM unnest(%s::text[], %s::text[], %s::int[], %s::text[], %s::bytea[])
+                ON CONFLICT (text_hash, model) DO NOTHING
+                """,
+                (
+                    list(missing),
+                    [model] * len(missing),
+                    [encoded.shape[1]] * len(missing),
+                    [EMBEDDING_DTYPE.name] * len(missing),
+                    [vec.astype(EMBEDDING_DTYPE).tobytes() for vec in encoded],
+                )
+            )
+    conn.commit()
+
+    return np.stack([vectors[h] for h in hashes]) if hashes else np.zeros((0, 0), dtype=np.float32)
+
+
+def cosine_similarity_matrix(embeddings: np.ndarray) -> List[List[float]]:
+    """NxN cosine similarities of unit length rows."""
+    if not len(embeddings):
+        return []
+    return np.clip(embeddings @ embeddings.T, -1.0, 1.0).tolist()
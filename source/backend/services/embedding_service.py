@@ -0,0 +1,298 @@
+from __future__ import annotations
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+# Intra-op threads of torch for the whole process. Forward passes of one model
+# run one at a time, so this is the CPU share of all embedding work together.
+TORCH_THREADS = int(os.getenv("HINTEVAL_TORCH_THREADS", str(max(1, min(4, os.cpu_count() or 1)))))
+# How long the first queued request waits for others to share its forward pass.
+EMBED_BATCH_WINDOW_MS = float(os.getenv("HINTEVAL_EMBED_BATCH_WINDOW_MS", "5"))
+# Upper bound of sentences per forward pass.
+EMBED_MAX_BATCH = int(os.getenv("HINTEVAL_EMBED_MAX_BATCH", "256"))
+
+# Inference backend of the SBERT models: "torch", "onnx" (ONNX Runtime) or "int8"
+# (dynamically quantized ONNX). ONNX needs sentence-transformers[onnx]; without it,
+# or if the model has no such export, loading the model fails.
+EMBED_BACKENDS = ("torch", "onnx", "int8")
+EMBED_BACKEND = os.getenv("HINTEVAL_EMBED_BACKEND", "torch")
+# Quantized weights inside the model repository, pick the variant for the CPU (avx2, avx512, arm64)
+EMBED_INT8_FILE = os.getenv("HINTEVAL_EMBED_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+# Compare a non-torch backend against torch when the model loads and fall back to
+# torch if a pairwise similarity moves by more than HINTEVAL_EMBED_MAX_DRIFT.
+EMBED_DRIFT_CHECK = os.getenv("HINTEVAL_EMBED_DRIFT_CHECK", "0") == "1"
+EMBED_MAX_DRIFT = float(os.getenv("HINTEVAL_EMBED_MAX_DRIFT", "0.02"))
+
+# Hint-like sentences for the drift check
+DRIFT_SAMPLE = [
+    "This city, once home to Mozart and Beethoven, lies on the Danube.",
+    "The capital of Austria is Vienna.",
+    "He was named the 2009 Nobel Peace Prize laureate.",
+    "This element has the atomic number 79 and is prized in jewelry.",
+    "The novel follows a whale hunt led by an obsessed captain.",
+    "It is the largest planet in our solar system.",
+    "This painter cut off part of his own ear.",
+    "The war ended with a treaty signed at Versailles.",
+    "Vienna",
+    "gold",
+    "Jupiter",
+    "Barack Obama",
+]
+
+_torch_configured = False
+_torch_lock = threading.Lock()
+
+
+def configure_torch() -> None:
+    """Pins torch's thread pools once, before the first model is built."""
+    global _torch_configured
+    with _torch_lock:
+        if _torch_configured:
+            return
+        _torch_configured = True
+        try:
+            import torch
+        except ImportError:
+            return
+        torch.set_num_threads(TORCH_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only possible before torch ran its first parallel operation
+            pass
+        print(f"Torch pinned to {TORCH_THREADS} threads.", flush=True)
+
+
+def load_sentence_model(model_name: str, backend: str = EMBED_BACKEND):
+    """A SentenceTransformer running on `backend` (see EMBED_BACKENDS)."""
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', use one of {EMBED_BACKENDS}")
+    configure_torch()
+    from sentence_transformers import SentenceTransformer
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+    return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": EMBED_INT8_FILE})
+
+
+def measure_drift(baseline: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    How far `candidate` embeddings are from the `baseline` ones of the same
+    sentences: cosine of each pair, and the largest change of a pairwise
+    similarity (what the metrics page and answer leakage scores are built from).
+    """
+    b, c = normalize(baseline), normalize(candidate)
+    per_sentence = np.sum(b * c, axis=1)
+    return {
+        "min_cosine_to_baseline": round(float(per_sentence.min()), 5),
+        "mean_cosine_to_baseline": round(float(per_sentence.mean()), 5),
+        "max_similarity_drift": round(float(np.abs(b @ b.T - c @ c.T).max()), 5),
+    }
+
+
+def _load_checked(model_name: str, backend: str):
+    """
+    Loads the model on `backend`, raising RuntimeError if that backend is not
+    available. With EMBED_DRIFT_CHECK it falls back to torch if the similarities
+    drift too far from torch. Returns (model, backend actually used, drift or None).
+    """
+    if backend == "torch":
+        return load_sentence_model(model_name, "torch"), "torch", None
+    try:
+        model = load_sentence_model(model_name, backend)
+    except Exception as e:
+        raise RuntimeError(
+            f"Embedding backend '{backend}' unavailable for {model_name} ({e}). "
+            f"Install sentence-transformers[onnx] or set HINTEVAL_EMBED_BACKEND=torch."
+        ) from e
+    if not EMBED_DRIFT_CHECK:
+        return model, backend, None
+
+    baseline = load_sentence_model(model_name, "torch")
+    drift = measure_drift(
+        baseline.encode(DRIFT_SAMPLE, convert_to_numpy=True),
+        model.encode(DRIFT_SAMPLE, convert_to_numpy=True),
+    )
+    if drift["max_similarity_drift"] > EMBED_MAX_DRIFT:
+        print(f"Embedding backend '{backend}' drifts too far for {model_name} ({drift}), using torch.", flush=True)
+        return baseline, "torch", drift
+    print(f"Embedding backend '{backend}' for {model_name}: {drift}", flush=True)
+    return model, backend, drift
+
+
+def model_key(model_name: str, backend: str = EMBED_BACKEND) -> str:
+    """Identity of the vectors a model produces, e.g. for the embedding cache."""
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def encoder_key(model_name: str) -> str:
+    """
+    model_key of the backend `model_name` actually runs on: the configured one
+    until its encoder is loaded, which may have fallen back to torch.
+    """
+    encoder = _encoders.get(model_name)
+    return model_key(model_name, encoder.backend if encoder is not None else EMBED_BACKEND)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingEncoder:
+    """
+    Owns one SentenceTransformer and encodes on a single worker thread.
+    Concurrent `encode` calls are queued; the worker takes the oldest request,
+    waits up to EMBED_BATCH_WINDOW_MS for more and runs them as one forward
+    pass, encoding sentences that several requests share only once.
+    `encode` mirrors SentenceTransformer.encode for the arguments used here.
+    """
+
+    def __init__(self, model_name: str, model: Any = None, backend: str = EMBED_BACKEND,
+                 window_ms: float = EMBED_BATCH_WINDOW_MS, max_batch: int = EMBED_MAX_BATCH):
+        self.model_name = model_name
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.drift: Optional[Dict[str, float]] = None
+        if model is None:
+            model, backend, self.drift = _load_checked(model_name, backend)
+        self.model = model
+        self.backend = backend
+
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._sentences = 0
+        self._encoded = 0
+        self._max_batch_sentences = 0
+        self._max_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._encode_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=f"hinteval-embed-{model_name}", daemon=True)
+        self._thread.start()
+
+    def encode(self, sentences: Union[str, List[str]], normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        request = _EncodeRequest(texts)
+        self._queue.put(request)
+        with self._stats_lock:
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+        embeddings = request.future.result()
+        if normalize_embeddings:
+            embeddings = normalize(embeddings)
+        return embeddings[0] if single else embeddings
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def _collect(self) -> List[_EncodeRequest]:
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            unique = list(dict.fromkeys(t for r in batch for t in r.texts))
+            try:
+                vectors = np.asarray(self.model.encode(
+                    unique, batch_size=min(len(unique), self.max_batch), convert_to_numpy=True, show_progress_bar=False
+                ), dtype=np.float32)
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            row = {text: i for i, text in enumerate(unique)}
+            for r in batch:
+                r.future.set_result(vectors[[row[t] for t in r.texts]])
+
+            sentences = sum(len(r.texts) for r in batch)
+            with self._stats_lock:
+                self._batches += 1
+                self._sentences += sentences
+                self._encoded += len(unique)
+                self._max_batch_sentences = max(self._max_batch_sentences, sentences)
+                self._wait_seconds += sum(started - r.enqueued_at for r in batch)
+                self._encode_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "backend": self.backend,
+                "drift": self.drift,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "sentences": self._sentences,
+                "sentences_encoded": self._encoded,
+                "avg_batch_requests": round(self._requests / self._batches, 2) if self._batches else None,
+                "avg_batch_sentences": round(self._sentences / self._batches, 1) if self._batches else None,
+                "max_batch_sentences": self._max_batch_sentences,
+                "avg_wait_ms": round(self._wait_seconds * 1000 / self._requests, 2) if self._requests else None,
+                "encode_seconds": round(self._encode_seconds, 3),
+            }
+
+
+_encoders: Dict[str, BatchingEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_name: str) -> BatchingEncoder:
+    """The process wide encoder of `model_name`, loading the model on first use."""
+    encoder = _encoders.get(model_name)
+    if encoder is not None:
+        return encoder
+    with _encoders_lock:
+        if model_name not in _encoders:
+            _encoders[model_name] = BatchingEncoder(model_name)
+        return _encoders[model_name]
+
+
+def encode(model_name: str, texts: List[str], normalize_embeddings: bool = False) -> np.ndarray:
+    return get_encoder(model_name).encode(texts, normalize_embeddings=normalize_embeddings)
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "backend": EMBED_BACKEND,
+        "torch_threads": TORCH_THREADS,
+        "batch_window_ms": EMBED_BATCH_WINDOW_MS,
+        "max_batch": EMBED_MAX_BATCH,
+        "models": {name: encoder.stats() for name, encoder in list(_encoders.items())},
+    }
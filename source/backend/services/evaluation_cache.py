@@ -0,0 +1,167 @@
+from __future__ import annotations
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+# Upper bound for the cache table, least recently used entries are evicted first.
+EVAL_CACHE_MAX_BYTES = int(os.getenv("HINTEVAL_EVAL_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Eviction needs a scan over the cache table, so it only runs every N saves.
+EVAL_CACHE_EVICT_EVERY = int(os.getenv("HINTEVAL_EVAL_CACHE_EVICT_EVERY", "50"))
+EVAL_CACHE_ENABLED = os.getenv("HINTEVAL_EVAL_CACHE", "1") == "1"
+
+# Evaluator -> (model identity, inputs the evaluator actually reads).
+# Bump the identity when an evaluator's configuration changes to invalidate old entries.
+EVALUATOR_INPUTS = {
+    "rouge": ("rougeL-v1", ("question", "hint")),
+    "readability": ("random_forest-v1", ("hint",)),
+    "contextual": ("all-mpnet-base-v2-v1", ("hint", "answer")),
+    "wikipedia": ("wikipedia-v1", ("hint",)),
+    "llm": ("llama-3-70b-v1", ("question", "hint", "answer", "candidates")),
+}
+
+_save_counter = 0
+_save_lock = threading.Lock()
+
+
+def make_key(evaluator: str, question: str, hint: str, answer: Optional[str], candidates: List[str]) -> str:
+    """Content address of one (evaluator, hint) evaluation."""
+    identity, fields = EVALUATOR_INPUTS[evaluator]
+    values = {
+        "question": question.strip(),
+        "hint": hint.strip(),
+        "answer": answer if (answer and answer.strip()) else None,
+        "candidates": list(candidates or []),
+    }
+    material = json.dumps([evaluator, identity] + [values[f] for f in fields], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class EvaluationCacheBatch:
+    """
+    Cache keys, hits and pending writes for a single evaluation.
+    `load` and `save` are the only methods that touch the database.
+    """
+
+    def __init__(self, question: str, hints: List[str], answer: Optional[str], candidates: List[str]):
+        self.keys: Dict[str, List[str]] = {
+            name: [make_key(name, question, h, answer, candidates) for h in hints]
+            for name in EVALUATOR_INPUTS
+        }
+        self._hits: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, conn) -> None:
+        load_batches(conn, [self])
+
+    def get(self, evaluator: str, idx: int) -> Optional[Dict[str, Any]]:
+        return self._hits.get(self.keys[evaluator][idx])
+
+    def missing(self, evaluator: str) -> List[int]:
+        """Indices of the hints the evaluator still has to compute."""
+        out = [i for i, key in enumerate(self.keys[evaluator]) if key not in self._hits]
+        self.misses += len(out)
+        self.hits += len(self.keys[evaluator]) - len(out)
+        return out
+
+    def put(self, evaluator: str, idx: int, payload: Dict[str, Any]) -> None:
+        key = self.keys[evaluator][idx]
+        self._hits[key] = payload
+        self._pending[key] = (evaluator, payload)
+
+    def save(self, conn) -> int:
+        return save_batches(conn, [self])
+
+
+def load_batches(conn, batches: List[EvaluationCacheBatch]) -> None:
+    """Looks up the entries of several evaluations with a single query."""
+    all_keys = sorted({k for batch in batches for keys in batch.keys.values() for k in keys})
+    if not all_keys:
+        return
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE evaluation_cache SET last_used_at = now() WHERE cache_key = ANY(%s) RETURNING cache_key, payload_json",
+        (all_keys,)
+    )
+    hits = {key: json.loads(payload) for key, payload in cur.fetchall()}
+    conn.commit()
+    for batch in batches:
+        batch._hits = {k: hits[k] for keys in batch.keys.values() for k in keys if k in hits}
+
+
+def save_batches(conn, batches: List[EvaluationCacheBatch]) -> int:
+    """Writes the pending entries of several evaluations with a single statement."""
+    pending: Dict[str, tuple] = {}
+    for batch in batches:
+        pending.update(batch._pending)
+    if not pending:
+        return 0
+    rows = []
+    for key, (evaluator, payload) in pending.items():
+        payload_json = json.dumps(payload, ensure_ascii=False)
+        rows.append((key, evaluator, payload_json, len(payload_json.encode("utf-8"))))
+
+    cur = conn.cursor()
+    execute_values(
+        cur,
+        """
+        INSERT INTO evaluation_cache (cache_key, evaluator, payload_json, size_bytes)
+        VALUES %s
+        ON CONFLICT (cache_key) DO UPDATE
+        SET payload_json = EXCLUDED.payload_json, size_bytes = EXCLUDED.size_bytes, last_used_at = now()
+        """,
+        rows
+    )
+    conn.commit()
+    for batch in batches:
+        batch._pending = {}
+
+    if _should_evict():
+        evict(conn)
+    return len(pending)
+
+
+def _should_evict() -> bool:
+    global _save_counter
+    with _save_lock:
+        _save_counter += 1
+        return _save_counter % max(EVAL_CACHE_EVICT_EVERY, 1) == 0
+
+
+def evict(conn, max_bytes: int = EVAL_CACHE_MAX_BYTES) -> int:
+    """Deletes least recently used entries until the cache fits into `max_bytes`."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        DELETE FROM evaluation_cache WHERE cache_key IN (
+            SELECT cache_key FROM (
+                SELECT cache_key,
+                       SUM(size_bytes) OVER (ORDER BY last_used_at DESC, cache_key) AS running_bytes
+                FROM evaluation_cache
+            ) ranked
+            WHERE running_bytes > %s
+        )
+        """,
+        (max_bytes,)
+    )
+    deleted = cur.rowcount
+    conn.commit()
+    if deleted:
+        print(f"Evaluation cache evicted {deleted} entries.", flush=True)
+    return deleted
+
+
+def get_cache_stats(conn) -> Dict[str, Any]:
+    cur = conn.cursor()
+    cur.execute("SELECT evaluator, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM evaluation_cache GROUP BY evaluator")
+    per_evaluator = {name: {"entries": count, "bytes": int(size)} for name, count, size in cur.fetchall()}
+    return {
+        "max_bytes": EVAL_CACHE_MAX_BYTES,
+        "total_bytes": sum(v["bytes"] for v in per_evaluator.values()),
+        "evaluators": per_evaluator,
+    }
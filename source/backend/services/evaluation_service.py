@@ -1,23 +1,24 @@
 from __future__ import annotations
 import os
 import json
+import time
+import asyncio
 import traceback
-from typing import Any, Dict, List, Optional, Set, Union
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from dotenv import load_dotenv
 
 # --- HintEval Imports ---
 from hinteval.cores import Instance
-from hinteval.evaluation.answer_leakage import ContextualEmbeddings, Lexical
-from hinteval.evaluation.convergence import LlmBased
-from hinteval.evaluation.familiarity import Wikipedia
-from hinteval.evaluation.readability import MachineLearningBased
-from hinteval.evaluation.relevance import Rouge
 
 # --- Backend Imports ---
 from backend.services.question_service import get_latest_question_id
 from backend.services.candidate_service import get_candidates
+from backend.services.model_registry import get_model
+from backend.services.evaluation_cache import EvaluationCacheBatch, EVAL_CACHE_ENABLED, load_batches, save_batches
+from backend.database.bulk import bulk_insert
+from backend.database.connection import pooled_connection, run_long_task
 
 # Load Env
 load_dotenv(dotenv_path="backend/.env")
@@ -29,27 +30,24 @@ CANONICAL_METRICS = {
     "relevance", "readability", "familiarity", "answer-leakage", "convergence",
 }
 
-print("Pre-loading evaluation models...", flush=True)
-
-# Answer Leakage Evaluator
-contextual_evaluator = ContextualEmbeddings(sbert_model='all-mpnet-base-v2', enable_tqdm=False)
-
-# Convergence Evaluator
-llm_evaluator = LlmBased(model_name="llama-3-70b", together_ai_api_key=TOGETHER_API_KEY)
-
-# Familiarty Evaluator
-wikipedia_evaluator = Wikipedia()
-
-# Relevance Evaluator
-rougeL_evaluator = Rouge("rougeL")
-
-# Readability Evaluator
-ml_readability_evaluator = MachineLearningBased("random_forest")
+# Evaluators are built lazily by the model registry on first use
+# (see backend/services/model_registry.py and HINTEVAL_PREWARM_MODELS).
+# Registry name -> (log label, input kind). Order defines the metric order per hint.
+EVALUATORS = {
+    "rouge": ("Rouge", "instances"),
+    "readability": ("Readability", "sentences"),
+    "contextual": ("Contextual", "instances"),
+    "wikipedia": ("Wikipedia", "sentences"),
+    "llm": ("LLM", "instances"),
+}
 
-print("Models loaded.", flush=True)
+# LLM/Wikipedia mostly wait on I/O and torch releases the GIL, so threads are enough.
+PARALLEL_EVALUATION = os.getenv("HINTEVAL_PARALLEL_EVAL", "1") == "1"
+EVAL_WORKERS = int(os.getenv("HINTEVAL_EVAL_WORKERS", "10"))
+_eval_executor = ThreadPoolExecutor(max_workers=EVAL_WORKERS, thread_name_prefix="hinteval-eval")
 
-def _now() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+# progress(phase, detail): called from the evaluation threads, must be thread safe
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
 
 def jaccard(a: Set[str], b: Set[str]) -> float:
     if not a and not b: return 1.0
@@ -66,7 +64,6 @@ def safe_get(obj, key, default=None):
 # Main Service Function
 # =====================================================================================
 def run_evaluation_and_persist(
-    conn,
     session_id: str,
     question: str,
     hints: List[str],
@@ -74,10 +71,20 @@ def run_evaluation_and_persist(
     model_name: str,
     num_candidates: int,
     temperature: float,
-    max_tokens: int
+    max_tokens: int,
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
-    
-    existing_candidates = get_candidates(conn, session_id)
+    """
+    Evaluates the hints in three phases: a short read (candidates, cache hits),
+    the long LLM and model work without a database connection, and a short write.
+    `progress` receives the phase changes and the per evaluator progress.
+    """
+    report = progress or (lambda phase, detail: None)
+    report("reading", {})
+    existing_candidates, qid = _read_evaluation_inputs(session_id)
+    if not qid:
+        return {}
+
     candidates_to_use = []
     candidates_were_generated = False
 
@@ -85,53 +92,320 @@ def run_evaluation_and_persist(
         candidates_to_use = existing_candidates
     else:
         from backend.services.generation_service import generate_only_candidates
+        report("candidates", {})
         raw_candidates = generate_only_candidates(
             question=question, num_candidates=num_candidates, temperature=temperature, model_name=model_name, max_tokens=max_tokens, hints=hints,top_p=0.9
         )
         candidates_were_generated = True
 
-        candidates_to_use = []
-        for i, text in enumerate(raw_candidates):
-            is_gt = (i == len(raw_candidates) - 1)
-            candidates_to_use.append({"text": text, "is_groundtruth": is_gt})
-
-    distractors = [c for c in candidates_to_use if not c.get("is_groundtruth")]
-    ground_truths = [c for c in candidates_to_use if c.get("is_groundtruth")]
-    
-    if not ground_truths and distractors:
-        ground_truths = [distractors.pop()]
+        candidates_to_use = _generated_candidate_objs(raw_candidates)
 
-    distractors.sort(key=lambda x: x["text"])
-    
-    sorted_candidate_objs = distractors + ground_truths
+    sorted_candidate_objs = _order_candidates(candidates_to_use)
     
     candidates_strings_for_eval = [c["text"] for c in sorted_candidate_objs]
 
+    cache = None
+    if EVAL_CACHE_ENABLED:
+        cache = EvaluationCacheBatch(question, hints, answer, candidates_strings_for_eval)
+        with pooled_connection() as conn:
+            try:
+                cache.load(conn)
+            except Exception as e:
+                conn.rollback()
+                print(f"Evaluation cache lookup failed: {e}", flush=True)
+
+    eval_started = time.perf_counter()
     results = evaluate_hints(
         question=question,
         hints=hints,
         answer=answer,
         candidates=candidates_strings_for_eval,
         model_name=model_name,
+        cache=cache,
+        progress=progress,
+    )
+    evaluation_seconds = time.perf_counter() - eval_started
+
+    if cache:
+        print(f"Evaluation cache: {cache.hits} hits, {cache.misses} misses.", flush=True)
+
+    candidate_elimination_map = _elimination_map(results, sorted_candidate_objs)
+
+    report("persisting", {})
+    persist_started = time.perf_counter()
+    with pooled_connection() as conn:
+        if cache:
+            try:
+                cache.save(conn)
+            except Exception as e:
+                conn.rollback()
+                print(f"Evaluation cache write failed: {e}", flush=True)
+        try:
+            hint_ids = _persist_evaluation(
+                conn, qid, results, sorted_candidate_objs, candidate_elimination_map, candidates_were_generated
+            )
+        except Exception:
+            conn.rollback()
+            raise
+    persistence_seconds = time.perf_counter() - persist_started
+
+    print(
+        f"Evaluation and persistence complete (evaluation {evaluation_seconds:.2f}s, "
+        f"persistence {persistence_seconds:.3f}s).",
+        flush=True
     )
+    return {
+        **_evaluation_payload(question, hints, results[:len(hint_ids)], candidates_strings_for_eval),
+        "timings": {
+            "evaluation_seconds": round(evaluation_seconds, 3),
+            "persistence_seconds": round(persistence_seconds, 3),
+        },
+    }
 
-    qid = get_latest_question_id(conn, session_id)
-    if not qid:
-        return {}
 
-    cur = conn.cursor()
+def run_batch_evaluation_and_persist(
+    session_id: str,
+    items: List[Dict[str, Any]],
+    model_name: str,
+    num_candidates: int,
+    temperature: float,
+    max_tokens: int,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    run_evaluation_and_persist over many questions at once. Each item holds
+    question, hints, answer and optionally candidates and question_id. The
+    evaluators run once over the Instances of all items, results are stored
+    per question in their own transaction.
+
+    Items are matched to a question of the session by question_id, or else by
+    the text of the latest question with the same text; items without a stored
+    question are evaluated but not persisted. Items without candidates use the
+    stored candidates of their question, or get new ones from the LLM. Given
+    candidates are handled like generated ones: the last one is the ground
+    truth, and they replace the stored candidates of the question.
+    """
+    report = progress or (lambda phase, detail: None)
+    report("reading", {})
+    qids, stored_candidates = _read_batch_inputs(session_id, items)
+
+    candidate_objs: List[List[Dict[str, Any]]] = []
+    generated: List[bool] = []
+    to_generate: List[int] = []
+    for i, item in enumerate(items):
+        if item.get("candidates"):
+            candidate_objs.append(_generated_candidate_objs(item["candidates"]))
+            generated.append(True)
+        elif stored_candidates.get(qids[i]):
+            candidate_objs.append(stored_candidates[qids[i]])
+            generated.append(False)
+        else:
+            candidate_objs.append([])
+            generated.append(True)
+            to_generate.append(i)
+
+    if to_generate:
+        from backend.services.generation_service import generate_only_candidates
+        report("candidates", {"questions": len(to_generate)})
+        futures = {
+            i: _eval_executor.submit(
+                generate_only_candidates,
+                question=items[i]["question"], num_candidates=num_candidates, temperature=temperature,
+                model_name=model_name, max_tokens=max_tokens, hints=items[i]["hints"], top_p=0.9
+            )
+            for i in to_generate
+        }
+        for i, future in futures.items():
+            candidate_objs[i] = _generated_candidate_objs(future.result())
+
+    sorted_candidate_objs = [_order_candidates(objs) for objs in candidate_objs]
+    records = [
+        {
+            "question": item["question"],
+            "hints": item["hints"],
+            "answer": item.get("answer"),
+            "candidates": [c["text"] for c in objs],
+        }
+        for item, objs in zip(items, sorted_candidate_objs)
+    ]
+
+    caches = None
+    if EVAL_CACHE_ENABLED:
+        caches = [EvaluationCacheBatch(r["question"], r["hints"], r["answer"], r["candidates"]) for r in records]
+        with pooled_connection() as conn:
+            try:
+                load_batches(conn, caches)
+            except Exception as e:
+                conn.rollback()
+                print(f"Evaluation cache lookup failed: {e}", flush=True)
+
+    eval_started = time.perf_counter()
+    all_results = evaluate_hints_batch(records, caches=caches, progress=progress)
+    evaluation_seconds = time.perf_counter() - eval_started
+
+    if caches:
+        print(
+            f"Evaluation cache: {sum(c.hits for c in caches)} hits, {sum(c.misses for c in caches)} misses.",
+            flush=True
+        )
+
+    report("persisting", {})
+    persist_started = time.perf_counter()
+    out_items = []
+    with pooled_connection() as conn:
+        if caches:
+            try:
+                save_batches(conn, caches)
+            except Exception as e:
+                conn.rollback()
+                print(f"Evaluation cache write failed: {e}", flush=True)
+
+        for i, (record, results) in enumerate(zip(records, all_results)):
+            out = {"question_id": qids[i], "persisted": False}
+            if qids[i] is None and items[i].get("question_id") is not None:
+                out["error"] = f"Question {items[i]['question_id']} not found in this session."
+            elif qids[i] is not None:
+                try:
+                    hint_ids = _persist_evaluation(
+                        conn, qids[i], results, sorted_candidate_objs[i],
+                        _elimination_map(results, sorted_candidate_objs[i]), generated[i]
+                    )
+                    results = results[:len(hint_ids)]
+                    out["persisted"] = True
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Persisting evaluation of question {qids[i]} failed: {e}", flush=True)
+                    out["error"] = f"{type(e).__name__}: {e}"
+            out.update(_evaluation_payload(record["question"], record["hints"], results, record["candidates"]))
+            out_items.append(out)
+    persistence_seconds = time.perf_counter() - persist_started
+
+    num_hints = sum(len(r["hints"]) for r in records)
+    print(
+        f"Batch evaluation of {len(records)} questions / {num_hints} hints complete "
+        f"(evaluation {evaluation_seconds:.2f}s, persistence {persistence_seconds:.3f}s).",
+        flush=True
+    )
+    return {
+        "items": out_items,
+        "timings": {
+            "evaluation_seconds": round(evaluation_seconds, 3),
+            "persistence_seconds": round(persistence_seconds, 3),
+            "hints_per_second": round(num_hints / evaluation_seconds, 1) if evaluation_seconds else None,
+        },
+    }
 
-    cur.execute("SELECT id, hint_text FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
-    db_hints = cur.fetchall()
 
-    hint_ids = [h[0] for h in db_hints]
+async def astream_evaluation(**params) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of run_evaluation_and_persist (same arguments). Yields
+    ("progress", ...) on phase changes, ("metrics", ...) with an evaluator's
+    per-hint output as soon as that evaluator finished, and ("done", ...) with
+    the payload of run_evaluation_and_persist once everything is stored.
+    The evaluation keeps running to completion if the consumer goes away.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def progress(phase: str, detail: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, (phase, detail))
+
+    task = asyncio.ensure_future(run_long_task(run_evaluation_and_persist, **params, progress=progress))
+    task.add_done_callback(lambda _: events.put_nowait(None))
+
+    while True:
+        event = await events.get()
+        if event is None:
+            break
+        phase, detail = event
+        if phase == "evaluating" and detail["status"] == "done":
+            yield "metrics", {
+                "evaluator": detail["evaluator"],
+                "hints": [
+                    {"index": i, "metrics": r["metrics"], "entities": r["entities"]}
+                    for i, r in enumerate(detail["results"]) if r is not None
+                ],
+            }
+        elif phase == "evaluating":
+            yield "progress", {"phase": phase, **detail}
+        else:
+            yield "progress", {"phase": phase}
+
+    yield "done", task.result()
+
+
+def _read_evaluation_inputs(session_id: str):
+    """Read phase of an evaluation: stored candidates and the question results belong to."""
+    with pooled_connection() as conn:
+        return get_candidates(conn, session_id), get_latest_question_id(conn, session_id)
+
+
+def _read_batch_inputs(session_id: str, items: List[Dict[str, Any]]):
+    """
+    Read phase of a batch evaluation: the question id of each item (None if the
+    session has no such question) and the stored candidates per question id.
+    """
+    requested_ids = [item["question_id"] for item in items if item.get("question_id") is not None]
+    texts = [item["question"].strip() for item in items if item.get("question_id") is None]
+
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT id, btrim(text) FROM questions
+            WHERE session_id = %s AND (id = ANY(%s) OR btrim(text) = ANY(%s))
+            ORDER BY created_at, id
+            """,
+            (session_id, requested_ids, texts)
+        )
+        rows = cur.fetchall()
+        owned_ids = {qid for qid, _ in rows}
+        # Later questions win, like get_latest_question_id
+        latest_by_text = {text: qid for qid, text in rows}
+
+        qids = [
+            (item["question_id"] if item["question_id"] in owned_ids else None)
+            if item.get("question_id") is not None
+            else latest_by_text.get(item["question"].strip())
+            for item in items
+        ]
+
+        stored: Dict[int, List[Dict[str, Any]]] = {}
+        wanted = sorted({qid for qid, item in zip(qids, items) if qid is not None and not item.get("candidates")})
+        if wanted:
+            cur.execute(
+                """
+                SELECT question_id, id, candidate_text, is_groundtruth
+                FROM candidate_answers
+                WHERE question_id = ANY(%s)
+                ORDER BY question_id, id
+                """,
+                (wanted,)
+            )
+            for qid, cand_id, text, is_gt in cur.fetchall():
+                stored.setdefault(qid, []).append({"id": cand_id, "text": text, "is_groundtruth": bool(is_gt)})
+        conn.commit()
+    return qids, stored
+
+def _generated_candidate_objs(raw_candidates: List[str]) -> List[Dict[str, Any]]:
+    """Freshly generated (or batch-supplied) candidates, the last one is the ground truth."""
+    return [
+        {"text": text, "is_groundtruth": i == len(raw_candidates) - 1}
+        for i, text in enumerate(raw_candidates)
+    ]
+
+def _order_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Distractors in a stable order followed by the ground truth, as the evaluators expect them."""
+    distractors = [c for c in candidates if not c.get("is_groundtruth")]
+    ground_truths = [c for c in candidates if c.get("is_groundtruth")]
     
-    if hint_ids:
-        placeholders = ",".join("%s" for _ in hint_ids)
-        cur.execute(f"DELETE FROM metrics WHERE hint_id IN ({placeholders})", tuple(hint_ids))
-        cur.execute(f"DELETE FROM entities WHERE hint_id IN ({placeholders})", tuple(hint_ids))
+    if not ground_truths and distractors:
+        ground_truths = [distractors.pop()]
+
+    distractors.sort(key=lambda x: x["text"])
+    return distractors + ground_truths
 
-  
+def _elimination_map(results: List[Dict[str, Any]], sorted_candidate_objs: List[Dict[str, Any]]) -> Dict[str, int]:
     candidate_elimination_map = {c["text"]: 0 for c in sorted_candidate_objs}
     
     for res in results:
@@ -145,66 +419,30 @@ def run_evaluation_and_persist(
                 # In HintEval, score 0 means incompatible/eliminated
                 if score == 0:
                     candidate_elimination_map[cand_text] = 1
+    return candidate_elimination_map
 
-    # --- PERSIST CANDIDATES ---
-    if candidates_were_generated:
-        cur.execute("DELETE FROM candidate_answers WHERE question_id = %s", (qid,))
-        for c_obj in sorted_candidate_objs:
-            # Retrieve calculated status (default to 0 if not found)
-            is_elim = candidate_elimination_map.get(c_obj["text"], 0)
-            cur.execute(
-                "INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, is_groundtruth) VALUES (%s, %s, %s, %s, %s)",
-                (qid, c_obj["text"], bool(is_elim), _now(), bool(c_obj["is_groundtruth"]))
-            )
-    else:
-        # If candidates existed, we still need to UPDATE their elimination status based on this new evaluation
-        for c_obj in sorted_candidate_objs:
-            is_elim = candidate_elimination_map.get(c_obj["text"], 0)
-            cur.execute(
-                "UPDATE candidate_answers SET is_eliminated = %s WHERE question_id = %s AND candidate_text = %s",
-                (bool(is_elim), qid, c_obj["text"])
-            )
-    
-    conn.commit()
-
+def _evaluation_payload(
+    question: str,
+    hints: List[str],
+    results: List[Dict[str, Any]],
+    candidates: List[str],
+) -> Dict[str, Any]:
+    """Response payload of an evaluation (without timings)."""
     metrics_payload = []
     entities_payload = []
     scores_convergence_payload = []
 
-    for i, res in enumerate(results):
-        matched_id = None
-        
-        if i < len(db_hints):
-            matched_id = db_hints[i][0]
-        
-        if matched_id:
-            res_metrics = res.get("metrics", [])
-            metrics_payload.append(res_metrics)
-            
-            conv_scores = next((m.get("metadata", {}).get("scores", {}) for m in res_metrics if m.get("name") == "convergence"), {})
-            scores_convergence_payload.append(conv_scores)
-
-            for m in res_metrics:
-                cur.execute(
-                    "INSERT INTO metrics (hint_id, name, value, metadata_json) VALUES (%s, %s, %s, %s)",
-                    (matched_id, m.get("name"), m.get("value"), json.dumps(m.get("metadata", {})))
-                )
-
-            res_entities = res.get("entities", [])
-            entities_payload.append(res_entities)
-            
-            for e in res_entities:
-                cur.execute(
-                    "INSERT INTO entities (hint_id, entity, ent_type, start_index, end_index, metadata_json) VALUES (%s, %s, %s, %s, %s, %s)",
-                    (matched_id, e.get("entity"), e.get("ent_type"), e.get("start_index"), e.get("end_index"), json.dumps(e.get("metadata", {})))
-                )
-    
-    conn.commit()
+    for res in results:
+        res_metrics = res.get("metrics", [])
+        metrics_payload.append(res_metrics)
+
+        conv_scores = next((m.get("metadata", {}).get("scores", {}) for m in res_metrics if m.get("name") == "convergence"), {})
+        scores_convergence_payload.append(conv_scores)
+
+        entities_payload.append(res.get("entities", []))
 
-    final_candidate_list = candidates_strings_for_eval
-    
     candidate_convergence = []
-    for c in final_candidate_list:
+    for c in candidates:
         scores_for_c = []
         for s in scores_convergence_payload:
             val = s.get(c, None)
@@ -223,7 +461,6 @@ def run_evaluation_and_persist(
                 row.append(0.0)
         hint2hint_sim.append(row)
 
-    print("Evaluation and persistence complete.", flush=True)
     return {
         "question": question,
         "num_hints": len(hints),
@@ -232,94 +469,306 @@ def run_evaluation_and_persist(
         "entities_per_hint": entities_payload,
         "candidate_convergence": candidate_convergence,
         "hint2hint_similarity": hint2hint_sim,
-        "candidate_answers": final_candidate_list,
+        "candidate_answers": candidates,
     }
 
-def evaluate_hints(
-    question: str, 
-    hints: List[str], 
-    answer: Optional[str],
-    candidates: List[str],
-    model_name: str, 
-    enable_tqdm: bool = True
-) -> List[Dict[str, Any]]:
-    
-    if not question or not hints: raise ValueError("Question and hints are required")
+def _persist_evaluation(
+    conn,
+    qid: int,
+    results: List[Dict[str, Any]],
+    sorted_candidate_objs: List[Dict[str, Any]],
+    candidate_elimination_map: Dict[str, int],
+    candidates_were_generated: bool,
+) -> List[int]:
+    """
+    Replaces the stored metrics, entities and candidate states of the question
+    with the evaluation results in a single transaction, using a fixed number
+    of statements. Results are matched to the question's hints by position.
+    Returns the ids of the hints that received results.
+    """
+    cur = conn.cursor()
+
+    cur.execute("SELECT id FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
+    all_hint_ids = [r[0] for r in cur.fetchall()]
+    hint_ids = all_hint_ids[:len(results)]
 
+    if all_hint_ids:
+        cur.execute("DELETE FROM metrics WHERE hint_id = ANY(%s)", (all_hint_ids,))
+        cur.execute("DELETE FROM entities WHERE hint_id = ANY(%s)", (all_hint_ids,))
+
+    # --- PERSIST CANDIDATES ---
+    if candidates_were_generated:
+        cur.execute("DELETE FROM candidate_answers WHERE question_id = %s", (qid,))
+        bulk_insert(
+            cur,
+            "candidate_answers",
+            ("question_id", "candidate_text", "is_eliminated", "is_groundtruth"),
+            [
+                (qid, c["text"], bool(candidate_elimination_map.get(c["text"], 0)), bool(c["is_groundtruth"]))
+                for c in sorted_candidate_objs
+            ]
+        )
+    elif sorted_candidate_objs:
+        # Existing candidates keep their rows, only the elimination status follows this evaluation
+        cur.execute(
+            """
+            UPDATE candidate_answers c
+            SET is_eliminated = v.is_eliminated
+            FROM unnest(%s::text[], %s::boolean[]) AS v(candidate_text, is_eliminated)
+            WHERE c.question_id = %s AND c.candidate_text = v.candidate_text
+            """,
+            (
+                [c["text"] for c in sorted_candidate_objs],
+                [bool(candidate_elimination_map.get(c["text"], 0)) for c in sorted_candidate_objs],
+                qid,
+            )
+        )
+
+    metric_rows = []
+    entity_rows = []
+    for hint_id, res in zip(hint_ids, results):
+        for m in res.get("metrics", []):
+            metric_rows.append((hint_id, m.get("name"), m.get("value"), json.dumps(m.get("metadata", {}))))
+        for e in res.get("entities", []):
+            entity_rows.append((
+                hint_id, e.get("entity"), e.get("ent_type"), e.get("start_index"), e.get("end_index"),
+                json.dumps(e.get("metadata", {}))
+            ))
+
+    bulk_insert(cur, "metrics", ("hint_id", "name", "value", "metadata_json"), metric_rows)
+    bulk_insert(
+        cur, "entities", ("hint_id", "entity", "ent_type", "start_index", "end_index", "metadata_json"), entity_rows
+    )
+
+    conn.commit()
+    return hint_ids
+
+# =====================================================================================
+# Evaluator Execution
+# =====================================================================================
+
+def _build_instance(question: str, hints: List[str], answer: Optional[str], candidates: List[str]) -> Instance:
     instance = Instance.from_strings(
         question=question.strip(),
         answers=[answer] if (answer and answer.strip()) else [],
         hints=[h.strip() for h in hints],
     )
-    print(f"Candidates list: {candidates}", flush=True)
     instance.question.metadata['candidate_answers-llama-3-70b'] = candidates
-
-    instances = [instance]
-    q_h_list = [instance.question] + instance.hints
-    
+    return instance
+
+def _serialize_hint(hint) -> Dict[str, Any]:
+    entities_out = []
+    raw_entities = getattr(hint, "entities", [])
+
+    if raw_entities:
+        for ent in raw_entities:
+            entities_out.append({
+                "entity": safe_get(ent, "entity"),
+                "ent_type": safe_get(ent, "ent_type"),
+                "start_index": safe_get(ent, "start_index"),
+                "end_index": safe_get(ent, "end_index"),
+                "metadata": safe_get(ent, "metadata", {}) or {},
+            })
+
+    metrics_list = []
+    metrics_dict = getattr(hint, "metrics", {}) or {}
+
+    for _, metric_obj in metrics_dict.items():
+        mname = getattr(metric_obj, "name", None)
+
+        if mname in CANONICAL_METRICS:
+            metrics_list.append({
+                "name": mname,
+                "value": getattr(metric_obj, "value", None),
+                "metadata": getattr(metric_obj, "metadata", {}) or {},
+            })
+
+    return {"metrics": metrics_list, "entities": entities_out}
+
+def _run_evaluator(
+    name: str,
+    question: str,
+    hints: List[str],
+    answer: Optional[str],
+    candidates: List[str],
+) -> Optional[List[Dict[str, Any]]]:
+    """Single record variant of _run_evaluator_batch."""
+    out = _run_evaluator_batch(name, [{"question": question, "hints": hints, "answer": answer, "candidates": candidates}])
+    return out[0] if out is not None else None
+
+def _run_evaluator_batch(name: str, records: List[Dict[str, Any]]) -> Optional[List[List[Dict[str, Any]]]]:
+    """
+    Runs a single evaluator once over the Instances of all records, so that the
+    models encode and predict in batches. Every evaluator gets its own Instances
+    and never shares mutable HintEval objects with another one. Returns the
+    serialized output per hint of each record, or None if the evaluator failed.
+    """
+    label, target = EVALUATORS[name]
     try:
-        rougeL_evaluator.evaluate(instances)
+        instances = [
+            _build_instance(r["question"], r["hints"], r.get("answer"), r.get("candidates") or [])
+            for r in records
+        ]
+        if target == "instances":
+            get_model(name).evaluate(instances)
+        else:
+            get_model(name).evaluate([s for inst in instances for s in [inst.question] + inst.hints])
+        return [[_serialize_hint(h) for h in inst.hints] for inst in instances]
     except Exception as e:
-        print(f"Rouge Eval Error: {e}")
+        print(f"{label} Eval Error: {e}")
         traceback.print_exc()
+        if len(records) == 1:
+            return None
 
-    try:
-        ml_readability_evaluator.evaluate(q_h_list)
-    except Exception as e:
-        print(f"Readability Eval Error: {e}")
-        traceback.print_exc()
+    # One bad record fails the whole batch; retry one by one so only that record misses the metric
+    print(f"{label}: retrying {len(records)} records one by one.", flush=True)
+    out = [_run_evaluator_batch(name, [r]) for r in records]
+    if all(o is None for o in out):
+        return None
+    return [o[0] if o is not None else [None] * len(r["hints"]) for o, r in zip(out, records)]
 
-    try:
-        contextual_evaluator.evaluate(instances)
-    except Exception as e:
-        print(f"Contextual Eval Error: {e}")
-        traceback.print_exc()
+def evaluate_hints(
+    question: str, 
+    hints: List[str], 
+    answer: Optional[str],
+    candidates: List[str],
+    model_name: str, 
+    enable_tqdm: bool = True,
+    parallel: Optional[bool] = None,
+    cache: Optional[EvaluationCacheBatch] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Runs all evaluators on the hints. With `parallel` (default: HINTEVAL_PARALLEL_EVAL)
+    the evaluators run concurrently on the shared evaluation pool; outputs are merged
+    per hint in the canonical evaluator order either way.
+    With a loaded `cache`, evaluators only run on the hints without a cached output
+    and fresh outputs are recorded on the batch for a later `cache.save(conn)`.
+    `progress("evaluating", {...})` is called when an evaluator starts and finishes,
+    with the number of hints it has covered so far (cached hints count as covered)
+    and, once done, its serialized output per hint under "results".
+    """
+    if not question or not hints: raise ValueError("Question and hints are required")
 
-    try:
-        wikipedia_evaluator.evaluate(q_h_list)
-    except Exception as e:
-        print(f"Wikipedia Eval Error: {e}")
-        traceback.print_exc()
+    print(f"Candidates list: {candidates}", flush=True)
 
-    try:
-        llm_evaluator.evaluate(instances)
-    except Exception as e:
-        print(f"LLM Eval Error: {e}")
-        traceback.print_exc()
+    def single_progress(phase: str, detail: Dict[str, Any]) -> None:
+        if "results" in detail:
+            detail = {**detail, "results": detail["results"][0]}
+        progress(phase, detail)
+
+    return evaluate_hints_batch(
+        [{"question": question, "hints": hints, "answer": answer, "candidates": candidates}],
+        parallel=parallel,
+        caches=[cache] if cache else None,
+        progress=single_progress if progress else None,
+    )[0]
+
+def evaluate_hints_batch(
+    records: List[Dict[str, Any]],
+    parallel: Optional[bool] = None,
+    caches: Optional[List[Optional[EvaluationCacheBatch]]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    evaluate_hints over many records ({"question", "hints", "answer", "candidates"}):
+    each evaluator runs once over the hints of all records that are not cached.
+    `caches` holds one loaded batch (or None) per record. Progress counts the hints
+    of all records, "results" holds the per-hint output of each record.
+    Returns the merged results per hint of each record.
+    """
+    if parallel is None:
+        parallel = PARALLEL_EVALUATION
+    caches = caches or [None] * len(records)
+    hints_total = sum(len(r["hints"]) for r in records)
+
+    # Hint indices each evaluator still has to compute, per record
+    todo = {
+        name: [
+            (cache.missing(name) if cache else list(range(len(r["hints"]))))
+            for r, cache in zip(records, caches)
+        ]
+        for name in EVALUATORS
+    }
 
-    results = []
-    for hint in instance.hints:
-        
-        entities_out = []
-        raw_entities = getattr(hint, "entities", [])
-        
-        if raw_entities: 
-            for ent in raw_entities:
-                entities_out.append({
-                    "entity": safe_get(ent, "entity"),
-                    "ent_type": safe_get(ent, "ent_type"),
-                    "start_index": safe_get(ent, "start_index"),
-                    "end_index": safe_get(ent, "end_index"),
-                    "metadata": safe_get(ent, "metadata", {}) or {},
+    def merged(name: str, fresh: Optional[List[List[Dict[str, Any]]]]) -> List[List[Optional[Dict[str, Any]]]]:
+        """Cached and freshly computed output of one evaluator, per record and hint."""
+        out = []
+        fresh_iter = iter(fresh or [])
+        for r, cache, idxs in zip(records, caches, todo[name]):
+            per_hint = [cache.get(name, i) if cache else None for i in range(len(r["hints"]))]
+            if idxs and fresh is not None:
+                for i, payload in zip(idxs, next(fresh_iter)):
+                    per_hint[i] = payload
+            out.append(per_hint)
+        return out
+
+    def run(name: str) -> Optional[List[List[Dict[str, Any]]]]:
+        cached = hints_total - sum(len(idxs) for idxs in todo[name])
+        if progress:
+            progress("evaluating", {"evaluator": name, "status": "running", "hints_done": cached, "hints_total": hints_total})
+        out = _run_evaluator_batch(name, [
+            {**r, "hints": [r["hints"][i] for i in idxs]}
+            for r, idxs in zip(records, todo[name]) if idxs
+        ])
+        if progress:
+            if out is not None:
+                progress("evaluating", {
+                    "evaluator": name, "status": "done", "hints_done": hints_total, "hints_total": hints_total,
+                    "results": merged(name, out),
                 })
-
-        metrics_list = []
-        metrics_dict = getattr(hint, "metrics", {}) or {}
-        
-        for _, metric_obj in metrics_dict.items():
-            mname = getattr(metric_obj, "name", None)
-            
-            if mname in CANONICAL_METRICS:
-                metrics_list.append({
-                    "name": mname,
-                    "value": getattr(metric_obj, "value", None),
-                    "metadata": getattr(metric_obj, "metadata", {}) or {},
+            else:
+                progress("evaluating", {"evaluator": name, "status": "failed", "hints_done": cached, "hints_total": hints_total})
+        return out
+
+    pending = [name for name, per_record in todo.items() if any(per_record)]
+    if progress:
+        for name in EVALUATORS:
+            if name not in pending:
+                progress("evaluating", {
+                    "evaluator": name, "status": "done", "hints_done": hints_total, "hints_total": hints_total,
+                    "results": merged(name, None),
                 })
-        
-        results.append({
-            "text": getattr(hint, "hint", None),
-            "metrics": metrics_list,
-            "entities": entities_out,
-        })
-
-    return results
\ No newline at end of file
+
+    computed: Dict[str, Optional[List[List[Dict[str, Any]]]]] = {}
+    if parallel:
+        futures = {name: _eval_executor.submit(run, name) for name in pending}
+        for name, future in futures.items():
+            computed[name] = future.result()
+    else:
+        for name in pending:
+            computed[name] = run(name)
+
+    outputs: Dict[str, List[List[Optional[Dict[str, Any]]]]] = {}
+    for name in EVALUATORS:
+        fresh = computed.get(name)
+        outputs[name] = merged(name, fresh)
+        if fresh is None:
+            continue
+        for cache, idxs, per_hint in zip(caches, todo[name], outputs[name]):
+            if cache:
+                for i in idxs:
+                    if per_hint[i] is not None:
+                        cache.put(name, i, per_hint[i])
+
+    all_results = []
+    for r_idx, record in enumerate(records):
+        results = []
+        for idx, hint_text in enumerate(record["hints"]):
+            metrics_list = []
+            entities_out = []
+            for name in EVALUATORS:
+                payload = outputs[name][r_idx][idx]
+                if payload is None:
+                    continue
+                metrics_list.extend(payload["metrics"])
+                entities_out.extend(payload["entities"])
+
+            results.append({
+                "text": hint_text.strip(),
+                "metrics": metrics_list,
+                "entities": entities_out,
+            })
+        all_results.append(results)
+
+    return all_results
@@ -1,18 +1,17 @@
 from __future__ import annotations
 import os
-import psycopg2
+import asyncio
+from psycopg2.extras import execute_values
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from together import Together
 
 # --- HintEval Imports ---
 from hinteval import Dataset
-from hinteval.cores import Answer
 from hinteval.model import AnswerAgnostic, AnswerAware
 from hinteval.cores import Subset, Instance
+from hinteval.utils.model.hint_filtering import Hint_Filtering
 
 # --- Backend Imports ---
 from backend.utils.prompts import (
@@ -21,6 +20,12 @@ from backend.utils.prompts import (
     prompt_candidates
 )
 from backend.Objects.db_models import AnswerOBJ, HintOBJ
+from backend.services.llm_client import (
+    LLM_STREAMING, LLMError, achat_completion, astream_chat_completion, cached_completion, chat_completion,
+    stream_chat_completion
+)
+from backend.services.llm_resilience import CircuitOpenError, call_with_retry
+from backend.database.connection import pooled_connection, run_with_db
 
 load_dotenv(dotenv_path=".env")
 
@@ -30,27 +35,14 @@ class API_Info:
     api_key: Optional[str] = os.getenv("TOGETHER_API_KEY")
     base_url: str = os.getenv("TOGETHER_BASE_URL", "https://api.together.xyz/v1")
 
-def _now():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-def local_insert_question(conn, question_text, session_id):
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO questions (text, session_id, created_at) VALUES (%s, %s, %s) RETURNING id",
-        (question_text, session_id, _now())
-    )
-    qid = cur.fetchone()[0]
-    conn.commit()
-    return qid
-
 def local_insert_answer(conn, question_id, answer_text, model_name, hints: Optional[List[str]] = None):
     cur = conn.cursor()
     cur.execute(
         "DELETE FROM answers WHERE question_id = %s", (question_id,)
     )
     cur.execute(
-        "INSERT INTO answers (question_id, answer_text, model_name, created_at) VALUES (%s, %s, %s, %s) RETURNING id",
-        (question_id, answer_text, model_name, _now())
+        "INSERT INTO answers (question_id, answer_text, model_name) VALUES (%s, %s, %s) RETURNING id",
+        (question_id, answer_text, model_name)
     )
     aid = cur.fetchone()[0]
 
@@ -62,22 +54,11 @@ def local_insert_answer(conn, question_id, answer_text, model_name, hints: Optio
     conn.commit()
     return aid
 
-def local_insert_hint(conn, question_id, hint_text, answer_id):
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO hints (question_id, answer_id, hint_text, created_at) VALUES (%s, %s, %s, %s) RETURNING id",
-        (question_id, answer_id, hint_text, _now())
-    )
-    hid = cur.fetchone()[0]
-    conn.commit()
-    return hid
-
 # =====================================================================================
 # Main Service Function
 # =====================================================================================
 
 def process_generation(
-    conn,
     session_id: str,
     question: str,
     num_hints: int,
@@ -85,28 +66,109 @@ def process_generation(
     max_tokens: int,
     model_name: str,
     answer_aware: bool = False,
-    provided_answer: str = None
+    provided_answer: str = None,
+    use_cache: bool = True,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
 ) -> Dict[str, Any]:
+    """
+    Generates the answer and hints without holding a database connection,
+    then stores question, answer and hints in one short transaction.
+    `progress(phase, detail)` is told when each phase starts.
+    """
     cfg = API_Info(model_name=model_name)
+    report = progress or (lambda phase, detail: None)
 
-    answer_obj, hint_objs = generate_answer_hints(
-        conn=conn,
+    report("generating", {"num_hints": num_hints or 0})
+    answer_text, hint_texts = generate_answer_hints(
         question=question,
         num_hints=num_hints,
         temperature=temperature,
         max_tokens=max_tokens,
         cfg=cfg,
         answer=answer_aware,
-        session_id=session_id,
-        provided_answer_text=provided_answer 
+        provided_answer_text=provided_answer,
+        use_cache=use_cache
     )
 
+    report("persisting", {"num_hints": len(hint_texts)})
+    with pooled_connection() as conn:
+        answer_obj, hint_objs = persist_generation(conn, session_id, question, answer_text, cfg.model_name, hint_texts)
+
     return {
         "question": question,
         "hints": [{"id": h.id, "text": h.hint_text} for h in hint_objs],
         "answer": answer_obj.answer_text,
     }
 
+async def astream_generation(
+    session_id: str,
+    question: str,
+    num_hints: int,
+    temperature: float,
+    max_tokens: int,
+    model_name: str,
+    answer_aware: bool = False,
+    use_cache: bool = True,
+    top_p: float = 0.9
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of process_generation. Yields ("answer", ...) once the
+    answer is known, ("hint", ...) for every hint as soon as its line is
+    complete, and ("done", ...) with the same payload as process_generation
+    after question, answer and hints were stored. Without `answer_aware` the
+    answer may arrive between or after the hints.
+    """
+    cfg = API_Info(model_name=model_name)
+
+    # Answer-agnostic hints do not need the answer, so both LLM calls run concurrently
+    if answer_aware:
+        answer_text = await agenerate_answer_aware(question, max_tokens=max_tokens, temperature=temperature, cfg=cfg, top_p=top_p, answer=None, use_cache=use_cache)
+        answer_task = None
+        yield "answer", {"answer": answer_text}
+    else:
+        answer_task = asyncio.ensure_future(
+            agenerate_answer_agnostic(question, max_tokens=max_tokens, temperature=temperature, top_p=top_p, cfg=cfg, use_cache=use_cache)
+        )
+
+    hint_texts: List[str] = []
+    try:
+        if num_hints and num_hints > 0:
+            messages = _hint_messages(question, num_hints, answer_text if answer_aware else None)
+            buffer = ""
+            streamed = 0
+            async for delta in astream_chat_completion(cfg.model_name, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache):
+                buffer += delta
+                # Only complete lines are parsed, the last one may still grow
+                complete, _, _ = buffer.rpartition("\n")
+                for hint in _filter_hints(my_parse_llm_response(complete))[streamed:]:
+                    yield "hint", {"index": streamed, "text": hint}
+                    streamed += 1
+                if answer_task is not None and answer_task.done():
+                    answer_text = answer_task.result()
+                    answer_task = None
+                    yield "answer", {"answer": answer_text}
+
+            # Same parsing as the HintEval generators on the full response
+            hint_texts = _filter_hints(my_parse_llm_response(buffer.strip()))
+            for hint in hint_texts[streamed:]:
+                yield "hint", {"index": streamed, "text": hint}
+                streamed += 1
+
+        if answer_task is not None:
+            answer_text = await answer_task
+            answer_task = None
+            yield "answer", {"answer": answer_text}
+    finally:
+        if answer_task is not None:
+            answer_task.cancel()
+
+    answer_obj, hint_objs = await run_with_db(persist_generation, session_id, question, answer_text, cfg.model_name, hint_texts)
+    yield "done", {
+        "question": question,
+        "hints": [{"id": h.id, "text": h.hint_text} for h in hint_objs],
+        "answer": answer_obj.answer_text,
+    }
+
 def generate_only_answer(
     conn,
     session_id: str,
@@ -116,16 +178,148 @@ def generate_only_answer(
     max_tokens: int = 512,
     question_id: int = None,
     hints: Optional[List[str]] = None,
-    top_p: float = 0.9
+    top_p: float = 0.9,
+    use_cache: bool = True
 ) -> str:
     cfg = API_Info(model_name=model_name)
-    answer_text = generate_answer_agnostic(question, max_tokens, temperature, top_p, cfg)
+    answer_text = generate_answer_agnostic(question, max_tokens, temperature, top_p, cfg, use_cache=use_cache)
     
     if question_id:
         local_insert_answer(conn=conn, question_id=question_id, answer_text=answer_text, model_name=model_name, hints=hints)
     
     return answer_text
 
+async def agenerate_only_answer(
+    session_id: str,
+    question: str,
+    model_name: str,
+    temperature: float = 0.3,
+    max_tokens: int = 512,
+    question_id: int = None,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> str:
+    """Async variant of generate_only_answer; only the final insert borrows a connection."""
+    cfg = API_Info(model_name=model_name)
+    answer_text = await agenerate_answer_agnostic(question, max_tokens, temperature, top_p, cfg, use_cache=use_cache)
+
+    if question_id:
+        await run_with_db(local_insert_answer, question_id=question_id, answer_text=answer_text, model_name=model_name, hints=hints)
+
+    return answer_text
+
+async def astream_answer(
+    question: str,
+    model_name: str,
+    temperature: float = 0.3,
+    max_tokens: int = 512,
+    question_id: int = None,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of agenerate_only_answer: yields ("token", ...) for every
+    content delta and ("done", {"answer": ...}) once the answer is stored.
+    """
+    cfg = API_Info(model_name=model_name)
+    answer_text = "No question provided."
+    if question.strip():
+        user_prompt = answer_for_answer_agnostic_prompt(question.strip(), max_tokens)
+        parts = []
+        async for delta in astream_chat_completion(
+            cfg.model_name, _answer_messages(user_prompt),
+            temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
+        ):
+            parts.append(delta)
+            yield "token", {"text": delta}
+        answer_text = "".join(parts).strip() or "Answer unavailable."
+
+    if question_id:
+        await run_with_db(local_insert_answer, question_id=question_id, answer_text=answer_text, model_name=model_name, hints=hints)
+
+    yield "done", {"answer": answer_text}
+
+async def astream_candidates(
+    question: str,
+    num_candidates: int,
+    temperature: float,
+    model_name: str,
+    max_tokens: int,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yields ("candidate", ...) for every distinct candidate line as soon as it is
+    complete, then ("candidates", {"candidates": [...]}) with the same list
+    generate_only_candidates returns. The request stops after `num_candidates` lines.
+    """
+    cfg = API_Info(model_name=model_name)
+    text = ""
+    streamed = 0
+    async for delta in astream_chat_completion(
+        cfg.model_name, _candidate_messages(question, num_candidates, max_tokens, hints),
+        temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache,
+        stop_when=_enough_candidates(num_candidates)
+    ):
+        text += delta
+        complete, _, _ = text.rpartition("\n")
+        if not complete.strip():
+            continue
+        for candidate in _parse_candidates(complete, num_candidates)[streamed:]:
+            yield "candidate", {"index": streamed, "text": candidate}
+            streamed += 1
+
+    candidates = _parse_candidates(text.strip(), num_candidates) if text.strip() else []
+    for candidate in candidates[streamed:]:
+        yield "candidate", {"index": streamed, "text": candidate}
+        streamed += 1
+    yield "candidates", {"candidates": candidates}
+
+def _complete(model: str, messages: List[Dict[str, str]], stream: Optional[bool] = None, stop_when: Optional[Callable[[str], bool]] = None, **params) -> str:
+    """One chat completion, read token by token with `stream` (default: LLM_STREAMING)."""
+    if stream is None:
+        stream = LLM_STREAMING
+    if not stream:
+        return chat_completion(model=model, messages=messages, **params)
+    return "".join(stream_chat_completion(model, messages, stop_when=stop_when, **params)).strip()
+
+async def _acomplete(model: str, messages: List[Dict[str, str]], stream: Optional[bool] = None, stop_when: Optional[Callable[[str], bool]] = None, **params) -> str:
+    """Async variant of _complete."""
+    if stream is None:
+        stream = LLM_STREAMING
+    if not stream:
+        return await achat_completion(model=model, messages=messages, **params)
+    return "".join([delta async for delta in astream_chat_completion(model, messages, stop_when=stop_when, **params)]).strip()
+
+def _enough_candidates(num_candidates: int) -> Callable[[str], bool]:
+    """stop_when for candidate streams: `num_candidates` distinct complete lines have arrived."""
+    def stop(text: str) -> bool:
+        complete, _, _ = text.rpartition("\n")
+        return bool(complete.strip()) and len(_parse_candidates(complete, num_candidates)) >= num_candidates
+    return stop
+
+def _candidate_messages(question: str, num_candidates: int, max_tokens: int, hints: Optional[List[str]]) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": "You generate candidate answers exactly as instructed."},
+        {"role": "user", "content": prompt_candidates(num_candidates, question, max_tokens=max_tokens, hints=hints)},
+    ]
+
+def _parse_candidates(text: str, num_candidates: int) -> List[str]:
+    if not text: raise ValueError("Empty response")
+
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    out, seen = [], set()
+    for ln in lines:
+        ln = ln.lstrip("0123456789.-) ").strip()
+        if ln and ln not in seen:
+            seen.add(ln)
+            out.append(ln)
+        if len(out) >= num_candidates: break
+    return out[:num_candidates]
+
 def generate_only_candidates(
     question: str,
     num_candidates: int,
@@ -133,41 +327,66 @@ def generate_only_candidates(
     model_name: str,
     max_tokens: int,
     hints: Optional[List[str]] = None,
-    top_p: float = 0.9
+    top_p: float = 0.9,
+    use_cache: bool = True,
+    stream: Optional[bool] = None
 ) -> List[str]:
-    """Generates candidate answers using LLM."""
+    """
+    Generates candidate answers using LLM. Streamed responses are cut off as
+    soon as `num_candidates` distinct lines arrived.
+    """
     cfg = API_Info(model_name=model_name)
-    client = Together(api_key=cfg.api_key)
 
     for attempt in range(3):
         try:
-            resp = client.chat.completions.create(
-                model=cfg.model_name,
-                messages=[
-                    {"role": "system", "content": "You generate candidate answers exactly as instructed."},
-                    {"role": "user", "content": prompt_candidates(num_candidates, question, max_tokens=max_tokens, hints=hints)},
-                ],
-                stream=False, temperature=temperature, max_tokens=max_tokens, top_p=top_p
+            text = _complete(
+                cfg.model_name,
+                _candidate_messages(question, num_candidates, max_tokens, hints),
+                stream=stream, stop_when=_enough_candidates(num_candidates),
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
             )
+            out = _parse_candidates(text, num_candidates)
+            if out:
+                return out
+
+        except (LLMError, CircuitOpenError) as e:
+            # Transport errors were already retried with backoff by the LLM client
+            print(f"Candidate Gen Error: {e}", flush=True)
+            break
+        except Exception as e:
+            print(f"[Attempt {attempt+1}] Candidate Gen Error: {e}")
 
-            text = resp.choices[0].message.content.strip()
-            if not text: raise ValueError("Empty response")
+    return []
 
-            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-            out, seen = [], set()
-            for ln in lines:
-                ln = ln.lstrip("0123456789.-) ").strip()
-                if ln and ln not in seen:
-                    seen.add(ln)
-                    out.append(ln)
-                if len(out) >= num_candidates: break
+async def agenerate_only_candidates(
+    question: str,
+    num_candidates: int,
+    temperature: float,
+    model_name: str,
+    max_tokens: int,
+    hints: Optional[List[str]] = None,
+    top_p: float = 0.9,
+    use_cache: bool = True,
+    stream: Optional[bool] = None
+) -> List[str]:
+    """Async variant of generate_only_candidates."""
+    cfg = API_Info(model_name=model_name)
 
-            if len(out) >= num_candidates:
-                return out[:num_candidates]
-            
-            elif out:
-                return out 
+    for attempt in range(3):
+        try:
+            text = await _acomplete(
+                cfg.model_name,
+                _candidate_messages(question, num_candidates, max_tokens, hints),
+                stream=stream, stop_when=_enough_candidates(num_candidates),
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
+            )
+            out = _parse_candidates(text, num_candidates)
+            if out:
+                return out
 
+        except (LLMError, CircuitOpenError) as e:
+            print(f"Candidate Gen Error: {e}", flush=True)
+            break
         except Exception as e:
             print(f"[Attempt {attempt+1}] Candidate Gen Error: {e}")
 
@@ -192,6 +411,65 @@ def new_dataset_instance(question: str, answer: Optional[str] = None) -> Tuple[D
 
 import re
 
+def _hint_messages(question: str, num_hints: int, answer: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    The messages HintEval's AnswerAgnostic / AnswerAware API generators send
+    (Hint_Generation._hint_thread), for the streaming path and the cache key.
+    Must stay identical to them, tests/test_hint_generation.py compares both.
+    """
+    if answer:
+        user_prompt = "Generate {} hints for the following question without using \"{}\" word in the hints. Question: {}".format(
+            num_hints, answer.strip(), question.strip())
+    else:
+        user_prompt = "Generate {} hints for the following question without revealing the answer in the hints. Question: {}".format(
+            num_hints, question.strip())
+    return [
+        {"role": "system", "content": "You are a helpful assistant that generates hints for user questions. You are given the question, and your goal is to generate hints for the question."},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def _filter_hints(hints: List[str]) -> List[str]:
+    """HintEval's post-processing of parsed hints, followed by the empty-hint filter of generate_answer_hints."""
+    return [h for h in Hint_Filtering().filtering(hints) if (h or "").strip()]
+
+def _run_hint_generator(
+    question: str,
+    num_hints: int,
+    answer: Optional[str],
+    temperature: Optional[float],
+    top_p: float,
+    max_tokens: Optional[int],
+    cfg: API_Info
+) -> str:
+    """
+    Runs HintEval's AnswerAgnostic (with `answer`: AnswerAware) generator for
+    one question and returns the raw completion it parsed. _filter_hints over
+    my_parse_llm_response of that text gives the hints the generator stored.
+    """
+    completions: List[str] = []
+
+    def parse(text: str) -> List[str]:
+        completions.append(text)
+        return my_parse_llm_response(text)
+
+    dataset, _ = new_dataset_instance(question=question, answer=answer)
+    generator = AnswerAware if answer else AnswerAgnostic
+    gen = generator(
+        model_name=cfg.model_name,
+        api_key=cfg.api_key,
+        base_url=cfg.base_url,
+        num_of_hints=num_hints,
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+        batch_size=1,
+        parse_llm_response=parse)
+    try:
+        call_with_retry(cfg.model_name, lambda: gen.generate(dataset["entire"].get_instances()), label="Hint generation")
+    finally:
+        gen.release_memory()
+    return completions[-1] if completions else ""
+
 def my_parse_llm_response(llm_output: str) -> list[str]:
     hints: list[str] = []
 
@@ -212,116 +490,167 @@ def my_parse_llm_response(llm_output: str) -> list[str]:
 
 
 def generate_answer_hints(
-    conn,
     question: str,
     num_hints: Optional[int],
     temperature: Optional[float],
     max_tokens: Optional[int],
     cfg: API_Info,
     answer: bool,
-    session_id: Optional[str],
     provided_answer_text: Optional[str] = None, 
     top_p: float = 0.9,
     enable_tqdm: bool = True,
-) -> Tuple[AnswerOBJ, List[HintOBJ]]:
-    
-    question_id = local_insert_question(conn=conn, question_text=question, session_id=session_id)
-
+    use_cache: bool = True,
+) -> Tuple[str, List[str]]:
+    """Compute phase of a generation: LLM and HintEval calls only, no database access."""
     answer_text = ""
 
     if provided_answer_text:
          answer_text = provided_answer_text
     elif answer is False:
-         answer_text = generate_answer_agnostic(question, max_tokens=max_tokens, temperature=temperature,top_p=top_p, cfg=cfg)
+         answer_text = generate_answer_agnostic(question, max_tokens=max_tokens, temperature=temperature,top_p=top_p, cfg=cfg, use_cache=use_cache)
     else:
-         answer_text = generate_answer_aware(question, max_tokens=max_tokens, temperature=temperature, cfg=cfg, top_p=top_p, answer=None)
+         answer_text = generate_answer_aware(question, max_tokens=max_tokens, temperature=temperature, cfg=cfg, top_p=top_p, answer=None, use_cache=use_cache)
 
     hint_texts = []
     if num_hints and num_hints > 0:
-        if answer is False:
-            ds, inst = new_dataset_instance(question)
-            print("Generating answer-agnostic hints...", flush=True)
-            gen = AnswerAgnostic(
-                model_name=cfg.model_name,
-                api_key=cfg.api_key,
-                base_url=cfg.base_url,
-                num_of_hints=num_hints,
-                temperature=temperature,
-                top_p=top_p,
-                max_tokens=max_tokens,
-                batch_size=1,
-                parse_llm_response=my_parse_llm_response)
-            gen.generate(ds["entire"].get_instances())
-            hint_texts = [h.hint for h in inst.hints if (h.hint or "").strip()]
-            gen.release_memory()
-        else:
-            print("Generating answer-aware hints...", flush=True)
-            dataset, inst = new_dataset_instance(question=question, answer=answer_text)
-            gen = AnswerAware(
-                model_name=cfg.model_name,
-                api_key=cfg.api_key,
-                base_url=cfg.base_url,
-                num_of_hints=num_hints,
-                temperature=temperature,
-                top_p=top_p,
-                max_tokens=max_tokens,
-                batch_size=1,
-                parse_llm_response=my_parse_llm_response)
-            gen.generate(dataset["entire"].get_instances())
-            hint_texts = [h.hint for h in inst.hints if (h.hint or "").strip()]
-            gen.release_memory()
-
-    answer_id = local_insert_answer(conn=conn, question_id=question_id, answer_text=answer_text, model_name=cfg.model_name)
-    
-    answer_obj = AnswerOBJ(id=answer_id, question_id=question_id, answer_text=answer_text, model_name=cfg.model_name)
-    hint_objs = []
-    
-    for h_text in hint_texts:
-        hid = local_insert_hint(conn=conn, question_id=question_id, hint_text=h_text, answer_id=answer_id)
-        hint_objs.append(HintOBJ(id=hid, question_id=question_id, answer_id=answer_id, hint_text=h_text))
+        hint_answer = None if answer is False else answer_text
+        print(f"Generating answer-{'agnostic' if hint_answer is None else 'aware'} hints...", flush=True)
+        # Cached under the key of the streaming path, both store the same hints for the same request
+        completion = cached_completion(
+            cfg.model_name,
+            _hint_messages(question, num_hints, hint_answer),
+            lambda: _run_hint_generator(question, num_hints, hint_answer, temperature, top_p, max_tokens, cfg),
+            temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache,
+        )
+        hint_texts = _filter_hints(my_parse_llm_response(completion))
+
+    return answer_text, hint_texts
 
+def persist_generation(
+    conn,
+    session_id: str,
+    question: str,
+    answer_text: str,
+    model_name: str,
+    hint_texts: List[str],
+    commit: bool = True
+) -> Tuple[AnswerOBJ, List[HintOBJ]]:
+    """
+    Write phase of a generation: question, answer and hints in a single transaction.
+    With `commit=False` the caller adds its own statements and commits.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "INSERT INTO questions (text, session_id) VALUES (%s, %s) RETURNING id",
+            (question, session_id)
+        )
+        question_id = cur.fetchone()[0]
+        cur.execute(
+            "INSERT INTO answers (question_id, answer_text, model_name) VALUES (%s, %s, %s) RETURNING id",
+            (question_id, answer_text, model_name)
+        )
+        answer_id = cur.fetchone()[0]
+
+        hint_ids = []
+        if hint_texts:
+            rows = execute_values(
+                cur,
+                "INSERT INTO hints (question_id, answer_id, hint_text) VALUES %s RETURNING id",
+                [(question_id, answer_id, h_text) for h_text in hint_texts],
+                page_size=len(hint_texts),
+                fetch=True
+            )
+            hint_ids = [r[0] for r in rows]
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    answer_obj = AnswerOBJ(id=answer_id, question_id=question_id, answer_text=answer_text, model_name=model_name)
+    hint_objs = [
+        HintOBJ(id=hid, question_id=question_id, answer_id=answer_id, hint_text=h_text)
+        for hid, h_text in zip(hint_ids, hint_texts)
+    ]
     return answer_obj, hint_objs
 
-def generate_answer_agnostic(question: str, max_tokens: int, temperature: float, top_p: float, cfg: API_Info, max_retries: int = 3) -> str:
+def _answer_messages(user_prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": "You are a concise assistant. Provide only the answer text."},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def generate_answer_agnostic(question: str, max_tokens: int, temperature: float, top_p: float, cfg: API_Info, max_retries: int = 3, use_cache: bool = True, stream: Optional[bool] = None) -> str:
     if not question.strip(): return "No question provided."
-    client = Together(api_key=cfg.api_key)
     user_prompt = answer_for_answer_agnostic_prompt(question.strip(), max_tokens)
     
     for attempt in range(max_retries):
         try:
-            resp = client.chat.completions.create(
-                model=cfg.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a concise assistant. Provide only the answer text."},
-                    {"role": "user", "content": user_prompt},
-                ],
-                stream=False, temperature=temperature, max_tokens=max_tokens, top_p=top_p
+            text = _complete(
+                cfg.model_name, _answer_messages(user_prompt), stream=stream,
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
             )
-            text = (resp.choices[0].message.content or "").strip()
             if text: return text
+        except (LLMError, CircuitOpenError) as e:
+            print(f"Gen Answer Agnostic Error: {e}",flush=True)
+            break
         except Exception as e:
             print(f"Gen Answer Agnostic Error (Attempt {attempt+1}): {e}",flush=True)
     return "Answer unavailable."
 
-def generate_answer_aware(question: str, max_tokens: int, temperature: float, cfg: API_Info, top_p: float, answer: str = None, max_retries: int = 3) -> str:
+async def agenerate_answer_agnostic(question: str, max_tokens: int, temperature: float, top_p: float, cfg: API_Info, max_retries: int = 3, use_cache: bool = True, stream: Optional[bool] = None) -> str:
+    """Async variant of generate_answer_agnostic."""
     if not question.strip(): return "No question provided."
-    client = Together(api_key=cfg.api_key)
-    
+    user_prompt = answer_for_answer_agnostic_prompt(question.strip(), max_tokens)
 
+    for attempt in range(max_retries):
+        try:
+            text = await _acomplete(
+                cfg.model_name, _answer_messages(user_prompt), stream=stream,
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
+            )
+            if text: return text
+        except (LLMError, CircuitOpenError) as e:
+            print(f"Gen Answer Agnostic Error: {e}",flush=True)
+            break
+        except Exception as e:
+            print(f"Gen Answer Agnostic Error (Attempt {attempt+1}): {e}",flush=True)
+    return "Answer unavailable."
+
+def generate_answer_aware(question: str, max_tokens: int, temperature: float, cfg: API_Info, top_p: float, answer: str = None, max_retries: int = 3, use_cache: bool = True, stream: Optional[bool] = None) -> str:
+    if not question.strip(): return "No question provided."
     user_prompt = answer_for_answer_aware_prompt(question.strip(), answer=answer, max_tokens=max_tokens)
 
     for attempt in range(max_retries):
         try:
-            resp = client.chat.completions.create(
-                model=cfg.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a concise assistant. Provide only the answer text."},
-                    {"role": "user", "content": user_prompt},
-                ],
-                stream=False, temperature=temperature, max_tokens=max_tokens, top_p=top_p
+            text = _complete(
+                cfg.model_name, _answer_messages(user_prompt), stream=stream,
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
             )
-            text = (resp.choices[0].message.content or "").strip()
             if text: return text
+        except (LLMError, CircuitOpenError) as e:
+            print(f"Gen Answer Aware Error: {e}",flush=True)
+            break
         except Exception as e:
             print(f"Gen Answer Aware Error (Attempt {attempt+1}): {e}",flush=True)
-    return "Answer unavailable."
\ No newline at end of file
+    return "Answer unavailable."
+
+async def agenerate_answer_aware(question: str, max_tokens: int, temperature: float, cfg: API_Info, top_p: float, answer: str = None, max_retries: int = 3, use_cache: bool = True, stream: Optional[bool] = None) -> str:
+    """Async variant of generate_answer_aware."""
+    if not question.strip(): return "No question provided."
+    user_prompt = answer_for_answer_aware_prompt(question.strip(), answer=answer, max_tokens=max_tokens)
+
+    for attempt in range(max_retries):
+        try:
+            text = await _acomplete(
+                cfg.model_name, _answer_messages(user_prompt), stream=stream,
+                temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache
+            )
+            if text: return text
+        except (LLMError, CircuitOpenError) as e:
+            print(f"Gen Answer Aware Error: {e}",flush=True)
+            break
+        except Exception as e:
+            print(f"Gen Answer Aware Error (Attempt {attempt+1}): {e}",flush=True)
+    return "Answer unavailable."
@@ -1,23 +1,13 @@
 import json
-from datetime import datetime
 from typing import List, Dict, Any
 from .question_service import get_latest_question_id, clear_metrics_for_question
-from sentence_transformers import SentenceTransformer
+from .model_registry import get_model, HINT_SIMILARITY_MODEL
+from . import entities_service, embedding_cache, embedding_service
 
 
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning, module="transformers.tokenization_utils_base")
 
-# Initialize Model GLOBALLY
-try:
-    sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
-except Exception as e:
-    print(f"Error loading SBERT model: {e}")
-    sbert_model = None
-
-
-def _now() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 def get_hints_for_session(conn, session_id: str) -> List[Dict[str, Any]]:
     qid = get_latest_question_id(conn, session_id)
@@ -37,7 +27,7 @@ def save_hint(conn, session_id: str, hint_text: str) -> int:
     cur = conn.cursor()
 
     cur.execute(
-        "SELECT id FROM answers WHERE question_id = %s ORDER BY created_at DESC LIMIT 1",
+        "SELECT id FROM answers WHERE question_id = %s ORDER BY created_at DESC, id DESC LIMIT 1",
         (qid,)
     )
     
@@ -47,20 +37,20 @@ def save_hint(conn, session_id: str, hint_text: str) -> int:
         answer_id = row[0]
         cur.execute(
             """
-            INSERT INTO hints (question_id, hint_text, answer_id, created_at) 
-            VALUES (%s, %s, %s, %s) 
+            INSERT INTO hints (question_id, hint_text, answer_id) 
+            VALUES (%s, %s, %s) 
             RETURNING id
             """,
-            (qid, hint_text, answer_id, _now())
+            (qid, hint_text, answer_id)
         )
     else:
         cur.execute(
             """
-            INSERT INTO hints (question_id, hint_text, created_at) 
-            VALUES (%s, %s, %s) 
+            INSERT INTO hints (question_id, hint_text) 
+            VALUES (%s, %s) 
             RETURNING id
             """,
-            (qid, hint_text, _now())
+            (qid, hint_text)
         )
         
     new_id = cur.fetchone()[0]
@@ -75,16 +65,18 @@ def update_hint(conn, hint_id: int, new_text: str) -> int:
     row = cur.fetchone()
     qid = row[0] if row else None
 
+    # The embedding cache is keyed by text, the old text's vector stays valid for other hints
     cur.execute(
-        "UPDATE hints SET hint_text = %s, updated_at = %s WHERE id = %s",
-        (new_text, _now(), hint_id)
+        "UPDATE hints SET hint_text = %s, updated_at = now() WHERE id = %s",
+        (new_text, hint_id)
     )
+    updated = cur.rowcount
     conn.commit()
     
     if qid:
         clear_metrics_for_question(conn, qid)
         
-    return cur.rowcount
+    return updated
 
 def delete_hint(conn, hint_id: int) -> int:
     cur = conn.cursor()
@@ -109,81 +101,122 @@ def delete_all_hints(conn, session_id: str) -> None:
         conn.commit()
         clear_metrics_for_question(conn, qid)
 
-def get_detailed_metrics(conn, session_id: str) -> List[Dict[str, Any]]:
-    qid = get_latest_question_id(conn, session_id)
-    if not qid:
-        return []
-
-    cur = conn.cursor()
-    cur.execute("SELECT id, hint_text FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
-    hints = cur.fetchall()
-
-    result = []
-
-    for hid, text in hints:
-        cur.execute("SELECT name, value FROM metrics WHERE hint_id = %s", (hid,))
-        metrics = {row[0]: row[1] for row in cur.fetchall()}
-        
-        result.append({
-            "id": hid,
-            "text": text,
-            "convergence": metrics.get("convergence"),
-            "relevance": metrics.get("relevance"),
-            "answer_leakage": metrics.get("answer-leakage"),
-            "readability": metrics.get("readability"),
-            "familiarity": metrics.get("familiarity"),
-        })
-    return result
-
-
-def get_convergence_scores(conn, session_id: str) -> List[Dict[str, Any]]:
-    qid = get_latest_question_id(conn, session_id)
-    if not qid:
-        return []
-
+# Metric names stored by the evaluators -> keys returned to the metrics page
+METRIC_COLUMNS = {
+    "convergence": "convergence",
+    "relevance": "relevance",
+    "answer-leakage": "answer_leakage",
+    "readability": "readability",
+    "familiarity": "familiarity",
+}
+
+def _fetch_hint_metric_rows(conn, session_id: str) -> List[Dict[str, Any]]:
+    """
+    Hints of the latest question with their metrics pivoted into columns,
+    plus the raw convergence metadata, in a single query.
+    """
+    pivot = ",\n".join(
+        f"MAX(m.value) FILTER (WHERE m.name = '{name}') AS \"{key}\""
+        for name, key in METRIC_COLUMNS.items()
+    )
     cur = conn.cursor()
-
-    cur.execute("SELECT id, hint_text FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
-    hints = cur.fetchall()
-
-    result = []
-
-    for hid, text in hints:
-        cur.execute(
-            "SELECT metadata_json FROM metrics WHERE hint_id = %s AND name = 'convergence'", 
-            (hid,)
+    cur.execute(
+        f"""
+        SELECT h.id, h.hint_text,
+               {pivot},
+               MAX(m.metadata_json) FILTER (WHERE m.name = 'convergence') AS convergence_meta
+        FROM hints h
+        LEFT JOIN metrics m ON m.hint_id = h.id
+        WHERE h.question_id = (
+            SELECT id FROM questions WHERE session_id = %s ORDER BY created_at DESC, id DESC LIMIT 1
         )
-        row = cur.fetchone()
-
-        candidate_status = {}
-
-        if row:
-            metadata_str = row[0]
-            try:
-                meta_data = json.loads(metadata_str)
-                if isinstance(meta_data, dict):
-                    if "scores" in meta_data and isinstance(meta_data["scores"], dict):
-                        candidate_status = meta_data["scores"]
-                    else:
-                        candidate_status = meta_data     
-            except json.JSONDecodeError:
-                candidate_status = {}
-        result.append({
-            "id": hid,
-            "text": text,
-            "candidates": candidate_status 
-        })
-
-    return result
-
+        GROUP BY h.id, h.hint_text
+        ORDER BY h.id ASC
+        """,
+        (session_id,)
+    )
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+def _parse_candidate_status(metadata_str) -> Dict[str, Any]:
+    if not metadata_str:
+        return {}
+    try:
+        meta_data = json.loads(metadata_str)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(meta_data, dict):
+        return {}
+    if "scores" in meta_data and isinstance(meta_data["scores"], dict):
+        return meta_data["scores"]
+    return meta_data
+
+def _to_detailed_metrics(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"id": r["id"], "text": r["hint_text"], **{key: r[key] for key in METRIC_COLUMNS.values()}}
+        for r in rows
+    ]
+
+def _to_convergence_scores(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"id": r["id"], "text": r["hint_text"], "candidates": _parse_candidate_status(r["convergence_meta"])}
+        for r in rows
+    ]
 
+def get_detailed_metrics(conn, session_id: str) -> List[Dict[str, Any]]:
+    return _to_detailed_metrics(_fetch_hint_metric_rows(conn, session_id))
 
-def calculate_similarities_using_sbert(hints: List[str]) -> List[List[float]]:
-    if not sbert_model: return []
+def get_convergence_scores(conn, session_id: str) -> List[Dict[str, Any]]:
+    return _to_convergence_scores(_fetch_hint_metric_rows(conn, session_id))
+
+def get_metrics_dashboard(conn, session_id: str) -> Dict[str, Any]:
+    """
+    Everything the metrics page shows, read over one connection:
+    the pivoted metrics and convergence scores come from the same query,
+    the hint texts of that query feed the similarity matrix.
+    """
+    rows = _fetch_hint_metric_rows(conn, session_id)
+    entities = entities_service.get_entities_for_session(conn, session_id)
+
+    try:
+        similarities = calculate_similarities_using_sbert([r["hint_text"] for r in rows], conn)
+    except Exception as e:
+        print(f"Error calculating hint similarities: {e}", flush=True)
+        similarities = []
+
+    return {
+        "metrics": _to_detailed_metrics(rows),
+        "convergence": _to_convergence_scores(rows),
+        "entities": entities,
+        "similarities": similarities,
+    }
+
+
+
+def calculate_similarities_using_sbert(hints: List[str], conn=None) -> List[List[float]]:
+    """
+    Cosine similarity matrix of the hints. With `conn` the embeddings come from
+    the embedding cache and only hints without a stored vector are encoded;
+    the SBERT model is not even loaded when every hint is cached.
+    """
     if not hints: return []
-    embeddings = sbert_model.encode(hints, convert_to_tensor=True)
-    similarities = sbert_model.similarity(embeddings, embeddings)
-    return similarities.tolist()
+
+    def encode(texts: List[str]):
+        return get_model("hint_similarity").encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    try:
+        if conn is not None:
+            embeddings = embedding_cache.get_embeddings(
+                conn, hints, lambda: embedding_service.encoder_key(HINT_SIMILARITY_MODEL), encode
+            )
+        else:
+            embeddings = encode(hints)
+    except Exception as e:
+        if conn is not None:
+            conn.rollback()
+        print(f"Error computing SBERT embeddings: {e}")
+        return []
+    return embedding_cache.cosine_similarity_matrix(embeddings)
 
 def get_embedding_similarities(conn, session_id: str) -> List[List[float]]:
     qid = get_latest_question_id(conn, session_id)
@@ -198,4 +231,4 @@ def get_embedding_similarities(conn, session_id: str) -> List[List[float]]:
         return []
         
     hint_texts = [r[0] for r in rows]
-    return calculate_similarities_using_sbert(hint_texts)
\ No newline at end of file
+    return calculate_similarities_using_sbert(hint_texts, conn)
@@ -0,0 +1,317 @@
+from __future__ import annotations
+import os
+import json
+import time
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.database.connection import pooled_connection
+
+# Worker threads per process. Several app processes can share the queue,
+# jobs are claimed with FOR UPDATE SKIP LOCKED.
+JOB_WORKERS = int(os.getenv("HINTEVAL_JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("HINTEVAL_JOB_POLL_SECONDS", "2"))
+# Running jobs whose heartbeat is older than this are requeued (crashed process).
+JOB_STALE_SECONDS = int(os.getenv("HINTEVAL_JOB_STALE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("HINTEVAL_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETENTION_DAYS = int(os.getenv("HINTEVAL_JOB_RETENTION_DAYS", "7"))
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+_JOB_COLUMNS = """
+    id, kind, session_id, idempotency_key, status, progress_json, result_json, error,
+    attempts, created_at, started_at, finished_at
+"""
+
+
+# Extra parameters of a job that runs again because its worker stopped responding
+_RETRY_PARAMS: Dict[str, Dict[str, Any]] = {
+    # The questions the dead worker had claimed are still 'running', take them over right away
+    "bulk_generate": {"reclaim": True},
+}
+
+
+class IdempotencyConflict(Exception):
+    """The idempotency key was already used for a job with different parameters."""
+
+
+def _handlers() -> Dict[str, Callable[..., Dict[str, Any]]]:
+    from backend.services.generation_service import process_generation
+    from backend.services.evaluation_service import run_evaluation_and_persist, run_batch_evaluation_and_persist
+    from backend.services.bulk_generation_service import run_bulk_generation
+    from backend.services.save_and_load_service import fill_missing_answers
+    return {
+        "generate": process_generation,
+        "bulk_generate": run_bulk_generation,
+        "import_answers": fill_missing_answers,
+        "evaluate": run_evaluation_and_persist,
+        "evaluate_batch": run_batch_evaluation_and_persist,
+    }
+
+def _row_to_job(row, with_result: bool = True) -> Dict[str, Any]:
+    job = {
+        "job_id": row[0],
+        "kind": row[1],
+        "idempotency_key": row[3],
+        "status": row[4],
+        "progress": json.loads(row[5]) if row[5] else None,
+        "error": row[7],
+        "attempts": row[8],
+        "created_at": row[9].isoformat() if row[9] else None,
+        "started_at": row[10].isoformat() if row[10] else None,
+        "finished_at": row[11].isoformat() if row[11] else None,
+    }
+    if with_result:
+        job["result"] = json.loads(row[6]) if row[6] else None
+    return job
+
+# =====================================================================================
+# Queue API
+# =====================================================================================
+
+def enqueue_job(
+    conn,
+    kind: str,
+    session_id: str,
+    params: Dict[str, Any],
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Queues a job. A repeated `idempotency_key` within the session returns the
+    existing job instead of queueing it again.
+    """
+    if kind not in _handlers():
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    params_json = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        INSERT INTO jobs (kind, session_id, idempotency_key, params_json)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (session_id, idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+        RETURNING {_JOB_COLUMNS}
+        """,
+        (kind, session_id, idempotency_key, params_json)
+    )
+    row = cur.fetchone()
+    if row is None:
+        cur.execute(
+            f"SELECT {_JOB_COLUMNS}, params_json FROM jobs WHERE session_id = %s AND idempotency_key = %s",
+            (session_id, idempotency_key)
+        )
+        row = cur.fetchone()
+        conn.commit()
+        if row[1] != kind or row[-1] != params_json:
+            raise IdempotencyConflict(f"Idempotency key '{idempotency_key}' was already used for a different request.")
+        return _row_to_job(row)
+
+    conn.commit()
+    wake_workers()
+    return _row_to_job(row)
+
+def get_job(conn, session_id: str, job_id: int) -> Optional[Dict[str, Any]]:
+    cur = conn.cursor()
+    cur.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = %s AND session_id = %s", (job_id, session_id))
+    row = cur.fetchone()
+    return _row_to_job(row) if row else None
+
+def list_jobs(conn, session_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Latest jobs of the session, without their results."""
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {_JOB_COLUMNS} FROM jobs WHERE session_id = %s ORDER BY created_at DESC, id DESC LIMIT %s",
+        (session_id, limit)
+    )
+    return [_row_to_job(r, with_result=False) for r in cur.fetchall()]
+
+def get_queue_stats(conn) -> Dict[str, Any]:
+    cur = conn.cursor()
+    cur.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+    counts = dict(cur.fetchall())
+    cur.execute("SELECT EXTRACT(EPOCH FROM now() - MIN(created_at)) FROM jobs WHERE status = 'queued'")
+    oldest = cur.fetchone()[0]
+    return {
+        "workers": JOB_WORKERS,
+        "running_here": len(_running),
+        "oldest_queued_seconds": round(float(oldest), 1) if oldest is not None else None,
+        **{status: counts.get(status, 0) for status in JOB_STATUSES},
+    }
+
+# =====================================================================================
+# Workers
+# =====================================================================================
+
+_wake = threading.Event()
+_stop = threading.Event()
+_threads: List[threading.Thread] = []
+_running: Dict[int, "JobProgress"] = {}
+_running_lock = threading.Lock()
+
+
+class JobProgress:
+    """
+    Collects the progress(phase, detail) callbacks of one job and writes the
+    snapshot to the job row. Evaluators report from several threads at once.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"phase": "starting"}
+
+    def __call__(self, phase: str, detail: Dict[str, Any]) -> None:
+        with self._lock:
+            self._state["phase"] = phase
+            if phase == "evaluating":
+                name = detail["evaluator"]
+                self._state.setdefault("evaluators", {})[name] = {
+                    k: detail[k] for k in ("status", "hints_done", "hints_total")
+                }
+                evaluators = self._state["evaluators"].values()
+                # A hint is done once every evaluator has covered it
+                self._state["hints_total"] = detail["hints_total"]
+                self._state["hints_done"] = min(e["hints_done"] for e in evaluators) if len(evaluators) == _num_evaluators() else 0
+            else:
+                self._state.update(detail)
+            # Written under the lock so that an older snapshot never overwrites a newer one
+            try:
+                with pooled_connection() as conn:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "UPDATE jobs SET progress_json = %s, heartbeat_at = now() WHERE id = %s",
+                        (json.dumps(self._state), self.job_id)
+                    )
+                    conn.commit()
+            except Exception as e:
+                # Progress is informative only, the job keeps running
+                print(f"Job {self.job_id}: progress update failed: {e}", flush=True)
+
+
+def _num_evaluators() -> int:
+    from backend.services.evaluation_service import EVALUATORS
+    return len(EVALUATORS)
+
+def _claim_job(conn):
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE jobs
+        SET status = 'running', started_at = now(), heartbeat_at = now(), attempts = attempts + 1
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued'
+            ORDER BY created_at, id
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, kind, params_json, attempts
+        """
+    )
+    row = cur.fetchone()
+    conn.commit()
+    return row
+
+def _finish_job(job_id: int, result: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE jobs
+            SET status = %s, result_json = %s, error = %s, finished_at = now(), heartbeat_at = now()
+            WHERE id = %s
+            """,
+            ("failed" if error else "succeeded", json.dumps(result, default=str) if result is not None else None, error, job_id)
+        )
+        conn.commit()
+
+def _run_job(job_id: int, kind: str, params_json: str, attempts: int = 1) -> None:
+    progress = JobProgress(job_id)
+    with _running_lock:
+        _running[job_id] = progress
+
+    params = json.loads(params_json)
+    if attempts > 1:
+        params.update(_RETRY_PARAMS.get(kind, {}))
+    started = time.perf_counter()
+    try:
+        result = _handlers()[kind](**params, progress=progress)
+        _finish_job(job_id, result, None)
+        print(f"Job {job_id} ({kind}) finished in {time.perf_counter() - started:.1f}s.", flush=True)
+    except Exception as e:
+        traceback.print_exc()
+        _finish_job(job_id, None, f"{type(e).__name__}: {e}")
+        print(f"Job {job_id} ({kind}) failed: {e}", flush=True)
+    finally:
+        with _running_lock:
+            _running.pop(job_id, None)
+
+def _sweep(conn) -> None:
+    """Heartbeats this process's jobs, requeues stale ones and drops old finished jobs."""
+    cur = conn.cursor()
+    with _running_lock:
+        running_ids = list(_running)
+    if running_ids:
+        cur.execute("UPDATE jobs SET heartbeat_at = now() WHERE id = ANY(%s)", (running_ids,))
+    cur.execute(
+        """
+        UPDATE jobs
+        SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'queued' END,
+            error = CASE WHEN attempts >= %s THEN 'Worker stopped responding' ELSE error END,
+            finished_at = CASE WHEN attempts >= %s THEN now() ELSE NULL END
+        WHERE status = 'running' AND heartbeat_at < now() - make_interval(secs => %s)
+        """,
+        (JOB_MAX_ATTEMPTS, JOB_MAX_ATTEMPTS, JOB_MAX_ATTEMPTS, JOB_STALE_SECONDS)
+    )
+    if cur.rowcount:
+        print(f"Requeued or failed {cur.rowcount} stale jobs.", flush=True)
+    cur.execute(
+        "DELETE FROM jobs WHERE finished_at < now() - make_interval(days => %s)",
+        (JOB_RETENTION_DAYS,)
+    )
+    conn.commit()
+
+def _worker_loop(worker_id: int) -> None:
+    while not _stop.is_set():
+        try:
+            with pooled_connection() as conn:
+                job = _claim_job(conn)
+            if job is None:
+                _wake.wait(JOB_POLL_SECONDS)
+                _wake.clear()
+                continue
+            _run_job(*job)
+        except Exception as e:
+            print(f"Job worker {worker_id}: {e}", flush=True)
+            _stop.wait(JOB_POLL_SECONDS)
+
+def _maintenance_loop() -> None:
+    while not _stop.wait(max(JOB_STALE_SECONDS / 4, 1)):
+        try:
+            with pooled_connection() as conn:
+                _sweep(conn)
+        except Exception as e:
+            print(f"Job maintenance failed: {e}", flush=True)
+
+def wake_workers() -> None:
+    _wake.set()
+
+def start_workers(num_workers: int = JOB_WORKERS) -> None:
+    if _threads or num_workers <= 0:
+        return
+    _stop.clear()
+    for i in range(num_workers):
+        _threads.append(threading.Thread(target=_worker_loop, args=(i,), name=f"hinteval-job-{i}", daemon=True))
+    _threads.append(threading.Thread(target=_maintenance_loop, name="hinteval-job-maintenance", daemon=True))
+    for t in _threads:
+        t.start()
+    print(f"Started {num_workers} job workers.", flush=True)
+
+def stop_workers(timeout: float = 5.0) -> None:
+    """Stops claiming new jobs. Jobs still running are requeued by the next sweep."""
+    _stop.set()
+    _wake.set()
+    for t in _threads:
+        t.join(timeout)
+    _threads.clear()
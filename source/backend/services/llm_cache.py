@@ -0,0 +1,113 @@
+from __future__ import annotations
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from backend.database.connection import pooled_connection
+
+# Opt-in: identical prompts with identical sampling parameters return the stored response.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "0") == "1"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+# Pruning scans the table, so it only runs every N stores.
+LLM_CACHE_PRUNE_EVERY = int(os.getenv("LLM_CACHE_PRUNE_EVERY", "100"))
+
+_counters = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "errors": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str) -> int:
+    with _counters_lock:
+        _counters[name] += 1
+        return _counters[name]
+
+def make_key(model: str, messages: List[Dict[str, str]], **params) -> str:
+    """Hash over the full prompt and every sampling parameter."""
+    material = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def lookup(key: str) -> Optional[str]:
+    """Returns the cached response if present and younger than the TTL."""
+    try:
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE llm_response_cache
+                SET last_used_at = now(), hits = hits + 1
+                WHERE cache_key = %s AND created_at > now() - make_interval(secs => %s)
+                RETURNING response_text
+                """,
+                (key, LLM_CACHE_TTL_SECONDS)
+            )
+            row = cur.fetchone()
+            conn.commit()
+    except Exception as e:
+        _count("errors")
+        print(f"LLM cache lookup failed: {e}", flush=True)
+        return None
+
+    _count("hits" if row else "misses")
+    return row[0] if row else None
+
+def store(key: str, model: str, response_text: str) -> None:
+    try:
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO llm_response_cache (cache_key, model_name, response_text)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE
+                SET response_text = EXCLUDED.response_text, created_at = now(), last_used_at = now()
+                """,
+                (key, model, response_text)
+            )
+            conn.commit()
+            if _count("stores") % max(LLM_CACHE_PRUNE_EVERY, 1) == 0:
+                prune(conn)
+    except Exception as e:
+        _count("errors")
+        print(f"LLM cache store failed: {e}", flush=True)
+
+def prune(conn) -> int:
+    """Drops expired entries, then the least recently used ones beyond the entry limit."""
+    cur = conn.cursor()
+    cur.execute(
+        "DELETE FROM llm_response_cache WHERE created_at <= now() - make_interval(secs => %s)",
+        (LLM_CACHE_TTL_SECONDS,)
+    )
+    expired = cur.rowcount
+    cur.execute(
+        """
+        DELETE FROM llm_response_cache WHERE cache_key IN (
+            SELECT cache_key FROM llm_response_cache
+            ORDER BY last_used_at DESC
+            OFFSET %s
+        )
+        """,
+        (LLM_CACHE_MAX_ENTRIES,)
+    )
+    evicted = cur.rowcount
+    conn.commit()
+    return expired + evicted
+
+def record_bypass() -> None:
+    _count("bypassed")
+
+def get_cache_stats() -> Dict[str, Any]:
+    with _counters_lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        "enabled": LLM_CACHE_ENABLED,
+        "ttl_seconds": LLM_CACHE_TTL_SECONDS,
+        "max_entries": LLM_CACHE_MAX_ENTRIES,
+        "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None,
+        **counters,
+    }
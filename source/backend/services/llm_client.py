@@ -0,0 +1,488 @@
+from __future__ import annotations
+import os
+import json
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import anyio.to_thread
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from backend.services import llm_cache
+from backend.services.llm_resilience import (
+    DEFAULT_POLICY, RetryPolicy, acall_with_retry, astream_with_retry, call_with_retry, parse_retry_after, stream_with_retry
+)
+
+load_dotenv(dotenv_path="backend/.env")
+
+# Any OpenAI compatible endpoint works, e.g. a local stub server for offline benchmarks.
+LLM_BASE_URL = os.getenv("TOGETHER_BASE_URL", "https://api.together.xyz/v1")
+LLM_API_KEY = os.getenv("TOGETHER_API_KEY")
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+# Keep-alive connections kept open to the provider
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+# Requests allowed in flight at once, further callers wait for a free slot
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+# Answers and candidates are requested with `"stream": true` and read token by token
+LLM_STREAMING = os.getenv("LLM_STREAMING", "1") == "1"
+
+
+class LLMError(Exception):
+    """Raised when the provider returns an error or cannot be reached."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+_STREAM_DONE = object()
+
+
+def _stream_delta(line: str):
+    """Content delta of one server-sent event line: None for other lines, _STREAM_DONE at the end."""
+    if not line or not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return _STREAM_DONE
+    choices = json.loads(data).get("choices") or []
+    return (choices[0].get("delta") or {}).get("content") if choices else None
+
+
+class LLMClient:
+    """
+    Process-wide client for OpenAI compatible chat completion endpoints.
+    One pooled `requests.Session` is shared by all threads; async callers use
+    an `httpx.AsyncClient` that is created on first use inside the event loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str = LLM_BASE_URL,
+        api_key: Optional[str] = LLM_API_KEY,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        read_timeout: float = LLM_READ_TIMEOUT,
+        pool_size: int = LLM_POOL_SIZE,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_in_flight = max_in_flight
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._headers = dict(self.session.headers)
+        self._pool_size = pool_size
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._total_requests = 0
+        self._early_stops = 0
+
+    def _payload(self, model: str, messages: List[Dict[str, str]], **params) -> Dict[str, Any]:
+        payload = {"model": model, "messages": messages}
+        payload.update({k: v for k, v in params.items() if v is not None})
+        return payload
+
+    def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+    ) -> str:
+        """Sends one chat completion request and returns the message content."""
+        payload = self._payload(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+
+        with self._slots:
+            with self._stats_lock:
+                self._in_flight += 1
+                self._total_requests += 1
+            try:
+                resp = self.session.post(f"{self.base_url}/chat/completions", json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise LLMError(f"LLM request failed: {e}") from e
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+
+        return self._parse_response(resp)
+
+    def stream_chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Streams the content deltas of one chat completion. Closing the generator
+        early closes the connection, so the provider stops generating.
+        """
+        payload = self._payload(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+        payload["stream"] = True
+
+        with self._slots:
+            with self._stats_lock:
+                self._in_flight += 1
+                self._total_requests += 1
+            resp = None
+            try:
+                resp = self.session.post(f"{self.base_url}/chat/completions", json=payload, timeout=self.timeout, stream=True)
+                if resp.status_code >= 400:
+                    self._parse_response(resp)
+
+                for line in resp.iter_lines(decode_unicode=True):
+                    delta = _stream_delta(line)
+                    if delta is _STREAM_DONE:
+                        break
+                    if delta:
+                        yield delta
+            except requests.RequestException as e:
+                raise LLMError(f"LLM request failed: {e}") from e
+            finally:
+                if resp is not None:
+                    resp.close()
+                with self._stats_lock:
+                    self._in_flight -= 1
+
+    def _parse_response(self, resp) -> str:
+        """Works for both `requests` and `httpx` responses."""
+        if resp.status_code >= 400:
+            raise LLMError(
+                f"LLM provider returned {resp.status_code}: {resp.text[:200]}",
+                status_code=resp.status_code,
+                retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+            )
+
+        data = resp.json()
+        return (data["choices"][0]["message"].get("content") or "").strip()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                limits=httpx.Limits(max_connections=self._pool_size, max_keepalive_connections=self._pool_size),
+            )
+            self._async_slots = asyncio.Semaphore(self.max_in_flight)
+        return self._async_client
+
+    async def achat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+    ) -> str:
+        """Async variant of `chat`. Waiting for a free slot or the provider does not block a thread."""
+        payload = self._payload(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+        client = self._get_async_client()
+
+        async with self._async_slots:
+            with self._stats_lock:
+                self._in_flight += 1
+                self._total_requests += 1
+            try:
+                resp = await client.post("/chat/completions", json=payload)
+            except httpx.HTTPError as e:
+                raise LLMError(f"LLM request failed: {e!r}") from e
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+
+        return self._parse_response(resp)
+
+    async def astream_chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Streams the content deltas of one chat completion (`"stream": true`, server-sent events)."""
+        payload = self._payload(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+        payload["stream"] = True
+        client = self._get_async_client()
+
+        async with self._async_slots:
+            with self._stats_lock:
+                self._in_flight += 1
+                self._total_requests += 1
+            try:
+                async with client.stream("POST", "/chat/completions", json=payload) as resp:
+                    if resp.status_code >= 400:
+                        await resp.aread()
+                        self._parse_response(resp)
+
+                    async for line in resp.aiter_lines():
+                        delta = _stream_delta(line)
+                        if delta is _STREAM_DONE:
+                            break
+                        if delta:
+                            yield delta
+            except httpx.HTTPError as e:
+                raise LLMError(f"LLM request failed: {e!r}") from e
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+
+    def record_early_stop(self) -> None:
+        """Counts a streamed response that was cut off because the caller had enough."""
+        with self._stats_lock:
+            self._early_stops += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "base_url": self.base_url,
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "total_requests": self._total_requests,
+                "early_stops": self._early_stops,
+                "connect_timeout": self.timeout[0],
+                "read_timeout": self.timeout[1],
+            }
+
+    def close(self) -> None:
+        self.session.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
+
+def set_client(client: Optional[LLMClient]) -> None:
+    """Replaces the process-wide client, e.g. with one pointing at a stub server."""
+    global _client
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None and old is not client:
+        old.close()
+
+def close_client() -> None:
+    set_client(None)
+
+async def aclose_client() -> None:
+    """Closes the shared client including its async connections (app shutdown)."""
+    global _client
+    with _client_lock:
+        old, _client = _client, None
+    if old is not None:
+        await old.aclose()
+
+def _cache_key(model, messages, temperature, max_tokens, top_p) -> Optional[str]:
+    if not llm_cache.LLM_CACHE_ENABLED:
+        return None
+    return llm_cache.make_key(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+
+def cached_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    produce: Callable[[], str],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    top_p: Optional[float] = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Answers the request from the response cache, or with `produce()` whose
+    result is then stored. Completions that are not sent through this client
+    (HintEval's hint generators) use it to share the cache entry of the same
+    request with chat_completion and the streaming calls.
+    """
+    cache_key = _cache_key(model, messages, temperature, max_tokens, top_p)
+    if cache_key:
+        if use_cache:
+            cached = llm_cache.lookup(cache_key)
+            if cached is not None:
+                return cached
+        else:
+            llm_cache.record_bypass()
+
+    text = produce()
+
+    if cache_key and text:
+        llm_cache.store(cache_key, model, text)
+    return text
+
+def chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    top_p: Optional[float] = None,
+    policy: RetryPolicy = DEFAULT_POLICY,
+    use_cache: bool = True,
+) -> str:
+    """
+    Chat completion with backoff retries behind the model's circuit breaker.
+    With LLM_CACHE_ENABLED, identical requests are answered from the response cache;
+    `use_cache=False` skips the lookup but still refreshes the stored response.
+    """
+    return cached_completion(
+        model,
+        messages,
+        lambda: call_with_retry(
+            model,
+            lambda: get_client().chat(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p),
+            policy=policy,
+        ),
+        temperature=temperature, max_tokens=max_tokens, top_p=top_p, use_cache=use_cache,
+    )
+
+async def achat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    top_p: Optional[float] = None,
+    policy: RetryPolicy = DEFAULT_POLICY,
+    use_cache: bool = True,
+) -> str:
+    """Async variant of chat_completion for request handlers; cache reads and writes run on a worker thread."""
+    cache_key = _cache_key(model, messages, temperature, max_tokens, top_p)
+    if cache_key:
+        if use_cache:
+            cached = await anyio.to_thread.run_sync(llm_cache.lookup, cache_key)
+            if cached is not None:
+                return cached
+        else:
+            llm_cache.record_bypass()
+
+    text = await acall_with_retry(
+        model,
+        lambda: get_client().achat(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p),
+        policy=policy,
+    )
+
+    if cache_key and text:
+        await anyio.to_thread.run_sync(llm_cache.store, cache_key, model, text)
+    return text
+
+def stream_chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    top_p: Optional[float] = None,
+    policy: RetryPolicy = DEFAULT_POLICY,
+    use_cache: bool = True,
+    stop_when: Optional[Callable[[str], bool]] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of chat_completion, yields the content as it arrives.
+    Once `stop_when(text_so_far)` is true the request is cut off, which saves
+    the tokens the model would still have generated. Only completed responses
+    go to the response cache: the key is shared with chat_completion, which
+    must not get a cut off text back. A cache hit is yielded at once.
+    """
+    cache_key = _cache_key(model, messages, temperature, max_tokens, top_p)
+    if cache_key:
+        if use_cache:
+            cached = llm_cache.lookup(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        else:
+            llm_cache.record_bypass()
+
+    parts: List[str] = []
+    stopped = False
+    stream = stream_with_retry(
+        model,
+        lambda: get_client().stream_chat(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p),
+        policy=policy,
+    )
+    try:
+        for delta in stream:
+            parts.append(delta)
+            yield delta
+            if stop_when and stop_when("".join(parts)):
+                get_client().record_early_stop()
+                stopped = True
+                break
+    finally:
+        stream.close()
+
+    text = "".join(parts).strip()
+    if cache_key and text and not stopped:
+        llm_cache.store(cache_key, model, text)
+
+async def astream_chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    top_p: Optional[float] = None,
+    policy: RetryPolicy = DEFAULT_POLICY,
+    use_cache: bool = True,
+    stop_when: Optional[Callable[[str], bool]] = None,
+) -> AsyncIterator[str]:
+    """
+    Async variant of stream_chat_completion, cut off responses are not cached
+    either. Cache reads and writes run on a worker thread.
+    """
+    cache_key = _cache_key(model, messages, temperature, max_tokens, top_p)
+    if cache_key:
+        if use_cache:
+            cached = await anyio.to_thread.run_sync(llm_cache.lookup, cache_key)
+            if cached is not None:
+                yield cached
+                return
+        else:
+            llm_cache.record_bypass()
+
+    parts: List[str] = []
+    stopped = False
+    stream = astream_with_retry(
+        model,
+        lambda: get_client().astream_chat(model, messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p),
+        policy=policy,
+    )
+    try:
+        async for delta in stream:
+            parts.append(delta)
+            yield delta
+            if stop_when and stop_when("".join(parts)):
+                get_client().record_early_stop()
+                stopped = True
+                break
+    finally:
+        await stream.aclose()
+
+    text = "".join(parts).strip()
+    if cache_key and text and not stopped:
+        await anyio.to_thread.run_sync(llm_cache.store, cache_key, model, text)
@@ -0,0 +1,338 @@
+from __future__ import annotations
+import os
+import time
+import asyncio
+import random
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+import httpx
+import requests
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Connection failures and timeouts, the only errors without a status that are retried
+TRANSPORT_ERRORS: Tuple[type, ...] = (
+    ConnectionError,
+    TimeoutError,
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    httpx.TransportError,
+)
+if openai is not None:
+    # APITimeoutError is a subclass
+    TRANSPORT_ERRORS += (openai.APIConnectionError,)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a total time budget."""
+    max_attempts: int = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "4"))
+    base_delay: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    max_delay: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    # Total seconds a caller may spend retrying before giving up
+    max_elapsed: float = float(os.getenv("LLM_RETRY_MAX_ELAPSED", "30"))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while the model's breaker is open."""
+
+    def __init__(self, model: str, retry_in: float):
+        super().__init__(f"LLM circuit for '{model}' is open, retry in {retry_in:.0f}s")
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-model breaker: opens after `failure_threshold` consecutive failures,
+    lets a single trial request through after `reset_timeout` seconds (half open)
+    and closes again once that trial succeeds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            elapsed = time.monotonic() - (self.opened_at or 0)
+            if self.state == "open" and elapsed >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.total_rejected += 1
+            raise CircuitOpenError(self.name, max(self.reset_timeout - elapsed, 0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Ends a call that says nothing about provider health (e.g. a 400)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == "open" and self.opened_at is not None:
+                retry_in = round(max(self.reset_timeout - (time.monotonic() - self.opened_at), 0), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": retry_in,
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+            }
+
+
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    breaker = _breakers.get(model)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(model, CircuitBreaker(model, BREAKER_FAILURES, BREAKER_RESET_SECONDS))
+    return breaker
+
+def get_breaker_states() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+# =====================================================================================
+# Error Classification
+# =====================================================================================
+
+def _status_of(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def retry_after_of(exc: Exception) -> Optional[float]:
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return retry_after
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    return parse_retry_after(headers.get("retry-after")) if headers is not None else None
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Statuses in RETRYABLE_STATUS (429, 5xx, ...) and transport errors, also when
+    wrapped (LLMError ... from e), are retried. Everything else is not: other
+    4xx, and errors that say nothing about the provider, such as a HintEval
+    generator failing to parse a model's output.
+    """
+    status = _status_of(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    while exc is not None:
+        if isinstance(exc, TRANSPORT_ERRORS):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+# =====================================================================================
+# Retry Loop
+# =====================================================================================
+
+def _after_failure(breaker: CircuitBreaker, exc: Exception, attempt: int, policy: RetryPolicy, deadline: float, label: str) -> float:
+    """
+    Records a failed attempt and returns the backoff delay. Errors that are not
+    retryable are re-raised without counting against the breaker.
+    """
+    if not is_retryable(exc):
+        breaker.release()
+        raise exc
+    breaker.record_failure()
+
+    delay = policy.backoff(attempt, retry_after_of(exc))
+    last_attempt = attempt + 1 >= policy.max_attempts
+    if last_attempt or time.monotonic() + delay > deadline:
+        print(f"{label} call for '{breaker.name}' failed after {attempt+1} attempt(s): {exc}", flush=True)
+        raise exc
+    print(f"{label} call for '{breaker.name}' failed (attempt {attempt+1}), retrying in {delay:.2f}s: {exc}", flush=True)
+    return delay
+
+def _end_started_stream(breaker: CircuitBreaker, exc: Exception) -> None:
+    """A stream that already passed items on failed, it is never retried."""
+    if is_retryable(exc):
+        breaker.record_failure()
+    else:
+        breaker.release()
+
+def call_with_retry(model: str, fn: Callable[[], T], policy: RetryPolicy = DEFAULT_POLICY, label: str = "LLM") -> T:
+    """
+    Calls `fn` through the model's circuit breaker, retrying retryable errors
+    with exponential backoff. Raises CircuitOpenError without calling `fn`
+    while the breaker is open, and the last error once retries are exhausted.
+    """
+    breaker = get_breaker(model)
+    deadline = time.monotonic() + policy.max_elapsed
+
+    for attempt in range(policy.max_attempts):
+        breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            time.sleep(_after_failure(breaker, e, attempt, policy, deadline, label))
+            continue
+
+        breaker.record_success()
+        return result
+
+    raise RuntimeError("unreachable")
+
+async def acall_with_retry(
+    model: str, fn: Callable[[], Awaitable[T]], policy: RetryPolicy = DEFAULT_POLICY, label: str = "LLM"
+) -> T:
+    """Async variant of call_with_retry, backoff waits do not block the event loop."""
+    breaker = get_breaker(model)
+    deadline = time.monotonic() + policy.max_elapsed
+
+    for attempt in range(policy.max_attempts):
+        breaker.before_call()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            await asyncio.sleep(_after_failure(breaker, e, attempt, policy, deadline, label))
+            continue
+
+        breaker.record_success()
+        return result
+
+    raise RuntimeError("unreachable")
+
+def stream_with_retry(
+    model: str, open_stream: Callable[[], Iterator[T]], policy: RetryPolicy = DEFAULT_POLICY, label: str = "LLM"
+) -> Iterator[T]:
+    """
+    Streaming variant of call_with_retry. A stream that fails before yielding
+    anything is reopened with backoff; once items were passed on, the error
+    is recorded on the breaker and propagated, the caller cannot rewind.
+    """
+    breaker = get_breaker(model)
+    deadline = time.monotonic() + policy.max_elapsed
+
+    for attempt in range(policy.max_attempts):
+        breaker.before_call()
+        started = False
+        try:
+            for item in open_stream():
+                started = True
+                yield item
+        except GeneratorExit:
+            # Closed by the consumer: tokens arriving means the provider is healthy
+            if started:
+                breaker.record_success()
+            else:
+                breaker.release()
+            raise
+        except Exception as e:
+            if started:
+                _end_started_stream(breaker, e)
+                raise
+            time.sleep(_after_failure(breaker, e, attempt, policy, deadline, label))
+            continue
+
+        breaker.record_success()
+        return
+
+async def astream_with_retry(
+    model: str, open_stream: Callable[[], AsyncIterator[T]], policy: RetryPolicy = DEFAULT_POLICY, label: str = "LLM"
+) -> AsyncIterator[T]:
+    """Async variant of stream_with_retry."""
+    breaker = get_breaker(model)
+    deadline = time.monotonic() + policy.max_elapsed
+
+    for attempt in range(policy.max_attempts):
+        breaker.before_call()
+        started = False
+        try:
+            async for item in open_stream():
+                started = True
+                yield item
+        except (asyncio.CancelledError, GeneratorExit):
+            if started:
+                breaker.record_success()
+            else:
+                breaker.release()
+            raise
+        except Exception as e:
+            if started:
+                _end_started_stream(breaker, e)
+                raise
+            await asyncio.sleep(_after_failure(breaker, e, attempt, policy, deadline, label))
+            continue
+
+        breaker.record_success()
+        return
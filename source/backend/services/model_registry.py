@@ -0,0 +1,173 @@
+from __future__ import annotations
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from backend.services.embedding_service import configure_torch
+
+load_dotenv(dotenv_path="backend/.env")
+
+TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
+
+# Comma separated list of models to build during startup, e.g. "rouge,readability".
+# "all" pre-warms every registered model, an empty value keeps everything lazy.
+PREWARM_MODELS = os.getenv("HINTEVAL_PREWARM_MODELS", "")
+
+# SBERT model of the hint similarity matrix; also part of the embedding cache key.
+HINT_SIMILARITY_MODEL = "all-MiniLM-L6-v2"
+
+
+# =====================================================================================
+# Model Factories
+# =====================================================================================
+# HintEval imports are kept inside the factories so that importing this module
+# (and every service that depends on it) does not pull torch/spaCy into the worker.
+
+def _build_contextual():
+    # Same evaluator as HintEval's ContextualEmbeddings, on the shared embedding runtime
+    from backend.services.contextual_embeddings import SharedContextualEmbeddings
+    return SharedContextualEmbeddings(sbert_model='all-mpnet-base-v2', enable_tqdm=False)
+
+def _build_llm():
+    from hinteval.evaluation.convergence import LlmBased
+    return LlmBased(model_name="llama-3-70b", together_ai_api_key=TOGETHER_API_KEY)
+
+def _build_wikipedia():
+    from hinteval.evaluation.familiarity import Wikipedia
+    return Wikipedia()
+
+def _build_rouge():
+    from hinteval.evaluation.relevance import Rouge
+    return Rouge("rougeL")
+
+def _build_readability():
+    from hinteval.evaluation.readability import MachineLearningBased
+    return MachineLearningBased("random_forest")
+
+def _build_hint_similarity():
+    from backend.services.embedding_service import get_encoder
+    return get_encoder(HINT_SIMILARITY_MODEL)
+
+
+_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "contextual": _build_contextual,        # Answer Leakage Evaluator
+    "llm": _build_llm,                      # Convergence Evaluator
+    "wikipedia": _build_wikipedia,          # Familiarity Evaluator
+    "rouge": _build_rouge,                  # Relevance Evaluator
+    "readability": _build_readability,      # Readability Evaluator
+    "hint_similarity": _build_hint_similarity,  # SBERT for the metrics page
+}
+
+_models: Dict[str, Any] = {}
+_stats: Dict[str, Dict[str, Any]] = {}
+_locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in _FACTORIES}
+
+
+# =====================================================================================
+# Helpers
+# =====================================================================================
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (peak RSS if psutil is missing)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if resource is not None:
+        # ru_maxrss is reported in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return None
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# =====================================================================================
+# Public API
+# =====================================================================================
+
+def registered_models() -> List[str]:
+    return list(_FACTORIES.keys())
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+def get_model(name: str) -> Any:
+    """
+    Returns the model registered under `name`, building it on first use.
+    Concurrent callers for the same model wait for a single build.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _FACTORIES:
+        raise KeyError(f"Unknown model '{name}'. Registered: {registered_models()}")
+
+    with _locks[name]:
+        model = _models.get(name)
+        if model is not None:
+            return model
+
+        print(f"Loading model '{name}'...", flush=True)
+        configure_torch()
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = _FACTORIES[name]()
+        except Exception as e:
+            _stats[name] = {"status": "error", "error": str(e), "loaded_at": _now()}
+            raise
+        load_seconds = time.perf_counter() - started
+        rss_after = _rss_bytes()
+
+        _models[name] = model
+        _stats[name] = {
+            "status": "loaded",
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            "rss_after_bytes": rss_after,
+            "loaded_at": _now(),
+        }
+        print(f"Model '{name}' loaded in {load_seconds:.2f}s.", flush=True)
+        return model
+
+def parse_model_list(value: Optional[str]) -> List[str]:
+    """Parses a HINTEVAL_PREWARM_MODELS style value into registered model names."""
+    if not value:
+        return []
+    names = [n.strip() for n in value.split(",") if n.strip()]
+    if "all" in names:
+        return registered_models()
+    return [n for n in names if n in _FACTORIES]
+
+def warmup(names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Builds the given models (defaults to HINTEVAL_PREWARM_MODELS).
+    Failures are reported in the stats instead of aborting startup.
+    """
+    names = parse_model_list(PREWARM_MODELS) if names is None else list(names)
+    for name in names:
+        try:
+            get_model(name)
+        except Exception as e:
+            print(f"❌ Failed to pre-warm model '{name}': {e}", flush=True)
+    return get_model_stats()
+
+def get_model_stats() -> Dict[str, Any]:
+    """Per-model load status, load time and resident memory."""
+    out = {}
+    for name in _FACTORIES:
+        out[name] = dict(_stats.get(name, {"status": "not_loaded"}))
+    return {"process_rss_bytes": _rss_bytes(), "models": out}
@@ -1,10 +1,6 @@
 import json
-from datetime import datetime
 from typing import Dict, Any, Optional
 
-def _now() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
 def get_latest_question_id(conn, session_id: str) -> Optional[int]:
     cur = conn.cursor()
     cur.execute(
@@ -23,7 +19,7 @@ def get_question_and_answer(conn, session_id: str) -> Dict[str, Any]:
     cur.execute("SELECT text FROM questions WHERE id = %s", (qid,))
     q_text = cur.fetchone()[0]
 
-    cur.execute("SELECT answer_text FROM answers WHERE question_id = %s ORDER BY created_at DESC LIMIT 1", (qid,))
+    cur.execute("SELECT answer_text FROM answers WHERE question_id = %s ORDER BY created_at DESC, id DESC LIMIT 1", (qid,))
     ans_row = cur.fetchone()
     
     return {"question": q_text, "answer": ans_row[0] if ans_row else None}
@@ -37,11 +33,21 @@ def update_existing_answer(conn, question_id: int, new_text: str):
     cursor = conn.cursor()
     query = """
         UPDATE answers 
-        SET answer_text = %s, updated_at = %s 
+        SET answer_text = %s, updated_at = now() 
         WHERE question_id = %s
     """
-    cursor.execute(query, (new_text, _now(), question_id))
+    cursor.execute(query, (new_text, question_id))
+    conn.commit()
+
+def update_session_answer(conn, session_id: str, new_text: str) -> bool:
+    """Replaces the answer of the session's latest question and drops its now stale metrics."""
+    qid = get_latest_question_id(conn, session_id)
+    if not qid:
+        return False
+    update_existing_answer(conn, qid, new_text)
+    clear_metrics_for_question(conn, qid)
     conn.commit()
+    return True
 
 
 def clear_metrics_for_question(conn, question_id: int) -> None:
@@ -61,8 +67,10 @@ def clear_metrics_for_question(conn, question_id: int) -> None:
     conn.commit()
 
 def get_full_session_state(conn, session_id: str) -> Dict[str, Any]:
-    qid = get_latest_question_id(conn, session_id)
-    
+    """
+    Loads the latest question of the session with answer, hints, metrics, entities
+    and candidates in three queries, independent of the number of hints.
+    """
     empty_state = {
         "question": None, "answer": None, "hints": [], "metrics": [],
         "scores_convergence": [], "entities_per_hint": [],
@@ -70,19 +78,45 @@ def get_full_session_state(conn, session_id: str) -> Dict[str, Any]:
         "hint2hint_similarity": [],
     }
 
-    if not qid:
-        return empty_state
-
     cur = conn.cursor()
-    
-    cur.execute("SELECT text FROM questions WHERE id = %s", (qid,))
-    q_text = cur.fetchone()[0]
-    
-    cur.execute("SELECT answer_text FROM answers WHERE question_id = %s ORDER BY created_at DESC LIMIT 1", (qid,))
-    ans_row = cur.fetchone()
-    a_text = ans_row[0] if ans_row else None
 
-    cur.execute("SELECT id, hint_text FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
+    # Latest question with its latest answer
+    cur.execute("""
+        SELECT q.id, q.text, a.answer_text
+        FROM questions q
+        LEFT JOIN LATERAL (
+            SELECT answer_text FROM answers
+            WHERE question_id = q.id
+            ORDER BY created_at DESC, id DESC LIMIT 1
+        ) a ON TRUE
+        WHERE q.session_id = %s
+        ORDER BY q.created_at DESC, q.id DESC
+        LIMIT 1
+    """, (session_id,))
+    q_row = cur.fetchone()
+
+    if not q_row:
+        return empty_state
+
+    qid, q_text, a_text = q_row
+
+    # Hints with their metrics and entities aggregated per hint
+    cur.execute("""
+        SELECT
+            h.id,
+            h.hint_text,
+            COALESCE((
+                SELECT json_agg(json_build_array(m.name, m.value, m.metadata_json) ORDER BY m.id)
+                FROM metrics m WHERE m.hint_id = h.id
+            ), '[]'::json),
+            COALESCE((
+                SELECT json_agg(json_build_array(e.entity, e.ent_type, e.start_index, e.end_index, e.metadata_json) ORDER BY e.id)
+                FROM entities e WHERE e.hint_id = h.id
+            ), '[]'::json)
+        FROM hints h
+        WHERE h.question_id = %s
+        ORDER BY h.id ASC
+    """, (qid,))
     hint_rows = cur.fetchall()
     hints_payload = [{"id": h[0], "text": h[1]} for h in hint_rows]
 
@@ -90,10 +124,7 @@ def get_full_session_state(conn, session_id: str) -> Dict[str, Any]:
     entities_per_hint = []
     scores_convergence = []
 
-    # Fetch Metrics & Entities
-    for (hid, _) in hint_rows:
-        cur.execute("SELECT name, value, metadata_json FROM metrics WHERE hint_id = %s", (hid,))
-        m_rows = cur.fetchall()
+    for (_, _, m_rows, e_rows) in hint_rows:
         m_list = []
         conv_scores = {}
         for name, val, meta_json in m_rows:
@@ -105,8 +136,6 @@ def get_full_session_state(conn, session_id: str) -> Dict[str, Any]:
         metrics_per_hint.append(m_list)
         scores_convergence.append(conv_scores)
 
-        cur.execute("SELECT entity, ent_type, start_index, end_index, metadata_json FROM entities WHERE hint_id = %s", (hid,))
-        e_rows = cur.fetchall()
         e_list = []
         for ent, etype, s, e, meta_json in e_rows:
             meta = json.loads(meta_json) if meta_json else {}
@@ -2,31 +2,31 @@ import os
 import io
 import csv
 import json
+import zlib
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import psycopg2
 from psycopg2.extras import Json
 
-logger = logging.getLogger(__name__)
-
 try:
-    from .generation_service import generate_only_answer
+    import ijson
 except ImportError:
-    def generate_only_answer(conn, q, m, question_id): 
-        return "Generated Answer Placeholder"
+    ijson = None
 
+from backend.database.bulk import copy_rows
+from backend.database.connection import pooled_connection, streaming_connection
 
-# --- Helpers ---
+logger = logging.getLogger(__name__)
 
-def _now() -> str:
-    return datetime.now().isoformat()
+# --- Helpers ---
 
 def _get_last_question_id(conn, session_id: str) -> Optional[int]:
     with conn.cursor() as cur:
         cur.execute(
-            "SELECT id FROM questions WHERE session_id = %s ORDER BY created_at DESC LIMIT 1", 
+            "SELECT id FROM questions WHERE session_id = %s ORDER BY created_at DESC, id DESC LIMIT 1", 
             (session_id,)
         )
         row = cur.fetchone()
@@ -35,9 +35,10 @@ def _get_last_question_id(conn, session_id: str) -> Optional[int]:
 
 # --- Session Management ---
 
-def clear_session_data(conn, session_id: str) -> Dict[str, Any]:
+def clear_session_data(conn, session_id: str, commit: bool = True) -> Dict[str, Any]:
     """
     Deletes all data for a session using CASCADE delete on the Question table.
+    With commit=False the deletion stays part of the caller's transaction.
     """
     cur = conn.cursor()
     try:
@@ -60,7 +61,8 @@ def clear_session_data(conn, session_id: str) -> Dict[str, Any]:
         logger.info(f"Clearing session {session_id}: {stats}")
         
         cur.execute("DELETE FROM questions WHERE session_id = %s", (session_id,))
-        conn.commit()
+        if commit:
+            conn.commit()
         
         return {
             "cleared": True,
@@ -78,86 +80,25 @@ def clear_session_data(conn, session_id: str) -> Dict[str, Any]:
 
 # --- Export Logic ---
 
-def export_session_json(conn, session_id: str, full_export: bool = True) -> Dict[str, Any]:
+def export_session_json(conn, session_id: str, full_export: bool = True, all_questions: bool = False) -> Dict[str, Any]:
     """
-    Exports session state. 
+    Exports session state, the latest question or with `all_questions` every
+    question of the session (one instance each, read with three queries).
     full_export=True includes Metrics, Entities, and Candidates.
     """
-    qid = _get_last_question_id(conn, session_id)
-    base_response = {
+    where, params = _session_scope(session_id, all_questions)
+    instances = {}
+    for question, hints, candidates in _iter_export_instances(conn, where, params, full_export):
+        instance = _instance_head(question, full_export)
+        instance["hints"] = list(hints)
+        instance.update(_candidate_fields(list(candidates)))
+        instances[str(question["id"])] = instance
+
+    return {
         "name": f"session_{session_id}",
-        "subsets": {"export": {"instances": {}}}
+        "subsets": {"export": {"instances": instances}}
     }
 
-    if not qid:
-        return base_response
-
-    with conn.cursor() as cur:
-        # Fetch Core Data
-        cur.execute("SELECT text FROM questions WHERE id = %s", (qid,))
-        q_text = (cur.fetchone() or [""])[0]
-
-        cur.execute("SELECT answer_text, model_name FROM answers WHERE question_id = %s LIMIT 1", (qid,))
-        a_row = cur.fetchone()
-        a_text = a_row[0] if a_row else ""
-        model_name = a_row[1] if a_row and len(a_row) > 1 else None
-        
-        # Fetch Hints
-        cur.execute("SELECT id, hint_text FROM hints WHERE question_id = %s ORDER BY id ASC", (qid,))
-        hint_rows = cur.fetchall()
-
-        # Build Instance Object
-        instance_data = {
-            "question": {"question": q_text},
-            "answers": [{"answer": a_text}] if a_text else [],
-            "hints": []
-        }
-        if full_export and model_name:
-            instance_data["model_name"] = model_name
-
-        # Hints
-        for db_hint_id, hint_text in hint_rows:
-            hint_obj = {"hint": hint_text, "db_id": db_hint_id}
-            
-            if full_export:
-                # Metrics
-                cur.execute("SELECT name, value, metadata_json FROM metrics WHERE hint_id = %s ORDER BY id", (db_hint_id,))
-                metrics = []
-                for name, val, meta in cur.fetchall():
-                    m = {"name": name, "value": val}
-                    if meta: m["metadata"] = json.loads(meta)
-                    else: m["metadata"] = {}
-                    metrics.append(m)
-                if metrics: hint_obj["metrics"] = metrics
-
-                # Entities
-                cur.execute("SELECT entity, ent_type, start_index, end_index, metadata_json FROM entities WHERE hint_id = %s ORDER BY id", (db_hint_id,))
-                entities = []
-                for txt, typ, start, end, meta in cur.fetchall():
-                    e = {"text": txt, "type": typ, "start": start, "end": end}
-                    if meta: e["metadata"] = json.loads(meta)
-                    entities.append(e)
-                if entities: hint_obj["entities"] = entities
-            
-            instance_data["hints"].append(hint_obj)
-
-        # Fetch Candidates
-        if full_export:
-            cur.execute("SELECT candidate_text, is_eliminated, created_at, updated_at, is_groundtruth FROM candidate_answers WHERE question_id = %s ORDER BY id", (qid,))
-            cands = []
-            for txt, elim, cr, up, is_gt in cur.fetchall():
-                c = {"text": txt, "is_eliminated": bool(elim), "created_at": cr}
-                if up: c["updated_at"] = up
-                if is_gt is not None: c["is_groundtruth"] = bool(is_gt)
-                cands.append(c)
-            
-            if cands:
-                instance_data["candidates_full"] = cands
-                instance_data["candidates"] = [c["text"] for c in cands]
-
-        base_response["subsets"]["export"]["instances"][str(qid)] = instance_data
-        return base_response
-
 
 def export_session_csv_stream(conn, session_id: str):
     """Generates a simple CSV stream (type, content) for the session."""
@@ -186,20 +127,359 @@ def export_session_csv_stream(conn, session_id: str):
     return output
 
 
+# --- Streaming Export ---
+
+# Rows a server-side cursor fetches per round trip while streaming an export
+EXPORT_FETCH_ROWS = int(os.getenv("HINTEVAL_EXPORT_FETCH_ROWS", "1000"))
+# Size of the pieces handed to the response (before compression)
+EXPORT_CHUNK_BYTES = int(os.getenv("HINTEVAL_EXPORT_CHUNK_BYTES", str(64 * 1024)))
+
+EXPORT_FORMATS = ("json", "full_json", "csv", "full_csv", "ndjson")
+EXPORT_MEDIA_TYPES = {"json": "application/json", "csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+_CSV_FULL_COLUMNS = ["type", "content", "question_id", "db_id", "details"]
+
+
+class _RowStream:
+    """Rows of a server-side cursor ordered by (session, question id), read one question at a time."""
+
+    def __init__(self, rows: Iterator[tuple]):
+        self._rows = rows
+        self._next = next(rows, None)
+
+    def close(self) -> None:
+        self._rows.close()
+
+    def take(self, key: Tuple[str, int]) -> Iterator[tuple]:
+        # Skips what a caller left unread of earlier questions
+        while self._next is not None and self._next[:2] < key:
+            self._next = next(self._rows, None)
+        while self._next is not None and self._next[:2] == key:
+            row, self._next = self._next, next(self._rows, None)
+            yield row
+
+
+def _server_rows(conn, name: str, sql: str, params: tuple) -> Iterator[tuple]:
+    """Streams the rows of `sql` from a named cursor, EXPORT_FETCH_ROWS at a time."""
+    cur = conn.cursor(name=name)
+    try:
+        cur.itersize = EXPORT_FETCH_ROWS
+        cur.execute(sql, params)
+        for row in cur:
+            yield row
+    finally:
+        # A failed or rolled back transaction has dropped the cursor already
+        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+            cur.close()
+
+
+def _no_rows() -> Iterator[tuple]:
+    yield from ()
+
+
+def _parse_meta(meta: Optional[str]) -> Any:
+    return json.loads(meta) if meta else None
+
+
+def _session_scope(session_id: str, all_questions: bool = False) -> Tuple[str, tuple]:
+    """Condition on `questions q` selecting the latest question of a session, or all of them."""
+    if all_questions:
+        return "q.session_id = %s", (session_id,)
+    return (
+        "q.id = (SELECT id FROM questions WHERE session_id = %s ORDER BY created_at DESC, id DESC LIMIT 1)",
+        (session_id,)
+    )
+
+
+def _sessions_scope(session_ids: Optional[List[str]]) -> Tuple[str, tuple]:
+    """Condition on `questions q` selecting every question of the given sessions (None: all sessions)."""
+    if session_ids is None:
+        return "TRUE", ()
+    return "q.session_id = ANY(%s)", (list(session_ids),)
+
+
+# Sessions sort bytewise so that Python compares the keys the way the queries ordered them
+_EXPORT_ORDER = """COALESCE(q.session_id, '') COLLATE "C" """
+
+
+def _iter_export_instances(conn, where: str, params: tuple, full_export: bool) -> Iterator[Tuple[Dict[str, Any], Iterator[Dict[str, Any]], Iterator[Dict[str, Any]]]]:
+    """
+    Yields (question, hints, candidates) for the questions matching `where`
+    (a condition on `questions q`, see _session_scope), grouped by session and
+    in id order. Questions, hints (with their metrics and entities) and
+    candidates come from one streaming query each, whatever the number of
+    questions; `hints` and `candidates` are lazy and only valid until the
+    next question.
+    """
+    questions = _server_rows(conn, "export_questions", f"""
+        SELECT COALESCE(q.session_id, ''), q.id, q.text, a.answer_text, a.model_name
+        FROM questions q
+        LEFT JOIN LATERAL (
+            SELECT answer_text, model_name FROM answers
+            WHERE question_id = q.id ORDER BY created_at DESC, id DESC LIMIT 1
+        ) a ON TRUE
+        WHERE {where}
+        ORDER BY {_EXPORT_ORDER}, q.id
+    """, params)
+
+    if full_export:
+        hint_columns = """
+            (SELECT json_agg(json_build_object('name', m.name, 'value', m.value, 'metadata', m.metadata_json) ORDER BY m.id)
+             FROM metrics m WHERE m.hint_id = h.id),
+            (SELECT json_agg(json_build_object('text', e.entity, 'type', e.ent_type, 'start', e.start_index,
+                                               'end', e.end_index, 'metadata', e.metadata_json) ORDER BY e.id)
+             FROM entities e WHERE e.hint_id = h.id)
+        """
+    else:
+        hint_columns = "NULL, NULL"
+    hints = _RowStream(_server_rows(conn, "export_hints", f"""
+        SELECT COALESCE(q.session_id, ''), h.question_id, h.id, h.hint_text, {hint_columns}
+        FROM hints h JOIN questions q ON q.id = h.question_id
+        WHERE {where}
+        ORDER BY {_EXPORT_ORDER}, h.question_id, h.id
+    """, params))
+
+    candidates = _RowStream(_no_rows())
+    if full_export:
+        candidates = _RowStream(_server_rows(conn, "export_candidates", f"""
+            SELECT COALESCE(q.session_id, ''), c.question_id, c.candidate_text, c.is_eliminated,
+                   to_char(c.created_at, 'YYYY-MM-DD HH24:MI:SS'), to_char(c.updated_at, 'YYYY-MM-DD HH24:MI:SS'),
+                   c.is_groundtruth
+            FROM candidate_answers c JOIN questions q ON q.id = c.question_id
+            WHERE {where}
+            ORDER BY {_EXPORT_ORDER}, c.question_id, c.id
+        """, params))
+
+    def hint_objs(key: Tuple[str, int]) -> Iterator[Dict[str, Any]]:
+        for _, _, hint_id, hint_text, metrics, entities in hints.take(key):
+            hint_obj = {"hint": hint_text, "db_id": hint_id}
+            if metrics:
+                hint_obj["metrics"] = [
+                    {**m, "value": None if m["value"] is None else float(m["value"]), "metadata": _parse_meta(m["metadata"]) or {}}
+                    for m in metrics
+                ]
+            if entities:
+                hint_obj["entities"] = [
+                    {k: v for k, v in {**e, "metadata": _parse_meta(e["metadata"])}.items() if k != "metadata" or v}
+                    for e in entities
+                ]
+            yield hint_obj
+
+    def candidate_objs(key: Tuple[str, int]) -> Iterator[Dict[str, Any]]:
+        for _, _, txt, elim, cr, up, is_gt in candidates.take(key):
+            c = {"text": txt, "is_eliminated": bool(elim), "created_at": cr}
+            if up: c["updated_at"] = up
+            if is_gt is not None: c["is_groundtruth"] = bool(is_gt)
+            yield c
+
+    try:
+        for session_key, qid, q_text, a_text, model_name in questions:
+            question = {
+                "id": qid, "session_id": session_key or None,
+                "question": q_text or "", "answer": a_text or "", "model_name": model_name
+            }
+            yield question, hint_objs((session_key, qid)), candidate_objs((session_key, qid))
+    finally:
+        # Closes the cursors of an export that stopped early while the transaction is still open
+        for stream in (questions, hints, candidates):
+            stream.close()
+
+
+def _instance_head(question: Dict[str, Any], full_export: bool) -> Dict[str, Any]:
+    instance = {
+        "question": {"question": question["question"]},
+        "answers": [{"answer": question["answer"]}] if question["answer"] else [],
+    }
+    if full_export and question["model_name"]:
+        instance["model_name"] = question["model_name"]
+    return instance
+
+
+def _candidate_fields(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not candidates:
+        return {}
+    return {"candidates_full": candidates, "candidates": [c["text"] for c in candidates]}
+
+
+def _json_pieces(name: str, instances, full_export: bool, subset: Optional[str] = "export") -> Iterator[str]:
+    """
+    The export_session_json document (HintEval dataset layout), written
+    instance by instance and hint by hint. Every instance goes into `subset`,
+    or with subset=None into one subset per session.
+    """
+    yield '{"name": ' + json.dumps(name) + ', "subsets": {'
+    current, count = None, 0
+    if subset is not None:
+        current = subset
+        yield json.dumps(subset) + ': {"instances": {'
+    for question, hints, candidates in instances:
+        key = subset if subset is not None else question["session_id"] or ""
+        if key != current:
+            if current is not None:
+                yield "\n}}, "
+            current, count = key, 0
+            yield json.dumps(key) + ': {"instances": {'
+        yield ("," if count else "") + "\n" + json.dumps(str(question["id"])) + ": "
+        yield json.dumps(_instance_head(question, full_export))[:-1] + ', "hints": ['
+        for j, hint in enumerate(hints):
+            yield ("," if j else "") + "\n  " + json.dumps(hint)
+        yield "]"
+        for key_name, value in _candidate_fields(list(candidates)).items():
+            yield ", " + json.dumps(key_name) + ": " + json.dumps(value)
+        yield "}"
+        count += 1
+    yield ("\n}}" if current is not None else "") + "}}\n"
+
+
+def _ndjson_pieces(instances) -> Iterator[str]:
+    """One JSON record per line: a `question`, then its `hint` and `candidate` records."""
+    for question, hints, candidates in instances:
+        qid = question["id"]
+        yield json.dumps({"type": "question", "question_id": qid, **{k: v for k, v in question.items() if k != "id"}}) + "\n"
+        for hint in hints:
+            yield json.dumps({"type": "hint", "question_id": qid, **hint}) + "\n"
+        for cand in candidates:
+            yield json.dumps({"type": "candidate", "question_id": qid, **cand}) + "\n"
+
+
+def _csv_pieces(instances, full_export: bool) -> Iterator[str]:
+    """
+    The (type, content) CSV that the importer reads. The full variant adds the
+    question and row ids and a JSON `details` column (metrics and entities of
+    a hint, flags of a candidate).
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def line(row) -> str:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        return buf.getvalue()
+
+    yield line(_CSV_FULL_COLUMNS if full_export else ["type", "content"])
+    for question, hints, candidates in instances:
+        qid = question["id"]
+        if full_export:
+            details = {"session_id": question["session_id"], "model_name": question["model_name"]}
+            yield line(["question", question["question"], qid, qid, json.dumps(details)])
+            if question["answer"]: yield line(["answer", question["answer"], qid, "", ""])
+            for h in hints:
+                details = {k: h[k] for k in ("metrics", "entities") if k in h}
+                yield line(["hint", h["hint"], qid, h["db_id"], json.dumps(details) if details else ""])
+            for c in candidates:
+                yield line(["candidate", c["text"], qid, "", json.dumps({k: v for k, v in c.items() if k != "text"})])
+        else:
+            if question["question"]: yield line(["question", question["question"]])
+            if question["answer"]: yield line(["answer", question["answer"]])
+            for h in hints:
+                if h["hint"]: yield line(["hint", h["hint"]])
+
+
+def _chunked(pieces: Iterable[str], size: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Joins small pieces into UTF-8 chunks of about `size` bytes."""
+    parts, length = [], 0
+    for piece in pieces:
+        parts.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(parts).encode("utf-8")
+            parts, length = [], 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_filename(format: str, compress: bool = False) -> str:
+    base = "hinteval_backup_full" if format.startswith("full_") else "hinteval_session"
+    ext = format.replace("full_", "")
+    return f"{base}.{ext}" + (".gz" if compress else "")
+
+
+def _stream_export(where: str, params: tuple, name: str, format: str, compress: bool, subset: Optional[str]) -> Iterator[bytes]:
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{format}', use one of {EXPORT_FORMATS}")
+    full_export = format.startswith("full_") or format == "ndjson"
+
+    with streaming_connection() as conn:
+        conn.rollback()
+        instances = None
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            instances = _iter_export_instances(conn, where, params, full_export)
+
+            if format == "ndjson":
+                pieces = _ndjson_pieces(instances)
+            elif format.endswith("csv"):
+                pieces = _csv_pieces(instances, full_export)
+            else:
+                pieces = _json_pieces(name, instances, full_export, subset)
+
+            chunks = _chunked(pieces)
+            yield from (_gzipped(chunks) if compress else chunks)
+        finally:
+            if instances is not None:
+                instances.close()
+            conn.rollback()
+
+
+def stream_session_export(session_id: str, format: str = "json", compress: bool = False, all_questions: bool = False) -> Iterator[bytes]:
+    """
+    Streams the session export as bytes in one of EXPORT_FORMATS, gzipped with
+    `compress`: the latest question, or with `all_questions` every question of
+    the session. Rows are read from server-side cursors and written out as they
+    arrive, so memory stays flat however large the session is.
+    Borrows a pooled connection until the generator is exhausted or closed
+    (see streaming_connection); all queries read one REPEATABLE READ snapshot.
+    """
+    where, params = _session_scope(session_id, all_questions)
+    return _stream_export(where, params, f"session_{session_id}", format, compress, subset="export")
+
+
+def stream_dataset_export(
+    session_ids: Optional[List[str]] = None,
+    format: str = "full_json",
+    compress: bool = False,
+    name: str = "hinteval_dataset"
+) -> Iterator[bytes]:
+    """
+    Streams every question of `session_ids` (None: of all sessions) like
+    stream_session_export. The JSON export has one subset per session.
+    Not scoped to a caller, for operators only (see export_dataset.py).
+    """
+    where, params = _sessions_scope(session_ids)
+    return _stream_export(where, params, name, format, compress, subset=None)
+
+
 # --- Import Logic ---
 
 def import_session_data(conn, session_id: str, data: Any, format_type: str = "json") -> Dict[str, str]:
     """
     Routes import data to the correct handler (CSV, Simple JSON, or Full Backup).
+    Questions imported without an answer get one from a background job, see
+    queue_missing_answers.
     """
     if format_type == "csv":
-        parsed = _parse_csv_to_structure(data)
-        return _insert_simple_structure(conn, session_id, parsed)
-    
-    if _is_full_backup_format(data):
-        return _insert_full_backup(conn, session_id, data)
-    
-    return _insert_simple_structure(conn, session_id, data)
+        result = _insert_simple_structure(conn, session_id, _parse_csv_to_structure(data))
+    elif _is_full_backup_format(data):
+        result = _insert_full_backup(conn, session_id, data)
+    else:
+        result = _insert_simple_structure(conn, session_id, data)
+
+    pending = queue_missing_answers(conn, session_id, result.pop("missing_answers"))
+    result["pending_answers"] = pending
+    if pending["count"]:
+        result["info"] += f", generating {pending['count']} missing Answers"
+    return result
 
 
 def _is_full_backup_format(data: Dict) -> bool:
@@ -262,20 +542,20 @@ def _insert_simple_structure(conn, session_id: str, data: Dict[str, Any]) -> Dic
 
     cur = conn.cursor()
     try:
-        qid, aid = _insert_qa_core(cur, conn, session_id, q_text, a_text)
+        qid, aid = _insert_qa_core(cur, session_id, q_text, a_text)
         
         count = 0
         for h in data.get("hints", []):
             h_text = h.get("hint", h.get("text", "")) if isinstance(h, dict) else str(h)
             if h_text:
                 cur.execute(
-                    "INSERT INTO hints (question_id, answer_id, hint_text, created_at) VALUES (%s, %s, %s, %s)",
-                    (qid, aid, h_text, _now())
+                    "INSERT INTO hints (question_id, answer_id, hint_text) VALUES (%s, %s, %s)",
+                    (qid, aid, h_text)
                 )
                 count += 1
         
         conn.commit()
-        return {"info": f"Imported: 1 Question, {count} Hints", "question_id": qid}
+        return {"info": f"Imported: 1 Question, {count} Hints", "question_id": qid, "missing_answers": int(aid is None)}
     except Exception as e:
         conn.rollback()
         raise e
@@ -295,6 +575,7 @@ def _insert_full_backup(conn, session_id: str, data: Dict[str, Any]) -> Dict[str
 
         counts = {"q": 0, "h": 0, "m": 0, "e": 0, "c": 0}
         q_ids = []
+        missing = 0
 
         for inst_id, content in instances.items():
             # QA
@@ -306,9 +587,10 @@ def _insert_full_backup(conn, session_id: str, data: Dict[str, Any]) -> Dict[str
             
             if not q_text: continue
             
-            qid, aid = _insert_qa_core(cur, conn, session_id, q_text, a_text)
+            qid, aid = _insert_qa_core(cur, session_id, q_text, a_text, content.get("model_name"))
             q_ids.append(qid)
             counts["q"] += 1
+            missing += aid is None
 
             # Hints
             for h in content.get("hints", []):
@@ -316,8 +598,8 @@ def _insert_full_backup(conn, session_id: str, data: Dict[str, Any]) -> Dict[str
                 if not h_text: continue
 
                 cur.execute(
-                    "INSERT INTO hints (question_id, answer_id, hint_text, created_at) VALUES (%s, %s, %s, %s) RETURNING id",
-                    (qid, aid, h_text, _now())
+                    "INSERT INTO hints (question_id, answer_id, hint_text) VALUES (%s, %s, %s) RETURNING id",
+                    (qid, aid, h_text)
                 )
                 hid = cur.fetchone()[0]
                 counts["h"] += 1
@@ -343,8 +625,8 @@ def _insert_full_backup(conn, session_id: str, data: Dict[str, Any]) -> Dict[str
             # Candidates
             for c in content.get("candidates_full", []):
                 cur.execute(
-                    "INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, updated_at, is_groundtruth) VALUES (%s, %s, %s, %s, %s, %s)",
-                    (qid, c["text"], True if bool(c["is_eliminated"]) else False, c.get("created_at", _now()), c.get("updated_at"), bool(c.get("is_groundtruth", False)))
+                    "INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, updated_at, is_groundtruth) VALUES (%s, %s, %s, COALESCE(%s::timestamptz, now()), %s, %s)",
+                    (qid, c["text"], True if bool(c["is_eliminated"]) else False, c.get("created_at"), c.get("updated_at"), bool(c.get("is_groundtruth", False)))
                 )
                 counts["c"] += 1
 
@@ -352,7 +634,8 @@ def _insert_full_backup(conn, session_id: str, data: Dict[str, Any]) -> Dict[str
         return {
             "info": f"Restored {counts['q']} Questions, {counts['h']} Hints, {counts['c']} Candidates",
             "question_ids": q_ids,
-            "counts": counts
+            "counts": counts,
+            "missing_answers": missing
         }
     except Exception as e:
         conn.rollback()
@@ -367,35 +650,465 @@ def _insert_hinteval_structure(conn, session_id: str, data: Dict[str, Any]) -> D
     return _insert_full_backup(conn, session_id, data)
 
 
-def _insert_qa_core(cur, conn, session_id: str, q_text: str, a_text: str) -> Tuple[int, int]:
-    """Helper: Inserts Question. If answer exists, inserts it; otherwise generates it."""
+def _insert_qa_core(cur, session_id: str, q_text: str, a_text: str, model_name: Optional[str] = None) -> Tuple[int, Optional[int]]:
+    """Helper: Inserts Question and its answer if there is one (answer id None otherwise)."""
     # Insert Question
     cur.execute(
-        "INSERT INTO questions (text, session_id, created_at) VALUES (%s, %s, %s) RETURNING id",
-        (q_text, session_id, _now())
+        "INSERT INTO questions (text, session_id) VALUES (%s, %s) RETURNING id",
+        (q_text, session_id)
     )
     qid = cur.fetchone()[0]
 
     if a_text:
         cur.execute(
-            "INSERT INTO answers (question_id, answer_text, created_at) VALUES (%s, %s, %s) RETURNING id",
-            (qid, a_text, _now())
+            "INSERT INTO answers (question_id, answer_text, model_name) VALUES (%s, %s, %s) RETURNING id",
+            (qid, a_text, model_name)
         )
         aid = cur.fetchone()[0]
     else:
-        logger.info(f"Answer missing for QID {qid}, generating...")
-        conn.commit()
-        
-        gen_ans = generate_only_answer(conn, q_text, "meta-llama/Llama-3.3-70B-Instruct-Turbo", question_id=qid)
-        
-        cur.execute(
-            "INSERT INTO answers (question_id, answer_text, model_name, created_at) VALUES (%s, %s, %s, %s) RETURNING id",
-            (qid, gen_ans, "meta-llama/Llama-3.3-70B-Instruct-Turbo", _now())
-        )
-        aid = cur.fetchone()[0]
+        aid = None
     
     return qid, aid
 
+# --- Bulk Import ---
+
+# Staged rows buffered in memory before they are sent to the temp tables with COPY
+IMPORT_BATCH_ROWS = int(os.getenv("HINTEVAL_IMPORT_BATCH_ROWS", "20000"))
+
+IMPORT_ANSWER_MODEL = "meta-llama/Llama-3.3-70B-Instruct-Turbo"
+
+# Temp tables the upload is staged in, rows are tied together by their positions in the file
+_IMPORT_TABLES = {
+    "import_questions": ("pos INTEGER, text TEXT, answer_text TEXT, model_name TEXT", "id INTEGER, answer_id INTEGER"),
+    "import_hints": ("q_pos INTEGER, h_pos INTEGER, hint_text TEXT", "id INTEGER"),
+    "import_metrics": ("q_pos INTEGER, h_pos INTEGER, m_pos INTEGER, name TEXT, value REAL, metadata_json TEXT", None),
+    "import_entities": (
+        "q_pos INTEGER, h_pos INTEGER, e_pos INTEGER, entity TEXT, ent_type TEXT, "
+        "start_index INTEGER, end_index INTEGER, metadata_json TEXT", None
+    ),
+    "import_candidates": (
+        "q_pos INTEGER, c_pos INTEGER, candidate_text TEXT, is_eliminated BOOLEAN, "
+        "created_at TEXT, updated_at TEXT, is_groundtruth BOOLEAN", None
+    ),
+}
+_IMPORT_COLUMNS = {
+    table: [c.strip().split()[0] for c in columns.split(",")] for table, (columns, _) in _IMPORT_TABLES.items()
+}
+
+_INSTANCE = object()
+
+
+def _iter_json_upload(fileobj, rest: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the instances of an uploaded dataset JSON (`subsets.*.instances`)
+    one at a time, parsed incrementally with ijson when it is installed.
+    The other top-level keys (a simple {question, answer, hints} upload) are
+    collected into `rest`.
+    """
+    if ijson is None:
+        data = json.load(fileobj)
+        if not isinstance(data, dict):
+            return
+        rest.update({k: v for k, v in data.items() if k != "subsets"})
+        for subset in (data.get("subsets") or {}).values():
+            yield from (subset.get("instances") or {}).values()
+        return
+
+    builder, depth, capture = None, 0, None
+    # Keys from the root to the current value ("item" in arrays). ijson's dotted
+    # prefix cannot tell a subset named "v1.2" from nested keys.
+    path: List[Optional[str]] = []
+    for _, event, value in ijson.parse(fileobj, use_float=True):
+        if capture is None:
+            if event == "map_key":
+                path[-1] = value
+                if len(path) == 1 and value != "subsets":
+                    capture = value
+                elif len(path) == 4 and path[0] == "subsets" and path[2] == "instances":
+                    capture = _INSTANCE
+            elif event == "start_map":
+                path.append(None)
+            elif event == "start_array":
+                path.append("item")
+            elif event in ("end_map", "end_array"):
+                path.pop()
+            continue
+
+        if builder is None:
+            builder, depth = ijson.ObjectBuilder(), 0
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            if capture is _INSTANCE:
+                yield builder.value
+            else:
+                rest[capture] = builder.value
+            builder, capture = None, None
+
+
+def _iter_csv_upload(fileobj) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the instances of an uploaded (type, content) CSV one at a time.
+    Every `question` row after the first starts a new instance; the `details`
+    column of the full CSV export restores metrics, entities and candidates.
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if reader.fieldnames:
+            reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+
+        instance: Optional[Dict[str, Any]] = None
+        for row in reader:
+            rtype = (row.get("type") or "").strip().lower()
+            content = (row.get("content") or "").strip()
+            if not content: continue
+            details = _parse_meta(row.get("details")) or {}
+
+            if rtype == "question" and instance is not None and instance["question"]:
+                yield instance
+                instance = None
+            if instance is None:
+                instance = {"question": None, "answers": [], "hints": [], "candidates_full": []}
+
+            if rtype == "question":
+                instance["question"] = {"question": content}
+                instance["model_name"] = details.get("model_name")
+            elif rtype == "answer": instance["answers"] = [{"answer": content}]
+            elif rtype == "hint": instance["hints"].append({"hint": content, **details})
+            elif rtype == "candidate": instance["candidates_full"].append({"text": content, **details})
+        if instance is not None:
+            yield instance
+    finally:
+        text.detach()
+
+
+def _question_and_answer(content: Dict[str, Any]) -> Tuple[str, str]:
+    q_raw = content.get("question") or {}
+    q_text = q_raw.get("question", "") if isinstance(q_raw, dict) else str(q_raw)
+    ans_list = content.get("answers") or []
+    a_text = (ans_list[0].get("answer") or "") if ans_list and isinstance(ans_list[0], dict) else ""
+    return q_text, a_text
+
+
+def _stage_instances(cur, instances: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    COPYs the rows of `instances` into the import temp tables, IMPORT_BATCH_ROWS
+    at a time, with the same rules as _insert_full_backup (instances without a
+    question and hints without text are skipped, plain string hints are their
+    text). Raises ValueError for metrics without a name and candidates without
+    text.
+    """
+    buffers: Dict[str, List[tuple]] = {table: [] for table in _IMPORT_TABLES}
+    counts = {"q": 0, "h": 0, "m": 0, "e": 0, "c": 0}
+    buffered = 0
+
+    def flush() -> None:
+        for table, rows in buffers.items():
+            if rows:
+                copy_rows(cur, table, _IMPORT_COLUMNS[table], rows)
+                rows.clear()
+
+    for content in instances:
+        if not isinstance(content, dict): continue
+        q_text, a_text = _question_and_answer(content)
+        if not q_text: continue
+
+        q_pos = counts["q"]
+        buffers["import_questions"].append((q_pos, q_text, a_text, content.get("model_name")))
+        counts["q"] += 1
+
+        for h_pos, h in enumerate(content.get("hints") or []):
+            if isinstance(h, str):
+                h_text, h = h, {}
+            elif isinstance(h, dict):
+                h_text = h.get("hint", "")
+            else:
+                raise ValueError(f"Import failed: hint {h_pos + 1} of question {q_pos + 1} is neither text nor an object.")
+            if not h_text: continue
+            buffers["import_hints"].append((q_pos, h_pos, h_text))
+            counts["h"] += 1
+
+            for m_pos, m in enumerate(h.get("metrics") or []):
+                if not isinstance(m, dict) or m.get("name") is None:
+                    raise ValueError(f"Import failed: metric {m_pos + 1} of question {q_pos + 1} has no name.")
+                meta = json.dumps(m.get("metadata")) if m.get("metadata") else None
+                buffers["import_metrics"].append((q_pos, h_pos, m_pos, m["name"], m.get("value"), meta))
+                counts["m"] += 1
+
+            for e_pos, e in enumerate(h.get("entities") or []):
+                if not isinstance(e, dict):
+                    raise ValueError(f"Import failed: entity {e_pos + 1} of question {q_pos + 1} is not an object.")
+                meta = json.dumps(e.get("metadata")) if e.get("metadata") else None
+                buffers["import_entities"].append(
+                    (q_pos, h_pos, e_pos, e.get("text"), e.get("type"), e.get("start"), e.get("end"), meta)
+                )
+                counts["e"] += 1
+
+        for c_pos, c in enumerate(content.get("candidates_full") or []):
+            if not isinstance(c, dict) or c.get("text") is None:
+                raise ValueError(f"Import failed: candidate {c_pos + 1} of question {q_pos + 1} has no text.")
+            buffers["import_candidates"].append((
+                q_pos, c_pos, c["text"], bool(c.get("is_eliminated")),
+                c.get("created_at"), c.get("updated_at"), bool(c.get("is_groundtruth", False))
+            ))
+            counts["c"] += 1
+
+        buffered = sum(len(rows) for rows in buffers.values())
+        if buffered >= IMPORT_BATCH_ROWS:
+            flush()
+    flush()
+    return counts
+
+
+def _assign_ids(cur, staging: str, column: str, target: str, order_by: str, where: str = "TRUE") -> None:
+    """
+    Fills `column` of the staged rows matching `where` with ids drawn from the
+    sequence of `target`.id, ascending in `order_by` like row by row inserts.
+    """
+    cur.execute(
+        f"""
+        WITH ids AS (
+            SELECT id, row_number() OVER (ORDER BY id) AS n
+            FROM (SELECT nextval(pg_get_serial_sequence(%s, 'id')) AS id FROM {staging} WHERE {where}) drawn
+        ), staged AS (
+            SELECT ctid AS row_ctid, row_number() OVER (ORDER BY {order_by}) AS n FROM {staging} WHERE {where}
+        )
+        UPDATE {staging} s SET {column} = ids.id
+        FROM staged JOIN ids USING (n)
+        WHERE s.ctid = staged.row_ctid
+        """,
+        (target,)
+    )
+
+
+def _insert_staged(cur, session_id: str) -> int:
+    """
+    Moves the staged rows into the real tables with set-based INSERT ... SELECT,
+    resolving positions to the new ids. Returns how many questions came
+    without an answer.
+    """
+    for table in _IMPORT_TABLES:
+        cur.execute(f"ANALYZE {table}")
+    _assign_ids(cur, "import_questions", "id", "questions", "pos")
+    _assign_ids(cur, "import_questions", "answer_id", "answers", "pos", where="answer_text <> ''")
+    _assign_ids(cur, "import_hints", "id", "hints", "q_pos, h_pos")
+
+    # clock_timestamp keeps the file order in created_at, the last question stays the latest one
+    cur.execute(
+        """
+        INSERT INTO questions (id, text, session_id, created_at)
+        SELECT id, text, %s, clock_timestamp() FROM import_questions ORDER BY pos
+        """,
+        (session_id,)
+    )
+    cur.execute("""
+        INSERT INTO answers (id, question_id, answer_text, model_name, created_at)
+        SELECT answer_id, id, answer_text, model_name, now() FROM import_questions WHERE answer_id IS NOT NULL
+    """)
+    cur.execute("""
+        INSERT INTO hints (id, question_id, answer_id, hint_text, created_at)
+        SELECT ih.id, iq.id, iq.answer_id, ih.hint_text, now()
+        FROM import_hints ih JOIN import_questions iq ON iq.pos = ih.q_pos
+    """)
+    cur.execute("""
+        INSERT INTO metrics (hint_id, name, value, metadata_json)
+        SELECT ih.id, m.name, m.value, m.metadata_json
+        FROM import_metrics m JOIN import_hints ih USING (q_pos, h_pos)
+        ORDER BY m.q_pos, m.h_pos, m.m_pos
+    """)
+    cur.execute("""
+        INSERT INTO entities (hint_id, entity, ent_type, start_index, end_index, metadata_json)
+        SELECT ih.id, e.entity, e.ent_type, e.start_index, e.end_index, e.metadata_json
+        FROM import_entities e JOIN import_hints ih USING (q_pos, h_pos)
+        ORDER BY e.q_pos, e.h_pos, e.e_pos
+    """)
+    cur.execute("""
+        INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, updated_at, is_groundtruth)
+        SELECT iq.id, c.candidate_text, c.is_eliminated, COALESCE(c.created_at::timestamptz, now()),
+               c.updated_at::timestamptz, c.is_groundtruth
+        FROM import_candidates c JOIN import_questions iq ON iq.pos = c.q_pos
+        ORDER BY c.q_pos, c.c_pos
+    """)
+    cur.execute("SELECT COUNT(*) FROM import_questions WHERE answer_id IS NULL")
+    return cur.fetchone()[0]
+
+
+def import_session_upload(conn, session_id: str, fileobj, format_type: str = "json") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Replaces the session's data with an uploaded JSON or CSV file, read from
+    `fileobj` incrementally. Dataset uploads (any number of instances) are
+    staged with COPY into temp tables and inserted set-based; a simple
+    {question, answer, hints} JSON goes through import_session_data.
+    Clearing and importing share one transaction, so a broken file leaves the
+    session as it was. Questions without an answer are answered afterwards by
+    a background job (queue_missing_answers). Returns (clear result, import result).
+    """
+    cur = conn.cursor()
+    try:
+        cleared = clear_session_data(conn, session_id, commit=False)
+        for table, (columns, extra) in _IMPORT_TABLES.items():
+            cur.execute(f"CREATE TEMP TABLE {table} ({columns}{', ' + extra if extra else ''}) ON COMMIT DROP")
+
+        rest: Dict[str, Any] = {}
+        try:
+            instances = _iter_csv_upload(fileobj) if format_type == "csv" else _iter_json_upload(fileobj, rest)
+            counts = _stage_instances(cur, instances)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid {format_type.upper()} format: {e}")
+        except Exception as e:
+            if ijson is not None and isinstance(e, ijson.JSONError):
+                raise ValueError(f"Invalid JSON format: {e}")
+            raise
+
+        if not counts["q"]:
+            if format_type == "json" and rest:
+                # A simple upload holds one question, the regular import handles it
+                conn.rollback()
+                cleared = clear_session_data(conn, session_id, commit=False)
+                return cleared, import_session_data(conn, session_id, rest, "json")
+            raise ValueError("Import failed: No questions found in the file.")
+
+        missing = _insert_staged(cur, session_id)
+        cur.execute("SELECT id FROM import_questions ORDER BY pos")
+        q_ids = [r[0] for r in cur.fetchall()]
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Import failed: {e}")
+        raise
+    finally:
+        cur.close()
+
+    pending = queue_missing_answers(conn, session_id, missing)
+    info = f"Imported {counts['q']} Questions, {counts['h']} Hints, {counts['c']} Candidates"
+    if pending["count"]:
+        info += f", generating {pending['count']} missing Answers"
+    return cleared, {
+        "info": info,
+        "question_ids": q_ids,
+        "counts": counts,
+        "pending_answers": pending
+    }
+
+
+# --- Missing Answers ---
+
+# Answers generated at once by the import_answers job
+IMPORT_ANSWER_CONCURRENCY = int(os.getenv("HINTEVAL_IMPORT_ANSWER_CONCURRENCY", "8"))
+
+_ANSWER_UNAVAILABLE = "Answer unavailable."
+
+
+def queue_missing_answers(conn, session_id: str, missing: int) -> Dict[str, Any]:
+    """
+    Queues an import_answers job when `missing` imported questions have no
+    answer. Call after the import is committed. Returns the pending work,
+    {"count", "job_id"}; the job is followed with GET /api/jobs/{job_id}.
+    """
+    if not missing:
+        return {"count": 0, "job_id": None}
+    from backend.services.job_service import enqueue_job
+
+    job = enqueue_job(conn, "import_answers", session_id, {"session_id": session_id})
+    logger.info(f"Queued job {job['job_id']} for {missing} missing answers of session {session_id}")
+    return {"count": missing, "job_id": job["job_id"]}
+
+
+def _missing_answer_questions(conn, session_id: str) -> List[Tuple[int, str]]:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT q.id, q.text FROM questions q
+        WHERE q.session_id = %s AND NOT EXISTS (SELECT 1 FROM answers a WHERE a.question_id = q.id)
+        ORDER BY q.id
+        """,
+        (session_id,)
+    )
+    return cur.fetchall()
+
+
+def _store_generated_answer(conn, qid: int, answer_text: str, model_name: str) -> bool:
+    """
+    Stores the answer and links the question's hints to it, unless the
+    question got an answer (or was deleted) in the meantime.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM questions WHERE id = %s FOR UPDATE", (qid,))
+    if cur.fetchone() is None:
+        conn.rollback()
+        return False
+    cur.execute(
+        """
+        INSERT INTO answers (question_id, answer_text, model_name, created_at)
+        SELECT %s, %s, %s, now()
+        WHERE NOT EXISTS (SELECT 1 FROM answers WHERE question_id = %s)
+        RETURNING id
+        """,
+        (qid, answer_text, model_name, qid)
+    )
+    row = cur.fetchone()
+    if row is None:
+        conn.rollback()
+        return False
+    cur.execute("UPDATE hints SET answer_id = %s WHERE question_id = %s AND answer_id IS NULL", (row[0], qid))
+    conn.commit()
+    return True
+
+
+def fill_missing_answers(
+    session_id: str,
+    concurrency: Optional[int] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Handler of the import_answers job: generates an answer for every question
+    of the session that has none, `concurrency` at a time. No connection is
+    held while the model answers; each answer is stored in its own short
+    transaction, so a requeued job only redoes what is still missing.
+    """
+    from backend.services.generation_service import generate_answer_agnostic, API_Info
+
+    report = progress or (lambda phase, detail: None)
+    with pooled_connection() as conn:
+        missing = _missing_answer_questions(conn, session_id)
+        conn.rollback()
+
+    cfg = API_Info(model_name=IMPORT_ANSWER_MODEL)
+    counts = {"total": len(missing), "done": 0, "skipped": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    report("answering", counts)
+
+    def answer_one(qid: int, q_text: str) -> None:
+        try:
+            answer_text = generate_answer_agnostic(q_text, 512, 0.3, 0.9, cfg)
+            if answer_text == _ANSWER_UNAVAILABLE:
+                outcome = "failed"
+            else:
+                with pooled_connection() as conn:
+                    outcome = "done" if _store_generated_answer(conn, qid, answer_text, cfg.model_name) else "skipped"
+        except Exception as e:
+            logger.error(f"Answer for question {qid} failed: {e}")
+            outcome = "failed"
+        with counts_lock:
+            counts[outcome] += 1
+            report("answering", dict(counts))
+
+    workers = max(1, min(concurrency or IMPORT_ANSWER_CONCURRENCY, len(missing) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hinteval-import-answers") as pool:
+        for future in [pool.submit(answer_one, qid, q_text) for qid, q_text in missing]:
+            future.result()
+
+    logger.info(
+        f"Session {session_id}: {counts['done']} of {counts['total']} missing answers generated, "
+        f"{counts['failed']} failed"
+    )
+    return {"session_id": session_id, **counts}
+
+
 def load_full_preset_state(conn, session_id: str, data: Dict[str, Any]):
     """
     Inserts a full pre-computed state (Q, A, Hints, Candidates, Metrics) 
@@ -406,32 +1119,32 @@ def load_full_preset_state(conn, session_id: str, data: Dict[str, Any]):
     try:
         cur.execute(
             """
-            INSERT INTO questions (text, session_id, created_at) 
-            VALUES (%s, %s, %s) 
+            INSERT INTO questions (text, session_id) 
+            VALUES (%s, %s) 
             RETURNING id
             """, 
-            (data['question'], session_id, _now())
+            (data['question'], session_id)
         )
         qid = cur.fetchone()[0]
         
         cur.execute(
             """
-            INSERT INTO answers (question_id, answer_text, created_at) 
-            VALUES (%s, %s, %s) 
+            INSERT INTO answers (question_id, answer_text) 
+            VALUES (%s, %s) 
             RETURNING id
             """, 
-            (qid, data['groundTruth'], _now())
+            (qid, data['groundTruth'])
         )
         aid = cur.fetchone()[0]
 
         for h in data.get('hints', []):
             cur.execute(
                 """
-                INSERT INTO hints (question_id, answer_id, hint_text, created_at) 
-                VALUES (%s, %s, %s, %s) 
+                INSERT INTO hints (question_id, answer_id, hint_text) 
+                VALUES (%s, %s, %s) 
                 RETURNING id
                 """,
-                (qid, aid, h['hint_text'], _now())
+                (qid, aid, h['hint_text'])
             )
             real_hint_id = cur.fetchone()[0]
             
@@ -454,18 +1167,18 @@ def load_full_preset_state(conn, session_id: str, data: Dict[str, Any]):
             if c_text == isgroundtruth_candidate:
                 cur.execute(
                     """
-                    INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, is_groundtruth) 
-                    VALUES (%s, %s, %s, %s, %s)
+                    INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, is_groundtruth) 
+                    VALUES (%s, %s, %s, %s)
                     """,
-                    (qid, c_text, False, _now(), True) 
+                    (qid, c_text, False, True) 
                 )
             else:
                 cur.execute(
                     """
-                    INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, is_groundtruth) 
-                    VALUES (%s, %s, %s, %s, %s)
+                    INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, is_groundtruth) 
+                    VALUES (%s, %s, %s, %s)
                     """,
-                    (qid, c_text, False, _now(), False) 
+                    (qid, c_text, False, False) 
                 )
 
         conn.commit()
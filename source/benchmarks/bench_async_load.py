@@ -0,0 +1,104 @@
+"""
+Many concurrent, mostly waiting sessions against a running backend: each session
+regenerates its answer (LLM bound) while a probe keeps reading session state.
+
+    python -m benchmarks.llm_stub_server --port 9000 --delay 1 &
+    TOGETHER_BASE_URL=http://localhost:9000/v1 LLM_MAX_IN_FLIGHT=32 LLM_POOL_SIZE=32 python app.py &
+    python -m benchmarks.bench_async_load --url http://localhost:8000 --sessions 1000
+
+Reports the latency of the LLM bound requests and of the cheap reads issued
+while they wait. LLM throughput is capped at LLM_MAX_IN_FLIGHT / delay, the
+sessions above that cap wait on the semaphore without holding a thread or a
+database connection, so the reads stay fast. Keep LLM_POOL_SIZE in the tens:
+httpcore scans its whole pool for every queued request, very large pools cost
+more CPU than they save.
+"""
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+import httpx
+
+
+def _summary(latencies: List[float]) -> dict:
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+async def _session(client: httpx.AsyncClient, model: str, latencies: List[float], errors: List[str]):
+    body = {"question": "What is the capital of Austria?", "model_name": model, "temperature": 0.3, "max_tokens": 64}
+    started = time.perf_counter()
+    try:
+        resp = await client.post("/api/hinteval/regenerate_answer", json=body)
+        if resp.status_code != 200:
+            errors.append(str(resp.status_code))
+            return
+    except httpx.HTTPError as e:
+        errors.append(type(e).__name__)
+        return
+    latencies.append(time.perf_counter() - started)
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float], interval: float):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            resp = await client.get("/api/hinteval/session_state")
+            if resp.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def run(args) -> dict:
+    # No keep-alive on the load generator side, see the pool note above
+    limits = httpx.Limits(max_connections=args.sessions + 10, max_keepalive_connections=0)
+    timeout = httpx.Timeout(args.timeout)
+    llm_latencies, probe_latencies, errors = [], [], []
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, stop, probe_latencies, args.probe_interval))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_session(client, args.model, llm_latencies, errors) for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await probe
+
+    return {
+        "sessions": args.sessions,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(llm_latencies) / elapsed, 1) if elapsed else 0.0,
+        "errors": len(errors),
+        "llm_requests": _summary(llm_latencies),
+        "reads_during_load": _summary(probe_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--model", default="stub-model")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
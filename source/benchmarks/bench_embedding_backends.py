@@ -0,0 +1,102 @@
+"""
+Sentences per second, load time, peak RSS and accuracy drift of the SBERT
+inference backends (HINTEVAL_EMBED_BACKEND: torch, onnx, int8).
+
+    python -m benchmarks.bench_embedding_backends --model all-MiniLM-L6-v2 --sentences 2000
+    python -m benchmarks.bench_embedding_backends --model all-mpnet-base-v2 --backends torch,int8
+
+Every backend runs in its own process so that peak RSS is not shared. Drift
+is measured against the torch embeddings of the same sentences (see
+embedding_service.measure_drift); ONNX backends need sentence-transformers[onnx].
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from typing import List
+
+import numpy as np
+
+from backend.services import embedding_service
+from backend.services.embedding_service import DRIFT_SAMPLE, load_sentence_model, measure_drift
+
+
+def _sentences(count: int) -> List[str]:
+    subjects = ["This city", "The author", "This element", "The river", "This painter", "The treaty"]
+    facts = [
+        "is known for its music festivals and old coffee houses",
+        "won a major literary prize late in life",
+        "is a soft metal used in electronics",
+        "flows through several capitals before reaching the sea",
+        "spent his final years in the south of France",
+        "ended a long war between neighbouring kingdoms",
+    ]
+    return [f"{subjects[i % 6]} {facts[(i // 6) % 6]} (hint {i})." for i in range(count)]
+
+
+def _child(args) -> None:
+    """Measures one backend in this process and prints the result as JSON."""
+    started = time.perf_counter()
+    model = load_sentence_model(args.model, args.child)
+    load_seconds = time.perf_counter() - started
+
+    sentences = _sentences(args.sentences)
+    model.encode(sentences[:args.batch_size], batch_size=args.batch_size)  # warm up
+    started = time.perf_counter()
+    model.encode(sentences, batch_size=args.batch_size, convert_to_numpy=True)
+    encode_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "backend": args.child,
+        "load_seconds": round(load_seconds, 2),
+        "sentences_per_second": round(len(sentences) / encode_seconds, 1),
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "sample": model.encode(DRIFT_SAMPLE, convert_to_numpy=True).tolist(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backends", default="torch,onnx,int8")
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--child", choices=embedding_service.EMBED_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args)
+        return
+
+    results = {}
+    for backend in args.backends.split(","):
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_embedding_backends", "--child", backend,
+             "--model", args.model, "--sentences", str(args.sentences), "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            results[backend] = {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+            continue
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    baseline = results.get("torch", {}).get("sample")
+    for backend, result in results.items():
+        sample = result.pop("sample", None)
+        if baseline is not None and sample is not None:
+            result["drift"] = measure_drift(np.array(baseline), np.array(sample))
+
+    print(json.dumps({
+        "model": args.model,
+        "sentences": args.sentences,
+        "torch_threads": embedding_service.TORCH_THREADS,
+        "max_drift_allowed": embedding_service.EMBED_MAX_DRIFT,
+        "backends": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
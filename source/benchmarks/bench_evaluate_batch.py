@@ -0,0 +1,74 @@
+"""
+Hint throughput of the evaluators when records are evaluated one by one
+(evaluate_hints, like /evaluate) versus once per batch (evaluate_hints_batch,
+like /evaluate_batch). Runs in-process on the real HintEval models, without
+the database or the evaluation cache.
+
+    python -m benchmarks.bench_evaluate_batch --questions 64 --hints 5 --batch-sizes 1,8,32,64
+
+The LLM evaluator is skipped by default (--with-llm to include it), it is
+bound by the LLM endpoint rather than by batching.
+"""
+import time
+import json
+import argparse
+
+from backend.services import evaluation_service
+from backend.services.evaluation_service import evaluate_hints, evaluate_hints_batch
+
+
+def _records(num_questions: int, num_hints: int):
+    return [
+        {
+            "question": f"Which city is the capital of country number {q}?",
+            "hints": [f"Hint {h} for question {q}: it lies on a large river and hosts many museums." for h in range(num_hints)],
+            "answer": f"City {q}",
+            "candidates": [f"City {q + c}" for c in range(1, 4)] + [f"City {q}"],
+        }
+        for q in range(num_questions)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=64)
+    parser.add_argument("--hints", type=int, default=5)
+    parser.add_argument("--batch-sizes", default="1,8,32,64")
+    parser.add_argument("--with-llm", action="store_true")
+    args = parser.parse_args()
+
+    if not args.with_llm:
+        evaluation_service.EVALUATORS.pop("llm", None)
+
+    records = _records(args.questions, args.hints)
+    num_hints = args.questions * args.hints
+
+    # Warm up: builds the models so that loading is not measured
+    evaluate_hints_batch(records[:1])
+
+    started = time.perf_counter()
+    for r in records:
+        evaluate_hints(r["question"], r["hints"], r["answer"], r["candidates"], model_name=None)
+    one_by_one = time.perf_counter() - started
+
+    batched = {}
+    for size in [int(s) for s in args.batch_sizes.split(",")]:
+        started = time.perf_counter()
+        for i in range(0, len(records), size):
+            evaluate_hints_batch(records[i:i + size])
+        batched[size] = time.perf_counter() - started
+
+    print(json.dumps({
+        "questions": args.questions,
+        "hints": num_hints,
+        "evaluators": list(evaluation_service.EVALUATORS),
+        "one_by_one": {"seconds": round(one_by_one, 2), "hints_per_second": round(num_hints / one_by_one, 1)},
+        "batched": {
+            str(size): {"seconds": round(seconds, 2), "hints_per_second": round(num_hints / seconds, 1)}
+            for size, seconds in batched.items()
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
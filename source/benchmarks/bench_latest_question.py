@@ -0,0 +1,79 @@
+"""
+Latency of question_service.get_latest_question_id as the questions table grows,
+with and without the idx_questions_session_latest index.
+
+    python -m benchmarks.bench_latest_question --rows 10000 100000 1000000 3000000
+
+Rows are generated server side with generate_series and spread over
+`--sessions` synthetic sessions. The index is dropped inside a transaction
+that is rolled back, so the schema is left untouched.
+"""
+import json
+import time
+import random
+import argparse
+
+from backend.services.question_service import get_latest_question_id
+from benchmarks.common import BENCH_PREFIX, connect, drop_bench_sessions
+
+INDEX_NAME = "idx_questions_session_latest"
+
+
+def _grow(conn, target_rows: int, current_rows: int, sessions: int) -> None:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO questions (text, session_id, created_at)
+        SELECT 'Synthetic question ' || n,
+               %s || (n %% %s),
+               now() - make_interval(secs => n)
+        FROM generate_series(%s, %s) AS n
+        """,
+        (f"{BENCH_PREFIX}lq-", sessions, current_rows + 1, target_rows)
+    )
+    cur.execute("ANALYZE questions")
+    conn.commit()
+
+
+def _measure(conn, sessions: int, lookups: int) -> float:
+    rnd = random.Random(7)
+    started = time.perf_counter()
+    for _ in range(lookups):
+        get_latest_question_id(conn, f"{BENCH_PREFIX}lq-{rnd.randrange(sessions)}")
+    return round((time.perf_counter() - started) / lookups * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--skip-unindexed", action="store_true", help="only measure with the index in place")
+    args = parser.parse_args()
+
+    conn = connect()
+    results = []
+    current = 0
+    try:
+        for target in sorted(args.rows):
+            _grow(conn, target, current, args.sessions)
+            current = target
+
+            entry = {"rows": target, "indexed_ms": _measure(conn, args.sessions, args.lookups)}
+            if not args.skip_unindexed:
+                cur = conn.cursor()
+                cur.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+                entry["unindexed_ms"] = _measure(conn, args.sessions, max(args.lookups // 10, 1))
+                conn.rollback()
+            results.append(entry)
+            print(json.dumps(entry), flush=True)
+    finally:
+        conn.rollback()
+        drop_bench_sessions(conn)
+        conn.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Latency and throughput of candidate generation through the shared LLM client.
+
+    python -m benchmarks.llm_stub_server --port 9000 &
+    python -m benchmarks.bench_llm_client --base-url http://localhost:9000/v1 --requests 200 --concurrency 20
+"""
+import time
+import json
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services import llm_client
+from backend.services.generation_service import generate_only_candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:9000/v1")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--model", default="stub-model")
+    args = parser.parse_args()
+
+    llm_client.set_client(llm_client.LLMClient(base_url=args.base_url, api_key="stub"))
+
+    def one_call(_):
+        started = time.perf_counter()
+        out = generate_only_candidates("What is the capital of Austria?", 5, 0.3, args.model, 64)
+        return time.perf_counter() - started, len(out)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one_call, range(args.requests)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "failed": sum(1 for r in results if r[1] == 0),
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(args.requests / wall, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "client": llm_client.get_client().stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
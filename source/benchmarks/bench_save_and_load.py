@@ -0,0 +1,209 @@
+"""
+Time and peak memory of the save_and_load_service import/export paths on
+synthetic sessions of growing size, written to a JSON results file.
+
+    python -m benchmarks.bench_save_and_load --questions 1 100 1000 --hints 10 --metrics 5
+    python -m benchmarks.bench_save_and_load --output after.json --baseline before.json
+
+Every round seeds a fresh session (benchmarks.common.seed_session) and runs:
+export_session_json (all questions), export_session_csv_stream (latest
+question), the streamed full_json export, clear_session_data, then restores
+the exported data with _insert_full_backup and with import_session_upload
+(both into new sessions). Times are the median and minimum over `--rounds`.
+Peak memory comes from one extra round under tracemalloc, so it counts Python
+allocations only (not libpq buffers); peak_rss_mb is the whole process.
+
+With `--baseline` every operation gets its time ratio to the same size in an
+older results file, and ratios above 1 + `--tolerance` are listed under
+"regressions" (exit code 1). Only sessions starting with BENCH_PREFIX are touched.
+"""
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import statistics
+import subprocess
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.database.connection import init_pool, close_pool
+from backend.services import save_and_load_service
+from backend.services.save_and_load_service import (
+    clear_session_data, export_session_csv_stream, export_session_json,
+    import_session_upload, stream_session_export, _insert_full_backup,
+)
+from benchmarks.common import connect, drop_bench_sessions, new_session_id, seed_session
+
+OPERATIONS = (
+    "export_session_json", "export_session_csv_stream", "stream_session_export",
+    "clear_session_data", "_insert_full_backup", "import_session_upload",
+)
+
+
+def _round(conn, args, size: int, measure: Callable[[str, Callable[[], Any]], Any]) -> Dict[str, int]:
+    """One seed/export/clear/restore cycle, every operation goes through `measure`."""
+    session_id = new_session_id()
+    seed_session(
+        conn, session_id, num_questions=size, hints_per_question=args.hints,
+        metrics_per_hint=args.metrics, entities_per_hint=args.entities,
+        candidates_per_question=args.candidates,
+    )
+
+    data = measure("export_session_json", lambda: export_session_json(conn, session_id, all_questions=True))
+    measure("export_session_csv_stream", lambda: export_session_csv_stream(conn, session_id).getvalue())
+    streamed = measure("stream_session_export", lambda: sum(
+        len(chunk) for chunk in stream_session_export(session_id, "full_json", all_questions=True)
+    ))
+    measure("clear_session_data", lambda: clear_session_data(conn, session_id))
+
+    restored = new_session_id()
+    measure("_insert_full_backup", lambda: _insert_full_backup(conn, restored, data))
+    clear_session_data(conn, restored)
+
+    upload = json.dumps(data).encode()
+    del data
+    imported = new_session_id()
+    measure("import_session_upload", lambda: import_session_upload(conn, imported, io.BytesIO(upload)))
+    clear_session_data(conn, imported)
+    return {"export_bytes": streamed, "upload_bytes": len(upload)}
+
+
+def _bench_size(conn, args, size: int) -> Dict[str, Any]:
+    seconds: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+
+    def timed(name: str, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = fn()
+        seconds[name].append(time.perf_counter() - started)
+        return result
+
+    sizes = {}
+    for _ in range(args.rounds):
+        sizes = _round(conn, args, size, timed)
+
+    operations = {
+        name: {"seconds_median": round(statistics.median(values), 4), "seconds_min": round(min(values), 4)}
+        for name, values in seconds.items()
+    }
+    if not args.no_memory:
+        def traced(name: str, fn: Callable[[], Any]) -> Any:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = fn()
+            operations[name]["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - before) / 1024 / 1024, 2)
+            return result
+
+        tracemalloc.start()
+        try:
+            _round(conn, args, size, traced)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "questions": size,
+        "hints": size * args.hints,
+        "metrics": size * args.hints * args.metrics,
+        "entities": size * args.hints * args.entities,
+        "candidates": size * args.candidates,
+        **sizes,
+        "operations": operations,
+    }
+
+
+def _compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[Dict[str, Any]]:
+    """Adds vs_baseline time ratios to `results` and returns the regressions."""
+    with open(baseline_path) as f:
+        baseline = {entry["questions"]: entry for entry in json.load(f)["results"]}
+
+    regressions = []
+    for entry in results:
+        old = baseline.get(entry["questions"])
+        if old is None:
+            continue
+        for name, op in entry["operations"].items():
+            old_seconds = old["operations"].get(name, {}).get("seconds_median")
+            if not old_seconds:
+                continue
+            op["vs_baseline"] = round(op["seconds_median"] / old_seconds, 3)
+            if op["vs_baseline"] > 1 + tolerance:
+                regressions.append({"questions": entry["questions"], "operation": name, "ratio": op["vs_baseline"]})
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[1, 100, 1000], help="session sizes to run")
+    parser.add_argument("--hints", type=int, default=10, help="hints per question")
+    parser.add_argument("--metrics", type=int, default=5, help="metrics per hint")
+    parser.add_argument("--entities", type=int, default=3, help="entities per hint")
+    parser.add_argument("--candidates", type=int, default=5, help="candidates per question")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc round")
+    parser.add_argument("--output", default="bench_save_and_load.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    init_pool()
+    conn = connect()
+    results = []
+    try:
+        cur = conn.cursor()
+        cur.execute("SHOW server_version")
+        server_version = cur.fetchone()[0]
+        conn.rollback()
+
+        for size in sorted(args.questions):
+            entry = _bench_size(conn, args, size)
+            results.append(entry)
+            print(json.dumps({
+                "questions": size, **{name: op["seconds_median"] for name, op in entry["operations"].items()}
+            }), flush=True)
+    finally:
+        conn.rollback()
+        drop_bench_sessions(conn)
+        conn.close()
+        close_pool()
+
+    report = {
+        "benchmark": "save_and_load",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "postgres": server_version,
+        "settings": {
+            "rounds": args.rounds,
+            "export_fetch_rows": save_and_load_service.EXPORT_FETCH_ROWS,
+            "import_batch_rows": save_and_load_service.IMPORT_BATCH_ROWS,
+        },
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+    if args.baseline:
+        report["baseline"] = args.baseline
+        report["regressions"] = _compare(results, args.baseline, args.tolerance)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", flush=True)
+
+    if report.get("regressions"):
+        print(json.dumps(report["regressions"], indent=2))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Round trips and latency of question_service.get_full_session_state by hint count.
+
+    python -m benchmarks.bench_session_state --hints 1 5 20 100
+"""
+import json
+import time
+import argparse
+
+from backend.services.question_service import get_full_session_state
+from benchmarks.common import connect, new_session_id, seed_session, drop_bench_sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hints", type=int, nargs="+", default=[1, 5, 20, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = connect(counting=True)
+    results = []
+    try:
+        for num_hints in args.hints:
+            session_id = new_session_id()
+            seed_session(conn, session_id, hints_per_question=num_hints)
+
+            conn.round_trips = 0
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                get_full_session_state(conn, session_id)
+            elapsed = time.perf_counter() - started
+
+            results.append({
+                "hints": num_hints,
+                "round_trips": conn.round_trips // args.repeat,
+                "avg_ms": round(elapsed / args.repeat * 1000, 2),
+            })
+    finally:
+        drop_bench_sessions(conn)
+        conn.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
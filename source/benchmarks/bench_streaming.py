@@ -0,0 +1,71 @@
+"""
+Time to first hint of /generate_stream against the full /generate response.
+
+    python -m benchmarks.llm_stub_server --port 9000 --delay 0.3 --line-delay 0.3 &
+    TOGETHER_BASE_URL=http://localhost:9000/v1 python app.py &
+    python -m benchmarks.bench_streaming --url http://localhost:8000 --rounds 5
+
+With a line delay, the stub produces hints one by one like a real model does.
+The streaming endpoint shows the first hint after the first line instead of
+after the answer and the whole hint list.
+"""
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, List
+
+import httpx
+
+
+def _stream_timings(client: httpx.Client, body: dict) -> Dict[str, float]:
+    started = time.perf_counter()
+    timings = {}
+    event = None
+    with client.stream("POST", "/api/hinteval/generate_stream", json=body) as resp:
+        for line in resp.iter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                timings.setdefault(f"first_{event}_s", time.perf_counter() - started)
+    timings["total_s"] = time.perf_counter() - started
+    return timings
+
+
+def _median(rows: List[Dict[str, float]], key: str) -> float:
+    values = [r[key] for r in rows if key in r]
+    return round(statistics.median(values), 3) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--hints", type=int, default=5)
+    parser.add_argument("--model", default="stub-model")
+    args = parser.parse_args()
+
+    body = {
+        "question": "What is the capital of Austria?", "num_hints": args.hints,
+        "temperature": 0.3, "max_tokens": 128, "model_name": args.model,
+    }
+    streamed, blocking = [], []
+    with httpx.Client(base_url=args.url, timeout=120) as client:
+        for _ in range(args.rounds):
+            streamed.append(_stream_timings(client, body))
+
+            started = time.perf_counter()
+            client.post("/api/hinteval/generate", json=body).raise_for_status()
+            blocking.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "rounds": args.rounds,
+        "generate_total_s": round(statistics.median(blocking), 3),
+        "stream_first_hint_s": _median(streamed, "first_hint_s"),
+        "stream_first_answer_s": _median(streamed, "first_answer_s"),
+        "stream_total_s": _median(streamed, "total_s"),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
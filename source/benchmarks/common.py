@@ -0,0 +1,130 @@
+"""
+Shared helpers for the database benchmarks: a connection that counts round
+trips and a generator for synthetic sessions.
+
+All benchmarks run against the database configured through the DB_* variables
+and only touch sessions whose id starts with BENCH_PREFIX.
+"""
+import json
+import time
+import random
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+
+from backend.database.database_init import get_db_connection
+
+BENCH_PREFIX = "bench-"
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    def execute(self, query, vars=None):
+        self.connection.round_trips += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        self.connection.round_trips += 1
+        return super().executemany(query, vars_list)
+
+
+class CountingConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that counts the statements sent by its cursors."""
+    round_trips = 0
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault("cursor_factory", CountingCursor)
+        return super().cursor(*args, **kwargs)
+
+
+def connect(counting: bool = False):
+    if counting:
+        return get_db_connection(connection_factory=CountingConnection)
+    return get_db_connection()
+
+
+def new_session_id() -> str:
+    return f"{BENCH_PREFIX}{uuid.uuid4()}"
+
+
+@contextmanager
+def timed(results: Dict[str, Any], key: str):
+    started = time.perf_counter()
+    yield
+    results[key] = round(time.perf_counter() - started, 4)
+
+
+def seed_session(
+    conn,
+    session_id: str,
+    num_questions: int = 1,
+    hints_per_question: int = 10,
+    metrics_per_hint: int = 5,
+    entities_per_hint: int = 3,
+    candidates_per_question: int = 5,
+) -> List[int]:
+    """Inserts a synthetic session and returns the question ids."""
+    rnd = random.Random(42)
+    metric_names = ["relevance", "readability", "familiarity", "answer-leakage", "convergence"]
+    cur = conn.cursor()
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    q_rows = execute_values(
+        cur,
+        "INSERT INTO questions (text, session_id, created_at) VALUES %s RETURNING id",
+        [(f"Synthetic question {i}?", session_id, now) for i in range(num_questions)],
+        fetch=True, page_size=1000,
+    )
+    qids = [r[0] for r in q_rows]
+
+    execute_values(
+        cur,
+        "INSERT INTO answers (question_id, answer_text, model_name, created_at) VALUES %s",
+        [(qid, f"Answer {qid}", "bench-model", now) for qid in qids],
+        page_size=1000,
+    )
+
+    candidates = [f"Candidate {c}" for c in range(candidates_per_question)]
+    execute_values(
+        cur,
+        "INSERT INTO candidate_answers (question_id, candidate_text, is_eliminated, created_at, is_groundtruth) VALUES %s",
+        [(qid, c, False, now, idx == len(candidates) - 1) for qid in qids for idx, c in enumerate(candidates)],
+        page_size=1000,
+    )
+
+    h_rows = execute_values(
+        cur,
+        "INSERT INTO hints (question_id, hint_text, created_at) VALUES %s RETURNING id",
+        [(qid, f"Synthetic hint {h} for question {qid}", now) for qid in qids for h in range(hints_per_question)],
+        fetch=True, page_size=1000,
+    )
+    hint_ids = [r[0] for r in h_rows]
+
+    metric_rows = []
+    for hid in hint_ids:
+        for m in range(metrics_per_hint):
+            name = metric_names[m % len(metric_names)]
+            meta = {"scores": {c: rnd.choice([0, 1]) for c in candidates}} if name == "convergence" else {}
+            metric_rows.append((hid, name, round(rnd.random(), 3), json.dumps(meta)))
+    execute_values(cur, "INSERT INTO metrics (hint_id, name, value, metadata_json) VALUES %s", metric_rows, page_size=1000)
+
+    entity_rows = [
+        (hid, f"Entity{e}", "PERSON", e * 5, e * 5 + 4, json.dumps({"wiki_views_per_month": rnd.randint(1, 10000)}))
+        for hid in hint_ids for e in range(entities_per_hint)
+    ]
+    execute_values(
+        cur,
+        "INSERT INTO entities (hint_id, entity, ent_type, start_index, end_index, metadata_json) VALUES %s",
+        entity_rows, page_size=1000,
+    )
+
+    conn.commit()
+    return qids
+
+
+def drop_bench_sessions(conn) -> None:
+    cur = conn.cursor()
+    cur.execute("DELETE FROM questions WHERE session_id LIKE %s", (BENCH_PREFIX + "%",))
+    conn.commit()
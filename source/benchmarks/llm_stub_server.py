@@ -0,0 +1,110 @@
+"""
+Minimal OpenAI compatible chat completion server for offline benchmarks.
+
+    python -m benchmarks.llm_stub_server --port 9000 --delay 0.2
+
+Point the backend at it with TOGETHER_BASE_URL=http://localhost:9000/v1.
+Responses are numbered lines, so candidate and hint parsing work unchanged.
+With `--line-delay` every line takes that long to "generate"; requests with
+`"stream": true` receive the lines as server-sent event chunks as they are produced.
+"""
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def build_content(num_lines: int) -> str:
+    return "\n".join(f"{i}. Stub line {i}" for i in range(1, num_lines + 1))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is measurable
+    disable_nagle_algorithm = True
+    delay = 0.0
+    line_delay = 0.0
+    num_lines = 5
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.delay)
+
+        if body.get("stream"):
+            self._stream(body)
+            return
+
+        time.sleep(self.line_delay * self.num_lines)
+        payload = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": build_content(self.num_lines)},
+                "finish_reason": "stop",
+            }],
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            for line in build_content(self.num_lines).splitlines(keepends=True):
+                time.sleep(self.line_delay)
+                chunk = {
+                    "id": "stub",
+                    "object": "chat.completion.chunk",
+                    "model": body.get("model"),
+                    "choices": [{"index": 0, "delta": {"content": line}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading early, like a real provider we stop generating
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections under the load benchmarks
+    request_queue_size = 4096
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds to wait before answering")
+    parser.add_argument("--lines", type=int, default=5, help="Numbered lines per response")
+    parser.add_argument("--line-delay", type=float, default=0.0, help="Seconds to generate each line")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    StubHandler.line_delay = args.line_delay
+    StubHandler.num_lines = args.lines
+    server = StubServer((args.host, args.port), StubHandler)
+    print(f"LLM stub listening on http://{args.host}:{args.port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
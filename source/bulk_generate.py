@@ -0,0 +1,78 @@
+"""
+Pre-generates answers and hints for a file of questions, without the HTTP API.
+
+    python bulk_generate.py questions.jsonl --num-hints 5 --model meta-llama/Llama-3.3-70B-Instruct-Turbo
+    python bulk_generate.py --resume 12            # continue run 12 after a crash
+    python bulk_generate.py --status 12
+
+Questions are read from .txt (one per line), .jsonl, .json or .csv files with
+a `question` and an optional `answer` field. Every question is stored with its
+checkpoint as soon as it is generated; a stopped run continues with the
+questions that are not done yet. Several processes may work on the same run.
+"""
+import json
+import argparse
+
+from backend.database.database_init import init_db
+from backend.database.connection import init_pool, close_pool, pooled_connection
+from backend.services import bulk_generation_service
+
+
+def _print_progress(phase: str, detail: dict) -> None:
+    print(f"[{phase}] {detail['done']} done, {detail['failed']} failed, {detail['questions_per_minute']}/min", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", nargs="?", help="question file for a new run")
+    parser.add_argument("--resume", type=int, metavar="RUN_ID", help="continue an existing run")
+    parser.add_argument("--status", type=int, metavar="RUN_ID", help="print the state of a run and exit")
+    parser.add_argument("--reclaim", action="store_true",
+                        help="with --resume: take over questions still claimed by a crashed runner right away")
+    parser.add_argument("--session-id", default="bulk", help="session the generated questions belong to")
+    parser.add_argument("--num-hints", type=int, default=5)
+    parser.add_argument("--temperature", type=float, default=0.3)
+    parser.add_argument("--max-tokens", type=int, default=512)
+    parser.add_argument("--model", default=None, help="model name (default: HINTEVAL_MODEL or the backend default)")
+    parser.add_argument("--answer-aware", action="store_true")
+    parser.add_argument("--bypass-cache", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=bulk_generation_service.BULK_CONCURRENCY)
+    args = parser.parse_args()
+
+    if sum(x is not None for x in (args.file, args.resume, args.status)) != 1:
+        parser.error("give either a question file, --resume RUN_ID or --status RUN_ID")
+
+    init_pool()
+    try:
+        if args.status is not None:
+            with pooled_connection() as conn:
+                print(json.dumps(bulk_generation_service.get_run(conn, args.status), indent=2))
+            return
+
+        init_db()
+        run_id = args.resume
+        if args.file:
+            items = bulk_generation_service.load_questions(args.file)
+            params = dict(
+                num_hints=args.num_hints,
+                temperature=args.temperature,
+                max_tokens=args.max_tokens,
+                model_name=args.model,
+                answer_aware=args.answer_aware,
+                use_cache=not args.bypass_cache,
+            )
+            with pooled_connection() as conn:
+                run = bulk_generation_service.create_run(conn, args.session_id, items, params, source=args.file)
+            run_id = run["run_id"]
+            print(f"Created bulk run {run_id} with {run['total']} questions.", flush=True)
+
+        run = bulk_generation_service.run_bulk_generation(
+            run_id, concurrency=args.concurrency, reclaim=args.reclaim, progress=_print_progress
+        )
+        print(json.dumps(run, indent=2))
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Exports every question of the given sessions, or of all sessions, to one file
+in the HintEval dataset layout (one subset per session, one instance per
+question), without the HTTP API.
+
+    python export_dataset.py corpus.json.gz                  # all sessions, full JSON, gzipped
+    python export_dataset.py day.ndjson --format ndjson --session SESSION_A --session SESSION_B
+
+The data is streamed from the database into the file, so memory stays flat
+however large the dataset is. Gzip is used when the file name ends in .gz.
+"""
+import time
+import argparse
+
+from backend.database.connection import init_pool, close_pool
+from backend.services import save_and_load_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="file to write, gzipped if it ends in .gz")
+    parser.add_argument("--format", default="full_json", choices=save_and_load_service.EXPORT_FORMATS)
+    parser.add_argument("--session", action="append", dest="sessions", metavar="SESSION_ID",
+                        help="session to export (repeatable, default: all sessions)")
+    parser.add_argument("--name", default="hinteval_dataset", help="dataset name in the JSON export")
+    args = parser.parse_args()
+
+    init_pool()
+    try:
+        started = time.perf_counter()
+        written = 0
+        chunks = save_and_load_service.stream_dataset_export(
+            args.sessions, args.format, compress=args.output.endswith(".gz"), name=args.name
+        )
+        with open(args.output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        print(f"Wrote {written} bytes to {args.output} in {time.perf_counter() - started:.1f}s.", flush=True)
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
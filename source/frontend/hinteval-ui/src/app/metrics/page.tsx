@@ -307,22 +307,17 @@ export default function MetricsPage() {
     setLoading(true);
     setError(null);
     try {
-      const [metricsRes, convRes, entRes, embedRes] = await Promise.all([
-        fetch(`${API}/metrics/get_metrics`, { credentials: "include" }),
-        fetch(`${API}/metrics/get_convergence_scores`, { credentials: "include" }),
-        fetch(`${API}/metrics/get_entities`, { credentials: "include" }),
-        fetch(`${API}/metrics/get_embedding_similarities`, {
-          credentials: "include",
-        }),
-      ]);
-
-      if (!metricsRes.ok)
-        throw new Error(`Metrics API error: ${metricsRes.status}`);
-
-      const metricsJson = await metricsRes.json();
-      const convJson = convRes.ok ? await convRes.json() : [];
-      const entJson = entRes.ok ? await entRes.json() : {};
-      const embedJson = embedRes.ok ? await embedRes.json() : [];
+      const res = await fetch(`${API}/metrics/dashboard`, {
+        credentials: "include",
+      });
+
+      if (!res.ok) throw new Error(`Metrics API error: ${res.status}`);
+
+      const dashboard = await res.json();
+      const metricsJson = dashboard.metrics ?? [];
+      const convJson = dashboard.convergence ?? [];
+      const entJson = dashboard.entities ?? {};
+      const embedJson = dashboard.similarities ?? [];
 
       const normalizedMetrics = (
         Array.isArray(metricsJson) ? metricsJson : []
@@ -0,0 +1,53 @@
+"""
+Tests that need PostgreSQL use the `database` fixture. It creates a scratch
+schema in the database configured through the DB_* variables, builds the
+tables there with init_db and drops the schema afterwards, so existing data
+is never touched. Without a reachable database these tests are skipped.
+"""
+import os
+import uuid
+
+import psycopg2
+import pytest
+
+from backend.database.database_init import get_db_connection
+
+
+@pytest.fixture(scope="session")
+def database():
+    from backend.database import connection
+    from backend.database.database_init import init_db
+
+    schema = f"hinteval_test_{uuid.uuid4().hex[:8]}"
+    try:
+        conn = get_db_connection(connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e}")
+    conn.autocommit = True
+    conn.cursor().execute(f"CREATE SCHEMA {schema}")
+
+    # Every libpq connection opened from here on resolves tables in the scratch schema
+    previous = os.environ.get("PGOPTIONS")
+    os.environ["PGOPTIONS"] = f"-c search_path={schema}"
+    try:
+        init_db()
+        connection.init_pool()
+        yield schema
+    finally:
+        connection.close_pool()
+        connection.pg_pool = None
+        if previous is None:
+            os.environ.pop("PGOPTIONS", None)
+        else:
+            os.environ["PGOPTIONS"] = previous
+        conn.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
+
+
+@pytest.fixture
+def db_conn(database):
+    from backend.database.connection import pooled_connection
+
+    with pooled_connection() as conn:
+        yield conn
+        conn.rollback()
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from backend.services.bulk_generation_service import load_questions
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+def test_json_list_of_rows_and_strings(tmp_path):
+    path = _write(tmp_path, "questions.json", [
+        {"question": " Capital of Austria? ", "answer": "Vienna"},
+        "Who wrote Faust?",
+        {"question": "  "},
+    ])
+    assert load_questions(path) == [
+        {"question": "Capital of Austria?", "answer": "Vienna"},
+        {"question": "Who wrote Faust?", "answer": None},
+    ]
+
+
+def test_json_hinteval_dataset(tmp_path):
+    path = _write(tmp_path, "dataset.json", {
+        "name": "triviaqa",
+        "subsets": {
+            "test": {"name": "test", "instances": {
+                "id_1": {"question": {"question": "Capital of Austria?"}, "answers": [{"answer": "Vienna"}], "hints": []},
+                "id_2": {"question": {"question": "Who wrote Faust?"}, "answers": []},
+            }},
+            "train": {"name": "train", "instances": {
+                "id_3": {"question": {"question": "Largest planet?"}, "answers": [{"answer": "Jupiter"}, {"answer": "J"}]},
+            }},
+        },
+    })
+    assert load_questions(path) == [
+        {"question": "Capital of Austria?", "answer": "Vienna"},
+        {"question": "Who wrote Faust?", "answer": None},
+        {"question": "Largest planet?", "answer": "Jupiter"},
+    ]
+
+
+def test_json_other_dict_is_rejected(tmp_path):
+    path = _write(tmp_path, "other.json", {"name": "x", "questions": ["Capital of Austria?"]})
+    with pytest.raises(ValueError):
+        load_questions(path)
+
+
+def test_jsonl_txt_and_csv(tmp_path):
+    jsonl = _write(tmp_path, "q.jsonl", '{"question": "A?", "answer": "a"}\n\n{"question": "B?"}\n')
+    txt = _write(tmp_path, "q.txt", "A?\n\nB?\n")
+    csv_path = _write(tmp_path, "q.csv", "question,answer\nA?,a\nB?,\n")
+    expected = [{"question": "A?", "answer": "a"}, {"question": "B?", "answer": None}]
+    assert load_questions(jsonl) == expected
+    assert load_questions(csv_path) == expected
+    assert load_questions(txt) == [{"question": "A?", "answer": None}, {"question": "B?", "answer": None}]
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError):
+        load_questions(_write(tmp_path, "q.xml", "<q/>"))
+
+
+@pytest.mark.parametrize("attempts, reclaim", [(1, False), (2, True)])
+def test_requeued_bulk_job_reclaims_its_questions(database, monkeypatch, attempts, reclaim):
+    from backend.services import job_service
+
+    calls = []
+    monkeypatch.setattr(job_service, "_handlers", lambda: {
+        "bulk_generate": lambda run_id, concurrency=None, reclaim=False, progress=None: calls.append(reclaim) or {},
+    })
+    job_service._run_job(0, "bulk_generate", json.dumps({"run_id": 1, "concurrency": None}), attempts)
+    assert calls == [reclaim]
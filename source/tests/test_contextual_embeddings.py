@@ -0,0 +1,69 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+answer_leakage = pytest.importorskip("hinteval.cores.evaluation_metrics.answer_leakage")
+pytest.importorskip("sentence_transformers")
+import spacy
+from hinteval.cores import Instance
+from hinteval.utils.functions.download_manager import SpacyDownloader
+from sentence_transformers.util import cos_sim
+
+from backend.services import contextual_embeddings
+from backend.services.embedding_service import BatchingEncoder
+
+QA = [
+    ("What is the capital of Austria?", "Vienna",
+     ["This city lies on the Danube.", "Mozart and Beethoven worked in Vienna.", "Its name starts with a V."]),
+    ("Who wrote Moby-Dick?", "Herman Melville",
+     ["He was an American novelist.", "The book follows the whale hunt of Captain Ahab.", "Melville's first name rhymes with German."]),
+]
+
+
+class _HashModel:
+    """Stands in for a SentenceTransformer: a fixed pseudo-random vector per text."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, sentences, **kwargs):
+        single = isinstance(sentences, str)
+        vectors = np.stack([
+            np.random.default_rng(int(hashlib.sha256(s.encode()).hexdigest()[:8], 16)).standard_normal(32)
+            for s in ([sentences] if single else sentences)
+        ]).astype(np.float32)
+        return vectors[0] if single else vectors
+
+    def similarity(self, a, b):
+        return cos_sim(a, b)
+
+    def get_sentence_embedding_dimension(self):
+        return 32
+
+
+@pytest.fixture
+def offline_models(monkeypatch):
+    monkeypatch.setattr(SpacyDownloader, "download", classmethod(lambda cls, name: None))
+    monkeypatch.setattr(spacy, "load", lambda name: spacy.blank("en"))
+    monkeypatch.setattr(answer_leakage, "SentenceTransformer", _HashModel)
+    encoder = BatchingEncoder("hash", model=_HashModel())
+    monkeypatch.setattr(contextual_embeddings, "get_encoder", lambda name: encoder)
+
+
+def _instances():
+    return [Instance.from_strings(question, [answer], hints) for question, answer, hints in QA]
+
+
+@pytest.mark.parametrize("method", ["include_stop_words", "exclude_stop_words"])
+def test_scores_match_hinteval(offline_models, method):
+    expected = answer_leakage.ContextualEmbeddings(method=method).evaluate(_instances())
+    shared = contextual_embeddings.SharedContextualEmbeddings(method=method)
+    instances = _instances()
+
+    scores = shared.evaluate(instances)
+    assert np.allclose(scores, expected, atol=1e-6)
+    stored = [[m.value for h in i.hints for m in h.metrics.values()] for i in instances]
+    assert np.allclose(stored, expected, atol=1e-6)
+    # Evaluating again reuses nothing from the previous call
+    assert np.allclose(shared.evaluate(_instances()), expected, atol=1e-6)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from backend.services import embedding_cache, embedding_service
+
+
+def test_unavailable_backend_fails_instead_of_falling_back(monkeypatch):
+    loaded = []
+
+    def load(model_name, backend):
+        loaded.append(backend)
+        if backend != "torch":
+            raise ImportError("optimum is not installed")
+        return object()
+
+    monkeypatch.setattr(embedding_service, "load_sentence_model", load)
+    with pytest.raises(RuntimeError, match="sentence-transformers\\[onnx\\]"):
+        embedding_service._load_checked("m", "onnx")
+    assert loaded == ["onnx"]
+
+    model, backend, drift = embedding_service._load_checked("m", "torch")
+    assert (backend, drift) == ("torch", None)
+
+
+class _FixedModel:
+    def encode(self, sentences, **kwargs):
+        return np.ones((len(sentences), 4), dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+
+def test_vectors_are_cached_under_the_backend_the_encoder_fell_back_to(database, db_conn, monkeypatch):
+    monkeypatch.setattr(embedding_service, "EMBED_BACKEND", "onnx")
+    monkeypatch.setattr(embedding_service, "_encoders", {})
+    assert embedding_service.encoder_key("m") == "m@onnx"
+
+    def encode(texts):
+        # Loading the model failed its drift check and fell back to torch
+        embedding_service._encoders["m"] = embedding_service.BatchingEncoder("m", model=_FixedModel(), backend="torch")
+        return embedding_service._encoders["m"].encode(texts)
+
+    key = lambda: embedding_service.encoder_key("m")
+    embedding_cache.get_embeddings(db_conn, ["It lies on the Danube."], key, encode)
+
+    cur = db_conn.cursor()
+    cur.execute("SELECT model FROM hint_embeddings WHERE text_hash = %s", (embedding_cache.text_hash("It lies on the Danube."),))
+    assert cur.fetchall() == [("m",)]
+    assert embedding_cache.get_embeddings(db_conn, ["It lies on the Danube."], key, lambda texts: 1 / 0).shape == (1, 4)
+
+
+def test_editing_a_hint_keeps_the_vector_of_its_old_text(database, db_conn):
+    from backend.services import hint_service
+
+    cur = db_conn.cursor()
+    cur.execute("INSERT INTO questions (text, session_id) VALUES ('Capital of Austria?', 'embedding-test') RETURNING id")
+    qid = cur.fetchone()[0]
+    cur.execute("INSERT INTO hints (question_id, hint_text) VALUES (%s, 'It lies on the Danube.') RETURNING id", (qid,))
+    hint_id = cur.fetchone()[0]
+    db_conn.commit()
+    embedding_cache.get_embeddings(db_conn, ["It lies on the Danube."], "edit-test", _FixedModel().encode)
+
+    assert hint_service.update_hint(db_conn, hint_id, "Mozart worked there.") == 1
+    cur.execute("SELECT count(*) FROM hint_embeddings WHERE model = 'edit-test'")
+    assert cur.fetchone()[0] == 1
+    cur.execute("DELETE FROM questions WHERE id = %s", (qid,))
+    db_conn.commit()
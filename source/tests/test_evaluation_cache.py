@@ -0,0 +1,55 @@
+import pytest
+
+from backend.services import evaluation_cache
+from backend.services.evaluation_cache import EvaluationCacheBatch, make_key
+
+QUESTION = "What is the capital of Austria?"
+HINT = "It lies on the Danube."
+CANDIDATES = ["Graz", "Vienna"]
+
+
+def test_keys_are_stable_across_releases():
+    # A changed digest silently invalidates every stored entry: bump the evaluator identity instead
+    assert make_key("llm", QUESTION, HINT, "Vienna", CANDIDATES) == (
+        "da4e94984e01784e8787f17a7df84b7931b8204fd6cee72d22055432cbc16ac9"
+    )
+    assert make_key("readability", QUESTION, HINT, "Vienna", CANDIDATES) == (
+        "dce0705d67a425920dda68e7871f7a2bc8393ffbe1ccbd01da36e11510e07551"
+    )
+
+
+def test_keys_only_cover_the_inputs_an_evaluator_reads():
+    key = make_key("readability", QUESTION, HINT, "Vienna", CANDIDATES)
+    assert make_key("readability", "Another question?", HINT, None, []) == key
+    assert make_key("readability", QUESTION, "Another hint.", "Vienna", CANDIDATES) != key
+
+    key = make_key("contextual", QUESTION, HINT, "Vienna", CANDIDATES)
+    assert make_key("contextual", "Another question?", HINT, "Vienna", []) == key
+    assert make_key("contextual", QUESTION, HINT, "Graz", CANDIDATES) != key
+
+    key = make_key("llm", QUESTION, HINT, "Vienna", CANDIDATES)
+    assert make_key("llm", QUESTION, HINT, "Vienna", list(reversed(CANDIDATES))) != key
+    assert make_key("rouge", QUESTION, HINT, "Vienna", CANDIDATES) != key
+
+
+def test_keys_ignore_surrounding_whitespace_and_blank_answers():
+    assert make_key("rouge", f" {QUESTION}\n", f"{HINT} ", None, []) == make_key("rouge", QUESTION, HINT, None, [])
+    assert make_key("contextual", QUESTION, HINT, "  ", []) == make_key("contextual", QUESTION, HINT, None, [])
+
+
+def test_saved_entries_are_hits_of_the_next_evaluation(database, db_conn, monkeypatch):
+    monkeypatch.setattr(evaluation_cache, "EVAL_CACHE_EVICT_EVERY", 1000)
+    db_conn.cursor().execute("DELETE FROM evaluation_cache")
+    db_conn.commit()
+
+    first = EvaluationCacheBatch(QUESTION, [HINT, "Mozart worked there."], "Vienna", CANDIDATES)
+    first.load(db_conn)
+    assert first.missing("readability") == [0, 1]
+    first.put("readability", 1, {"score": 0.5})
+    assert first.save(db_conn) == 1
+
+    second = EvaluationCacheBatch(QUESTION, [HINT, "Mozart worked there."], "Vienna", CANDIDATES)
+    second.load(db_conn)
+    assert second.missing("readability") == [0]
+    assert second.get("readability", 1) == {"score": 0.5}
+    assert (second.hits, second.misses) == (1, 1)
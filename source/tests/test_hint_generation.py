@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+api_based = pytest.importorskip("hinteval.utils.model.answer_agnostic.api_based")
+aware_api_based = pytest.importorskip("hinteval.utils.model.answer_aware.api_based")
+
+from backend.services import generation_service, llm_cache, llm_client
+from backend.services.generation_service import API_Info, _filter_hints, _hint_messages, my_parse_llm_response
+
+QUESTION = " What is the capital of Austria? "
+ANSWER = "Vienna"
+COMPLETION = "Here are 3 hints:\n1. It lies on the Danube.\n2. Mozart worked there.\n\n3. Its name starts with a V.\n"
+
+
+@pytest.fixture
+def hinteval_prompts(monkeypatch):
+    """Replaces the HTTP call of HintEval's API generators, records the messages they send."""
+    sent = []
+
+    async def execute_prompt(self, messages):
+        sent.append(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=COMPLETION))])
+
+    monkeypatch.setattr(api_based.Hint_Generation, "_execute_prompt", execute_prompt)
+    monkeypatch.setattr(aware_api_based.Hint_Generation, "_execute_prompt", execute_prompt)
+    return sent
+
+
+@pytest.mark.parametrize("answer", [None, ANSWER])
+def test_stream_prompt_and_parsing_match_hinteval(hinteval_prompts, answer):
+    cfg = API_Info(model_name="m", api_key="key", base_url="http://localhost:1")
+    completion = generation_service._run_hint_generator(QUESTION, 3, answer, 0.3, 0.9, 100, cfg)
+
+    assert hinteval_prompts == [_hint_messages(QUESTION, 3, answer)]
+    assert completion == COMPLETION.strip()
+    assert _filter_hints(my_parse_llm_response(completion)) == [
+        "It lies on the Danube.", "Mozart worked there.", "Its name starts with a V."
+    ]
+
+
+class _CacheOnlyClient:
+    def astream_chat(self, model, messages, **params):
+        raise AssertionError("the request should have been answered from the cache")
+
+    def close(self):
+        pass
+
+
+def test_blocking_and_streamed_hints_share_the_cache_entry(database, db_conn, monkeypatch):
+    db_conn.cursor().execute("DELETE FROM llm_response_cache")
+    db_conn.commit()
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(generation_service, "_run_hint_generator", lambda *args: COMPLETION.strip())
+    llm_client.set_client(_CacheOnlyClient())
+    try:
+        cfg = API_Info(model_name="m", api_key="key")
+        _, hints = generation_service.generate_answer_hints(
+            QUESTION, 3, 0.3, 100, cfg, answer=True, provided_answer_text=ANSWER, top_p=0.9
+        )
+
+        async def streamed():
+            return "".join([
+                delta async for delta in llm_client.astream_chat_completion(
+                    "m", _hint_messages(QUESTION, 3, ANSWER), temperature=0.3, max_tokens=100, top_p=0.9
+                )
+            ])
+
+        assert _filter_hints(my_parse_llm_response(anyio.run(streamed))) == hints
+        assert len(hints) == 3
+    finally:
+        llm_client.set_client(None)
@@ -0,0 +1,114 @@
+import pytest
+
+from backend.services import llm_cache, llm_client
+
+
+def _key(text: str = "Capital of Austria?", **params) -> str:
+    return llm_cache.make_key("m", [{"role": "user", "content": text}], **{"temperature": 0.3, **params})
+
+
+def test_key_is_stable_and_covers_prompt_and_parameters():
+    assert _key() == _key()
+    assert _key() == llm_cache.make_key("m", [{"role": "user", "content": "Capital of Austria?"}], temperature=0.3)
+    assert _key() != _key("Capital of Italy?")
+    assert _key() != _key(temperature=0.7)
+    assert _key() != _key(max_tokens=10)
+    assert _key() != llm_cache.make_key("other", [{"role": "user", "content": "Capital of Austria?"}], temperature=0.3)
+
+
+@pytest.fixture
+def cache(database, db_conn):
+    db_conn.cursor().execute("DELETE FROM llm_response_cache")
+    db_conn.commit()
+    return db_conn
+
+
+def _age(conn, key: str, column: str, seconds: int) -> None:
+    conn.cursor().execute(
+        f"UPDATE llm_response_cache SET {column} = now() - make_interval(secs => %s) WHERE cache_key = %s",
+        (seconds, key)
+    )
+    conn.commit()
+
+
+def test_store_and_lookup(cache):
+    key = _key()
+    assert llm_cache.lookup(key) is None
+    llm_cache.store(key, "m", "Vienna")
+    assert llm_cache.lookup(key) == "Vienna"
+    llm_cache.store(key, "m", "Wien")
+    assert llm_cache.lookup(key) == "Wien"
+
+
+def test_entries_expire_after_the_ttl(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_TTL_SECONDS", 60)
+    fresh, old = _key("fresh"), _key("old")
+    llm_cache.store(fresh, "m", "a")
+    llm_cache.store(old, "m", "b")
+    _age(cache, old, "created_at", 120)
+
+    assert llm_cache.lookup(old) is None
+    assert llm_cache.lookup(fresh) == "a"
+    assert llm_cache.prune(cache) == 1
+
+
+def test_prune_keeps_the_most_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_MAX_ENTRIES", 2)
+    keys = [_key(f"q{i}") for i in range(4)]
+    for i, key in enumerate(keys):
+        llm_cache.store(key, "m", f"a{i}")
+        _age(cache, key, "last_used_at", 100 - i)
+    # A hit makes the oldest entry the most recently used one
+    assert llm_cache.lookup(keys[0]) == "a0"
+
+    assert llm_cache.prune(cache) == 2
+    assert [llm_cache.lookup(k) for k in keys] == ["a0", None, None, "a3"]
+
+
+class _FakeClient:
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    def chat(self, model, messages, **params):
+        self.calls += 1
+        return self.text
+
+    def stream_chat(self, model, messages, **params):
+        self.calls += 1
+        for line in self.text.splitlines(keepends=True):
+            yield line
+
+    def record_early_stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_client(cache, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    client = _FakeClient("one\ntwo\nthree\nfour\n")
+    llm_client.set_client(client)
+    yield client
+    llm_client.set_client(None)
+
+
+def test_stream_cut_off_early_is_not_cached(fake_client):
+    messages = [{"role": "user", "content": "Four candidates"}]
+    stopped = "".join(llm_client.stream_chat_completion("m", messages, stop_when=lambda text: text.count("\n") >= 2))
+    assert stopped == "one\ntwo\n"
+
+    # The blocking call shares the cache key and must see the whole response
+    assert llm_client.chat_completion("m", messages) == fake_client.text
+    assert fake_client.calls == 2
+    assert llm_client.chat_completion("m", messages) == fake_client.text
+    assert fake_client.calls == 2
+
+
+def test_completed_stream_is_cached(fake_client):
+    messages = [{"role": "user", "content": "Four candidates"}]
+    assert "".join(llm_client.stream_chat_completion("m", messages)) == fake_client.text
+    assert llm_client.chat_completion("m", messages) == fake_client.text.strip()
+    assert fake_client.calls == 1
@@ -0,0 +1,155 @@
+import uuid
+
+import httpx
+import pytest
+import requests
+
+from backend.services.llm_client import LLMError
+from backend.services.llm_resilience import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry, get_breaker, is_retryable, stream_with_retry,
+)
+
+NO_WAIT = RetryPolicy(max_attempts=4, base_delay=0, max_delay=0, max_elapsed=30)
+
+
+def _model() -> str:
+    return f"test-model-{uuid.uuid4()}"
+
+
+def _wrapped(cause: Exception) -> LLMError:
+    try:
+        raise LLMError(f"LLM request failed: {cause}") from cause
+    except LLMError as e:
+        return e
+
+
+@pytest.mark.parametrize("exc", [
+    LLMError("rate limited", status_code=429),
+    LLMError("unavailable", status_code=503),
+    _wrapped(requests.ConnectionError("refused")),
+    _wrapped(requests.ReadTimeout("slow")),
+    _wrapped(httpx.ConnectTimeout("slow")),
+    httpx.ReadError("reset"),
+    TimeoutError(),
+])
+def test_retryable(exc):
+    assert is_retryable(exc)
+
+
+@pytest.mark.parametrize("exc", [
+    LLMError("bad request", status_code=400),
+    LLMError("unauthorized", status_code=401),
+    _wrapped(requests.exceptions.InvalidURL("no host")),
+    ValueError("could not parse the hints"),
+    KeyError("choices"),
+])
+def test_not_retryable(exc):
+    assert not is_retryable(exc)
+
+
+def test_transport_errors_are_retried_until_success():
+    model, calls = _model(), []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _wrapped(requests.ConnectionError("refused"))
+        return "ok"
+
+    assert call_with_retry(model, flaky, policy=NO_WAIT) == "ok"
+    assert len(calls) == 3
+    assert get_breaker(model).snapshot()["state"] == "closed"
+    assert get_breaker(model).snapshot()["consecutive_failures"] == 0
+
+
+def test_other_errors_are_raised_at_once_and_spare_the_breaker():
+    model, calls = _model(), []
+
+    def malformed():
+        calls.append(1)
+        raise ValueError("could not parse the hints")
+
+    for _ in range(10):
+        with pytest.raises(ValueError):
+            call_with_retry(model, malformed, policy=NO_WAIT)
+    assert len(calls) == 10
+    snapshot = get_breaker(model).snapshot()
+    assert snapshot["state"] == "closed"
+    assert snapshot["total_failures"] == 0
+
+
+def test_non_retryable_status_is_not_retried():
+    model, calls = _model(), []
+
+    def bad_request():
+        calls.append(1)
+        raise LLMError("bad request", status_code=400)
+
+    with pytest.raises(LLMError):
+        call_with_retry(model, bad_request, policy=NO_WAIT)
+    assert len(calls) == 1
+    assert get_breaker(model).snapshot()["total_failures"] == 0
+
+
+def test_breaker_opens_and_lets_one_trial_through(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("backend.services.llm_resilience.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("m", failure_threshold=2, reset_timeout=30)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock[0] += 31
+    breaker.before_call()  # the half open trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_opens_the_breaker_again(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("backend.services.llm_resilience.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("m", failure_threshold=1, reset_timeout=30)
+    breaker.before_call()
+    breaker.record_failure()
+
+    clock[0] += 31
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_stream_is_reopened_only_before_the_first_item():
+    model, opened = _model(), []
+
+    def open_stream():
+        opened.append(1)
+        if len(opened) == 1:
+            raise _wrapped(requests.ConnectionError("refused"))
+        yield "a"
+        yield "b"
+
+    assert list(stream_with_retry(model, open_stream, policy=NO_WAIT)) == ["a", "b"]
+    assert len(opened) == 2
+
+
+def test_stream_failing_after_items_is_not_retried():
+    model, opened = _model(), []
+
+    def open_stream():
+        opened.append(1)
+        yield "a"
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError):
+        list(stream_with_retry(model, open_stream, policy=NO_WAIT))
+    assert len(opened) == 1
+    assert get_breaker(model).snapshot()["total_failures"] == 0
@@ -0,0 +1,123 @@
+import io
+import json
+import threading
+
+import pytest
+
+from backend.database import connection
+from backend.database.connection import ExportSlotsFull
+from backend.services.save_and_load_service import (
+    _insert_full_backup, clear_session_data, export_session_json, import_session_upload, stream_session_export,
+)
+from benchmarks.common import new_session_id, seed_session
+
+
+def _content(export):
+    """An export without what a restore may renumber: instance and hint ids, the session name."""
+    instances = []
+    for instance in export["subsets"]["export"]["instances"].values():
+        instance = json.loads(json.dumps(instance))
+        for hint in instance.get("hints", []):
+            hint.pop("db_id", None)
+        instances.append(instance)
+    return instances
+
+
+@pytest.fixture
+def session(database, db_conn):
+    session_id = new_session_id()
+    seed_session(
+        db_conn, session_id, num_questions=3, hints_per_question=2, metrics_per_hint=5,
+        entities_per_hint=2, candidates_per_question=3,
+    )
+    restored = []
+    yield session_id, restored
+    for sid in [session_id] + restored:
+        clear_session_data(db_conn, sid)
+
+
+def _restore(db_conn, restored, load):
+    session_id = new_session_id()
+    restored.append(session_id)
+    load(session_id)
+    return _content(export_session_json(db_conn, session_id, all_questions=True))
+
+
+def test_full_backup_round_trip(db_conn, session):
+    session_id, restored = session
+    exported = export_session_json(db_conn, session_id, all_questions=True)
+    assert len(exported["subsets"]["export"]["instances"]) == 3
+
+    assert _restore(db_conn, restored, lambda sid: _insert_full_backup(db_conn, sid, exported)) == _content(exported)
+
+
+def test_uploaded_export_round_trip(db_conn, session):
+    session_id, restored = session
+    exported = export_session_json(db_conn, session_id, all_questions=True)
+    upload = json.dumps(exported).encode()
+
+    assert _restore(
+        db_conn, restored, lambda sid: import_session_upload(db_conn, sid, io.BytesIO(upload))
+    ) == _content(exported)
+
+
+def test_streamed_export_round_trip(db_conn, session):
+    session_id, restored = session
+    exported = export_session_json(db_conn, session_id, all_questions=True)
+    streamed = b"".join(stream_session_export(session_id, "full_json", all_questions=True))
+    assert _content(json.loads(streamed)) == _content(exported)
+
+    assert _restore(
+        db_conn, restored, lambda sid: import_session_upload(db_conn, sid, io.BytesIO(streamed))
+    ) == _content(exported)
+
+
+def test_streamed_exports_beyond_their_slots_fail_at_once(db_conn, session, monkeypatch):
+    session_id, _ = session
+    monkeypatch.setattr(connection, "_export_slots", threading.BoundedSemaphore(1))
+    running = stream_session_export(session_id, "json")
+    next(running)
+
+    with pytest.raises(ExportSlotsFull):
+        next(stream_session_export(session_id, "json"))
+
+    running.close()
+    assert b"".join(stream_session_export(session_id, "json"))
+
+
+def _upload(db_conn, restored, data):
+    session_id = new_session_id()
+    restored.append(session_id)
+    return import_session_upload(db_conn, session_id, io.BytesIO(json.dumps(data).encode()))[1]
+
+
+def test_upload_reads_dotted_subset_names_and_plain_hints(db_conn, session):
+    _, restored = session
+    data = {"subsets": {"v1.2": {"instances": {"1": {
+        "question": {"question": "What is the capital of Austria?"},
+        "answers": [{"answer": "Vienna"}],
+        "hints": ["It lies on the Danube.", {"hint": "Mozart worked there."}],
+    }}}}}
+    assert _upload(db_conn, restored, data)["counts"]["q"] == 1
+
+    instance, = export_session_json(db_conn, restored[-1], all_questions=True)["subsets"]["export"]["instances"].values()
+    assert [h["hint"] for h in instance["hints"]] == ["It lies on the Danube.", "Mozart worked there."]
+
+
+@pytest.mark.parametrize("hint", [
+    {"hint": "It lies on the Danube.", "metrics": [{"value": 0.5}]},
+    {"hint": "It lies on the Danube.", "entities": ["Danube"]},
+    42,
+])
+def test_malformed_upload_is_a_value_error(db_conn, session, hint):
+    _, restored = session
+    data = {"subsets": {"export": {"instances": {"1": {
+        "question": {"question": "What is the capital of Austria?"}, "hints": [hint],
+    }}}}}
+    with pytest.raises(ValueError):
+        _upload(db_conn, restored, data)
+
+    data["subsets"]["export"]["instances"]["1"]["hints"] = []
+    data["subsets"]["export"]["instances"]["1"]["candidates_full"] = [{"is_groundtruth": True}]
+    with pytest.raises(ValueError):
+        _upload(db_conn, restored, data)